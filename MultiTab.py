@@ -38,23 +38,43 @@
         --disable-console --windows-icon-from-ico=assets/images/favicon.ico MultiTab.py
     ```
 '''
+import time
+START_TIME = time.perf_counter()    # 启动耗时记录的起点, 包括以下模块的导入
 import os
 import wx
 import sys
 import json
-import yaml
 import logging
-import win32api
-import win32con
-import win32gui
+import threading
 
 from utils.UI import GetBorders, ListenKeyThread
-from utils.StartExe import StartExeThread, KillPids
+from utils.Config import ReadConfigurations, ParseConfigurations, DiffItems
+from utils.Launcher import LaunchScheduler
+from utils.StartExe import DEFAULT_TIMEOUT
+from utils.LaunchMetrics import LaunchRecord, LaunchHistory
+from utils.LaunchSpec import CompileSpecs
+from utils.Teardown import TeardownService
+from utils.ProcessTracker import ProcessTracker
+from utils.ResourceMonitor import ResourceMonitor, FormatBytes
+from utils.Hibernation import HibernationManager, CHECK_INTERVAL
+from utils.Startup import StartupTrace, Preload
+from utils.SessionPool import SessionPool
+from utils.ImageCache import GetImageCache
+from utils.Search import SearchIndex, LaunchUsage, ExtractHost
+from utils.Foreground import ForegroundSubscription, WinEventForegroundWatcher
+from utils.Geometry import GeometryManager, CalcPageRect
+from utils.Platform import GetBackend
+from utils.Mru import MruStack
 
 from widgets.Notebook import Notebook
 from widgets.MessageDialog import MessageDialog
+from widgets.ProcessDialog import ProcessDialog
+from widgets.TabSwitcher import TabSwitcher
+from widgets.MruOverlay import MruOverlay, MAX_ROWS
 from widgets.VScrolledToolBar import VScrolledToolBar
-from wx.lib.agw.flatnotebook import EVT_FLATNOTEBOOK_PAGE_CLOSING
+from wx.lib.agw.flatnotebook import (
+    EVT_FLATNOTEBOOK_PAGE_CLOSING, EVT_FLATNOTEBOOK_PAGE_CHANGED, EVT_FLATNOTEBOOK_PAGE_CONTEXT_MENU
+)
 
 ################################################################################
 # 初始化
@@ -66,55 +86,63 @@ CORE_FILE = os.path.join(ASSETS_PATH, 'core.json')
 CONFIG_TEMPLATE_FILE = os.path.join(ASSETS_PATH, 'config.yaml.template')
 CONFIG_FILE_NAME = 'config.yaml'
 CONFIG_FILE = os.path.join(BASE_PATH, CONFIG_FILE_NAME)
+SESSION_FILE = os.path.join(BASE_PATH, 'session.json')
+USAGE_FILE = os.path.join(BASE_PATH, 'usage.json')
+CONFIG_DEBOUNCE = 300   # 配置文件变化后等待的时间(ms), 合并多次修改事件
+FOCUS_DELAY = 30            # 前台窗口变化/切换Page后检查焦点的延迟(ms), 鼠标按下时按此间隔重试
+FOCUS_MIN_INTERVAL = 200    # 轮询(hook不可用时)的初始间隔(ms)
+FOCUS_MAX_INTERVAL = 3200   # 轮询无需切换焦点时逐步退避到的最大间隔(ms)
+SEARCH_LIMIT = 200          # 搜索结果最多显示的工具项数
+MRU_COMMIT_DELAY = 1000     # 按最近使用顺序切换时, 停止按键后结束切换的时间(ms), 收不到修饰键松开时兜底
 # 日志
 LOG_PATH = os.path.join(BASE_PATH, 'logs')
 if not os.path.exists(LOG_PATH):
     os.mkdir(LOG_PATH)
 LOG_FILE = os.path.join(LOG_PATH, 'run.log')
+LAUNCH_METRICS_FILE = os.path.join(LOG_PATH, 'launch.jsonl')
 file_handler = logging.FileHandler(filename=LOG_FILE, mode='a', encoding='UTF-8')
 logging.basicConfig(
     handlers=(file_handler, ), level=logging.INFO, datefmt='%Y-%m-%d %H:%M:%S',
     format='[%(asctime)s] [%(filename)s:%(lineno)d] [%(levelname)s]:  %(message)s',
 )
 logger = logging.getLogger(__name__)
+TRACE = StartupTrace(START_TIME)
+TRACE.Mark('imports')
 
 
 ################################################################################
 # 配置文件
 ################################################################################
 def GetConfigurations():
-    '''初始化配置'''
-    configurations = {}
-    with open(CONFIG_FILE, encoding='UTF-8') as fh:
-        try:
-            configurations = yaml.safe_load(fh)
-        except Exception:
-            logger.error('配置异常', exc_info=True)
-    if configurations:
-        FillConfigurationDefaults(configurations)
-    else:
-        configurations = {}
-    return configurations
-
-
-def FillConfigurationDefaults(configurations):
-    '''填充默认值'''
-    # 默认项
-    for item in configurations['items']:
-        if item['name'] == 'default':
-            defaultItem = item
-            break
-    # 删除无效项
-    for item in configurations['items'][::-1]:
-        if not (item['image'] and item['cmd'] and item['type']):
-            configurations['items'].remove(item)
-    # 填充默认值
-    for n, item in enumerate(configurations['items']):
-        item['index'] = n
-        item['name'] = str(item['name'])
-        for key, value in defaultItem.items():
-            if key not in item:
-                item[key] = value
+    '''初始化配置, 返回(摘要, 配置)'''
+    digest, configurations = ReadConfigurations(CONFIG_FILE)
+    if configurations is None:  # 解析失败
+        configurations = ParseConfigurations('')
+    return digest, configurations
+
+
+################################################################################
+# 会话保存
+################################################################################
+def LoadSession():
+    '''读取上次关闭时的标签页'''
+    if not os.path.exists(SESSION_FILE):
+        return {}
+    try:
+        with open(SESSION_FILE, encoding='UTF-8') as fh:
+            return json.loads(fh.read())
+    except Exception:
+        logger.error('会话文件异常', exc_info=True)
+        return {}
+
+
+def SaveSession(session):
+    '''保存标签页'''
+    try:
+        with open(SESSION_FILE, mode='w', encoding='UTF-8') as fh:
+            fh.write(json.dumps(session, ensure_ascii=False, indent=4))
+    except OSError:
+        logger.error('会话保存异常', exc_info=True)
 
 
 ################################################################################
@@ -129,26 +157,80 @@ class Frame(wx.Frame):
         self.__Bind()
         self.Maximize()
         self.Layout()
+        TRACE.Mark('widgets')
+
+    def StartDeferred(self):
+        '''首帧显示后再初始化: 标签页图片, 工具项绘制, 热键, 恢复标签页, 预热会话'''
+        self.UpdateImageList(self.notebook)
+        self.UpdateToolBar()
+        TRACE.Mark('toolbar')
+        self.StartHotKeys()
+        TRACE.Mark('hotkeys')
+        Preload('psutil')   # 启动/跟踪/采样线程首次使用之前, 在UI线程中加载
+        TRACE.Mark('psutil')
+        self.RestoreSession()
+        self.StartStartupWorkspaces()
+        TRACE.Mark('restore session')
+        self.sessionPool.Configure(self.configurations['items'])
+        TRACE.Mark('prewarm')
+        TRACE.Log()
 
     def __OnInit(self):
         '''初始化'''
         self.InitSettings()
         self.InitConfigurations()
+        TRACE.Mark('configurations')
         self.InitCoreMappings()
+        CompileSpecs(self.configurations['items'], self.coreMappings)   # 点击时不再解析cmd/path/env
         self.SetTitle(self.settings['title'])
         self.SetIcon(wx.Icon(self.settings['icon']))
         self.SetBackgroundColour(self.settings['background_colour'])
         # 内部保存信息
         self.pidExe = {}   # page ID => exe信息
         self.hwnds = set([self.GetHandle()])  # 所有窗口句柄
-        # 焦点切换
+        # 搜索
+        self.searchIndex = SearchIndex()
+        self.searchKeys = set()
+        self._searchBoost = None        # 工具项key => 使用记录得分, 每次搜索会话计算一次
+        self.tabIndex = SearchIndex()   # Page ID => (标题, 工具项名称, 主机), 标签页切换器使用
+        self.mru = MruStack()           # 最近选中的Page ID
+        self.mruOverlay = None          # 切换预览, 首次使用时创建
+        self._mruCall = None
+        self.launchUsage = LaunchUsage(USAGE_FILE)
+        # 启动调度
+        self.launcher = LaunchScheduler(self.configurations['settings']['launch_workers'])
+        self.launchHistory = LaunchHistory(LAUNCH_METRICS_FILE)
+        self.teardown = TeardownService(self.configurations['settings']['close_grace'])
+        self.processTracker = ProcessTracker(self.configurations['settings']['track_interval'])
+        # 资源监控
+        self.resourceMonitor = ResourceMonitor(
+            self.processTracker.Sessions, self.configurations['settings']['monitor_interval'],
+            callback=lambda: wx.CallAfter(self.OnResourceSample),   # 子线程不能直接更新UI
+        )
+        self.resourceMonitor.Start()
+        # 空闲会话休眠
+        self.hibernation = HibernationManager(self.GetSessionPids)
+        self._hibernateTimer = wx.Timer()
+        self._hibernateTimer.SetOwner(self)
+        self.UpdateHibernation()
+        self.sessionPool = SessionPool(
+            self.launcher, self.configurations['settings']['prewarm_limit'], self.teardown
+        )   # 首帧显示后再开始预热
+        # exe窗口位置/大小
+        self.geometry = GeometryManager(wx.CallAfter, self.hibernation.IsSuspended)
+        # 焦点切换: 订阅前台窗口变化, hook不可用时退化为轮询(退避, 非激活/最小化时停止)
+        self._focusCall = None
         self._focusTimer = wx.Timer()
         self._focusTimer.SetOwner(self)
-        self._focusTimer.Start(200)
+        self.foreground = ForegroundSubscription(
+            WinEventForegroundWatcher(), self.OnForeground, FOCUS_MIN_INTERVAL, FOCUS_MAX_INTERVAL
+        )
         # 配置更新
         self.configWatcher = wx.FileSystemWatcher()
         self.configWatcher.AddTree(BASE_PATH, wx.FSW_EVENT_MODIFY, CONFIG_FILE_NAME)
         self.configWatcher.SetOwner(self)
+        self._configCall = None
+        TRACE.Mark('subsystems')
 
     def InitSettings(self):
         '''界面相关设置'''
@@ -168,7 +250,7 @@ class Frame(wx.Frame):
                 configTemplate = fh.read().format(**GetBorders())
             with open(CONFIG_FILE, mode='w', encoding='UTF-8') as fh:
                 fh.write(configTemplate)
-        self.configurations = GetConfigurations()
+        self.configDigest, self.configurations = GetConfigurations()
 
     def InitCoreMappings(self):
         '''核心映射关系'''
@@ -179,38 +261,99 @@ class Frame(wx.Frame):
         '''构造主框架'''
         self.contentPanel = wx.Panel(self, style=wx.BORDER_NONE)
         self.contentPanel.SetBackgroundColour(self.settings['border_colour'])
+        self.searchCtrl = self.__CreateSearchCtrl(self.contentPanel)
         self.toolBar = self.__CreateToolBar(self.contentPanel)
-        self.UpdateToolBar()
         self.notebook = self.__CreateNotebook(self.contentPanel)
+        self.notebook.SetTabToolTip(self.GetTabToolTip)
+        self.statusBar = None
+        if self.configurations['settings']['status_bar']:
+            self.statusBar = self.CreateStatusBar(2)
+            self.statusBar.SetStatusWidths([-1, -1])
+
+    def __CreateSearchCtrl(self, parent):
+        '''工具项搜索框'''
+        searchCtrl = wx.SearchCtrl(parent, style=wx.TE_PROCESS_ENTER | wx.BORDER_NONE)
+        searchCtrl.SetMinSize((40, -1))     # 宽度跟随工具栏
+        searchCtrl.ShowCancelButton(True)
+        searchCtrl.SetDescriptiveText('搜索')
+        searchCtrl.SetBackgroundColour(self.settings['background_colour'])
+        searchCtrl.SetForegroundColour(self.settings['border_colour'])
+        return searchCtrl
 
     def __CreateToolBar(self, parent):
         '''构造工具栏'''
         toolBar = VScrolledToolBar(parent)
         return toolBar
 
-    def UpdateToolBar(self):
-        '''更新工具项'''
-        self.toolBar.ClearTools()
+    def GetTools(self):
+        '''工具栏中的 (key, 工具项/工作区)'''
+        tools = []
         for item in self.configurations.get('items', []):
             if item['type'] not in self.coreMappings:  # 缺失核心映射
                 continue
-            self.toolBar.AddTool(item['name'], wx.Bitmap(item['image']), clientData=item)
-        self.toolBar.Realize()
+            tools.append((('item', item['name']), item))
+        for workspace in self.configurations.get('workspaces', []):
+            tools.append((('workspace', workspace['name']), workspace))
+        return tools
+
+    def UpdateToolBar(self, modified=None):
+        '''更新工具项. modified为None时全部重建, 否则只重建新增及modified中的工具项'''
+        tools = self.GetTools()
+        self.UpdateSearchIndex(tools)
+        if modified is None:
+            self.toolBar.ClearTools()
+            for key, data in tools:
+                self.toolBar.AddTool(data['name'], data['image'], clientData=data, key=key)
+            self.toolBar.Realize()
+            return
+        # 图片按路径在ImageCache中共享, 不需要重复解码
+        self.toolBar.UpdateTools([(key, data['name'], data['image'], data) for key, data in tools], modified)
+        self.OnSearch(None)    # 重新过滤
+
+    def UpdateSearchIndex(self, tools):
+        '''增量更新搜索索引: 字段未变化的工具项不重建'''
+        keys = set()
+        for order, (key, data) in enumerate(tools):
+            keys.add(key)
+            self.searchIndex.Update(key, (data['name'], ExtractHost(data.get('cmd')), data.get('type')), order)
+        for key in self.searchKeys - keys:
+            self.searchIndex.Remove(key)
+        self.searchKeys = keys
+        self._searchBoost = None
 
     def __CreateNotebook(self, parent):
         '''构造book'''
+        notebook = Notebook(parent)
+        self.imageIds = {}  # 图片路径 => ImageList中的序号, 首帧显示后再生成
+        return notebook
+
+    def UpdateImageList(self, notebook):
+        '''标签页图片, 配置更新后同步已打开的Page'''
+        imageCache = GetImageCache()
         imgList = wx.ImageList(16, 16)
+        self.imageIds = {}
         for item in self.configurations['items']:
-            imgList.Add(wx.Bitmap(wx.Image(item['image']).Scale(16, 16)))
-        notebook = Notebook(parent)
+            if item['image'] not in self.imageIds:
+                self.imageIds[item['image']] = imgList.Add(imageCache.GetBitmap(item['image'], (16, 16)))
         notebook.AssignImageList(imgList)
-        return notebook
+        for index in range(notebook.GetPageCount()):
+            pageId = notebook.GetPage(index).GetId()
+            if pageId in self.pidExe:
+                notebook.SetPageImage(index, self.GetImageId(self.pidExe[pageId]['toolData']))
+
+    def GetImageId(self, toolData):
+        '''工具项对应的标签页图片'''
+        return self.imageIds.get(toolData['image'], -1)
 
     def __Layout(self):
         '''布局'''
+        tsizer = wx.BoxSizer(wx.VERTICAL)
+        tsizer.Add(self.searchCtrl, 0, wx.EXPAND | wx.BOTTOM, 1)
+        tsizer.Add(self.toolBar, 1, wx.EXPAND)
+
         csizer = wx.BoxSizer(wx.HORIZONTAL)
         csizer.AddSpacer(1)
-        csizer.Add(self.toolBar, 0, wx.EXPAND | wx.ALL, 1)
+        csizer.Add(tsizer, 0, wx.EXPAND | wx.ALL, 1)
         csizer.Add(self.notebook, 1, wx.EXPAND | wx.ALL & (~wx.LEFT), 1)
         self.contentPanel.SetSizer(csizer)
 
@@ -222,72 +365,206 @@ class Frame(wx.Frame):
         '''事件绑定'''
         # 启动exe
         self.Bind(wx.EVT_TOOL, self.OnTool)
+        # 搜索
+        self.searchCtrl.Bind(wx.EVT_TEXT, self.OnSearch)
+        self.searchCtrl.Bind(wx.EVT_TEXT_ENTER, self.OnSearchEnter)
+        self.searchCtrl.Bind(wx.EVT_SEARCH_CANCEL, self.OnSearchCancel)
+        self.searchCtrl.Bind(wx.EVT_CHAR_HOOK, self.OnSearchKey)
         # 关闭
         self.Bind(EVT_FLATNOTEBOOK_PAGE_CLOSING, self.OnPageClose)
+        # 未启动的Page
+        self.Bind(EVT_FLATNOTEBOOK_PAGE_CHANGED, self.OnPageChanged)
         self.Bind(wx.EVT_CLOSE, self.OnClose)
+        # 标签页右键菜单
+        self.Bind(EVT_FLATNOTEBOOK_PAGE_CONTEXT_MENU, self.OnPageContextMenu)
         # 焦点切换
-        self.Bind(wx.EVT_TIMER, self.OnFocus, self._focusTimer)
+        self.Bind(wx.EVT_TIMER, self.OnFocusTimer, self._focusTimer)
+        self.Bind(wx.EVT_ACTIVATE, self.OnActivate)
+        self.Bind(wx.EVT_ICONIZE, self.OnIconize)
+        # 空闲会话休眠
+        self.Bind(wx.EVT_TIMER, self.OnHibernateTimer, self._hibernateTimer)
         # 配置更新
         self.Bind(wx.EVT_FSWATCHER, self.OnUpdateConfig)
-        # 热键监控 (默认激活窗口为exe子窗口, 无法使用普通方法创建热键，需要全局的按键监听)
-        listen = ListenKeyThread()
-        listen.AddHotKey('<ctrl>+<9>', self.OnChangePage)  # Ctrl + Tab 切换Page
-        listen.AddHotKey('<alt>+`', self.OnTogglePage)   # Ctrl + ~ 两个页面相关切换
-        listen.Start()
+        # 热键监控: 首帧显示后启动
+        self.hotKeyThread = None
 
     #################################### 启动exe ################################
     def OnTool(self, event):
-        '''创建 启动exe 线程'''
-        toolItem = self.FindWindowById(event.GetId())
+        '''启动exe: 先显示占位Page, 启动在后台完成'''
+        toolItem = self.toolBar.FindTool(event.GetId())
         # Tool事件过滤： https://github.com/wxWidgets/Phoenix/issues/2347
         if toolItem is None:
             return
-        self._BeforeStartExe()
-        toolData = toolItem.GetClientData()
-        type_ = self.coreMappings[toolData['type']]
-        # 启动
-        StartExeThread(
-            toolData['cmd'], toolData['path'], toolData['env'],
-            type_['class_name'], type_['process_keys'],
-            lambda hwnd, pids: self._StartExeCallback(hwnd, pids, toolData)
-        ).start()
-
-    def _BeforeStartExe(self):
-        '''启动exe前准备'''
-        self.toolBar.Disable()
-        self._busyInfo = wx.BusyInfo(
-            wx.BusyInfoFlags().Parent(self)
-            .Title('正在启动').Text('请稍后...')
-            .Foreground(self.settings['border_colour'])
-            .Background(self.settings['background_colour'])
+        self.LaunchTool(toolItem.GetClientData())
+
+    def LaunchTool(self, toolData):
+        '''启动工具项或工作区, 并记录使用次数(用于搜索排序)'''
+        self.launchUsage.Record(toolData['name'])
+        self.launchUsage.Save()
+        self._searchBoost = None
+        if 'sessions' in toolData:  # 工作区
+            self.StartWorkspace(toolData)
+        else:
+            self.StartExe(toolData)
+
+    def StartWorkspace(self, workspace):
+        '''同时启动工作区的所有会话, 占位Page按声明顺序添加, 与启动完成顺序无关'''
+        logger.info(f'workspace: {workspace["name"]}')
+        first = self.notebook.GetPageCount()
+        for toolData in workspace['sessions']:
+            if toolData['type'] in self.coreMappings:
+                self.StartExe(toolData, select=False)
+        if first < self.notebook.GetPageCount():
+            self.SelectPage(first)
+
+    def RestoreSession(self):
+        '''恢复上次关闭时的标签页, 不立即启动'''
+        mode = self.configurations['settings']['restore']
+        session = LoadSession()
+        if mode == 'none' or not session.get('pages'):
+            return
+        items = {}
+        for item in self.configurations.get('items', []):
+            items.setdefault(item['name'], item)
+        first = self.notebook.GetPageCount()
+        for entry in session['pages']:
+            toolData = items.get(entry['name'])
+            if toolData is None or toolData['type'] not in self.coreMappings:
+                continue
+            self.StartExe(toolData, select=False, title=entry.get('title'), lazy=True)
+        count = self.notebook.GetPageCount() - first
+        if count == 0:
+            return
+        self.SelectPage(first + min(max(session.get('selection', 0), 0), count - 1))
+        if mode == 'progressive':   # 有界线程池中依次启动
+            for index in range(first, first + count):
+                self.LaunchPage(self.notebook.GetPage(index).GetId())
+
+    def SaveSession(self):
+        '''保存当前的标签页'''
+        pages = []
+        for index in range(self.notebook.GetPageCount()):
+            pageId = self.notebook.GetPage(index).GetId()
+            if pageId not in self.pidExe:
+                continue
+            pages.append({
+                'name': self.pidExe[pageId]['toolData']['name'],
+                'title': self.notebook.GetPageText(index),
+            })
+        SaveSession({'pages': pages, 'selection': max(self.notebook.GetSelection(), 0)})
+
+    def StartStartupWorkspaces(self):
+        '''启动时打开的工作区'''
+        for workspace in self.configurations.get('workspaces', []):
+            if workspace['startup']:
+                self.StartWorkspace(workspace)
+
+    def StartExe(self, toolData, select=True, title=None, lazy=False):
+        '''添加占位Page并加入启动队列, lazy时等Page首次被选中再启动'''
+        page = self._CreatePlaceholderPage(toolData, lazy)
+        pageId = page.GetId()
+        self.pidExe[pageId] = {'hwnd': None, 'pids': set(), 'toolData': toolData, 'launchId': None, 'record': None}
+        self.notebook.AddPage(page, title or toolData['name'], select, self.GetImageId(toolData))
+        self.UpdateTabIndex(pageId, title or toolData['name'], toolData)
+        if select:  # AddPage选中时不产生PAGE_CHANGED事件
+            self.mru.Touch(pageId)
+            self.hibernation.Select(pageId)
+        else:
+            self.mru.Add(pageId)
+        if not lazy:
+            self.LaunchPage(pageId)
+
+    def LaunchPage(self, pageId):
+        '''启动占位Page对应的exe'''
+        exeInfo = self.pidExe.get(pageId)
+        if exeInfo is None or exeInfo['launchId'] is not None:   # 已关闭 / 已启动
+            return
+        toolData = exeInfo['toolData']
+        spec = toolData['spec']
+        page = self.FindWindowById(pageId)
+        page.placeholder.SetLabel(f'正在启动 {toolData["name"]} ...')
+        page.Layout()
+        session = self.sessionPool.Acquire(toolData['name'], GetBackend().IsWindow)
+        if session is not None:     # 使用预热会话
+            hwnd, pids, exeInfo['launchId'] = session
+            self._OnStartExeSuccessed(hwnd, pids, pageId)
+            return
+        # 查找窗口的超时按该type的启动记录调整
+        timeout = self.launchHistory.Timeout(spec.type, DEFAULT_TIMEOUT if spec.timeout is None else spec.timeout)
+        exeInfo['record'] = LaunchRecord(spec.name, spec.type)
+        exeInfo['launchId'] = self.launcher.Submit(
+            spec, lambda hwnd, pids: self._StartExeCallback(hwnd, pids, pageId), timeout, exeInfo['record']
         )
 
-    def _AfterStartExe(self):
-        '''启动exe后恢复'''
-        self.toolBar.Enable()
-        del self._busyInfo
+    def _CreatePlaceholderPage(self, toolData, lazy=False):
+        '''占位Page, exe窗口就绪后附着'''
+        page = wx.Panel(self.notebook)
+        if lazy:
+            text = f'{toolData["name"]} 未启动, 选中标签页后启动'
+        else:
+            text = f'正在启动 {toolData["name"]} ...'
+        label = wx.StaticText(page, -1, text)
+        label.SetForegroundColour(self.settings['border_colour'])
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.AddStretchSpacer()
+        sizer.Add(label, 0, wx.ALIGN_CENTER)
+        sizer.AddStretchSpacer()
+        page.SetSizer(sizer)
+        page.placeholder = label
+        return page
 
-    def _StartExeCallback(self, hwnd, pids, toolData):
+    def _StartExeCallback(self, hwnd, pids, pageId):
         '''子线程回调'''
         if hwnd is None:
             realCallback = self._OnStartExeFailed
         else:
             realCallback = self._OnStartExeSuccessed
-        wx.CallAfter(realCallback, hwnd, pids, toolData)   # 子线程不能直接更新UI
-        wx.CallAfter(self._AfterStartExe)
+        wx.CallAfter(realCallback, hwnd, pids, pageId)   # 子线程不能直接更新UI
 
-    def _OnStartExeSuccessed(self, hwnd, pids, toolData):
+    def _OnStartExeSuccessed(self, hwnd, pids, pageId):
         '''启动成功'''
-        page = wx.Panel(self.notebook)
+        page = self.FindWindowById(pageId)
+        if page is None or pageId not in self.pidExe:   # 启动过程中Page已关闭
+            self.teardown.Close([(hwnd, pids, False)])  # 未显示过, 直接结束
+            return
+        exeInfo = self.pidExe[pageId]
+        exeInfo['hwnd'] = hwnd
+        exeInfo['pids'] = pids
         self.hwnds.add(hwnd)
-        self.pidExe[page.GetId()] = {'hwnd': hwnd, 'pids': pids, 'toolData': toolData}
-        self._ExeAttachedToPage(hwnd, page, toolData['borders'])
+        self.processTracker.Add(pageId, pids)
+        page.placeholder.Destroy()
+        page.SetSizer(None)
+        record = exeInfo['record']
+        start = time.perf_counter()
+        self._ExeAttachedToPage(hwnd, page, exeInfo['toolData']['borders'])
+        self.geometry.Add(pageId, hwnd, page, exeInfo['toolData']['borders'])
         page.Bind(wx.EVT_SIZE, self.OnSize)
-        self.notebook.AddPage(page, toolData['name'], True, toolData['index'])
+        self.RequestFocusCheck()
+        if record is not None:  # 预热会话没有启动记录
+            record.Add('attach', time.perf_counter() - start)
+            threading.Thread(target=self._WaitFirstPaint, args=(hwnd, record), daemon=True).start()
+
+    def _WaitFirstPaint(self, hwnd, record):
+        '''子线程: 等待exe窗口处理完附着后的消息(近似首次重绘), 之后保存启动记录'''
+        with record.Measure('first_paint'):
+            GetBackend().WaitPaint(hwnd, 2)
+        self.SaveLaunchRecord(record)
 
-    def _OnStartExeFailed(self, hwnd, pids, toolData):
+    def SaveLaunchRecord(self, record):
+        '''保存启动记录(可在任意线程调用)'''
+        phases = '  '.join(f'{phase}: {cost * 1e3:.0f}ms' for phase, cost in record['phases'].items())
+        logger.info(f'launch {record["name"]}: {record["result"]}  iterations: {record["iterations"]}  {phases}')
+        self.launchHistory.Append(record)
+
+    def _OnStartExeFailed(self, hwnd, pids, pageId):
         '''启动失败'''
-        dlg = MessageDialog(self, '启动异常')
+        if pageId not in self.pidExe:   # 启动过程中Page已关闭
+            return
+        if self.pidExe[pageId]['record'] is not None:
+            self.SaveLaunchRecord(self.pidExe[pageId]['record'])
+        toolData = self.pidExe[pageId]['toolData']
+        self.notebook.DeletePage(self.notebook.FindPageIndex(pageId))
+        dlg = MessageDialog(self, f'{toolData["name"]} 启动异常')
         dlg.ShowModal()
         dlg.Destroy()
 
@@ -295,112 +572,544 @@ class Frame(wx.Frame):
     def OnPageClose(self, event):
         '''关闭单页'''
         pid = self.notebook.GetPage(event.GetSelection()).GetId()
-        exeInfo = self.pidExe[pid]
-        KillPids(exeInfo['pids'])  # 清理相关的所有进程
-        # win32gui.SendMessage(exeInfo['hwnd'], win32con.WM_CLOSE, 0, 0)  # 更好?
-        self.hwnds.remove(exeInfo['hwnd'])
-        del self.pidExe[pid]
+        self.CloseSessions([pid])
+        event.Skip()
+
+    def CloseSessions(self, pageIds):
+        '''关闭会话: 启动中的取消, 已启动的在后台关闭(WM_CLOSE, 超时后强制结束相关的所有进程)'''
+        sessions = []
+        for pageId in pageIds:
+            exeInfo = self.pidExe.pop(pageId, None)
+            if exeInfo is None:
+                continue
+            self.hibernation.Remove(pageId)     # 挂起的exe无法响应窗口消息, 先恢复
+            self.geometry.Remove(pageId)
+            self.tabIndex.Remove(pageId)
+            self.mru.Remove(pageId)
+            if exeInfo['hwnd'] is None:     # 仍在启动中 / 未启动
+                if exeInfo['launchId'] is not None:
+                    self.launcher.Cancel(exeInfo['launchId'])
+                continue
+            pids = dict.fromkeys(exeInfo['pids'])
+            pids.update(self.processTracker.Remove(pageId))     # pid => 创建时间
+            sessions.append((exeInfo['hwnd'], pids, exeInfo['toolData']['spec'].closeMessage))
+            self.hwnds.discard(exeInfo['hwnd'])
+            self.launcher.Release(exeInfo['launchId'])
+        self.teardown.Close(sessions)
+
+    def SelectPage(self, index):
+        '''选中Page(SetSelection不产生PAGE_CHANGED事件), 未启动时启动'''
+        self.notebook.SetSelection(index)
+        self.PageSelected(index)
+
+    def OnPageChanged(self, event):
+        '''选中未启动的Page时启动'''
         event.Skip()
+        self.PageSelected(event.GetSelection())
+
+    def PageSelected(self, index):
+        '''选中Page后: 未启动时启动, 从休眠中恢复, 调整隐藏期间的大小变化, 切换焦点'''
+        if 0 <= index < self.notebook.GetPageCount():
+            pageId = self.notebook.GetPage(index).GetId()
+            self.mru.Touch(pageId)
+            self.LaunchPage(pageId)
+            if self.hibernation.Select(pageId):
+                self.notebook.SetTabMarked(index, False)
+        self.geometry.Schedule()
+        self.RequestFocusCheck()
 
     def OnClose(self, event):
         '''关闭所有页'''
-        for _ in range(len(self.pidExe)):
-            self.notebook.DeletePage(0)
+        if self.hotKeyThread is not None:
+            logger.info(f'hotkeys:\n{self.hotKeyThread.matcher.stats.Report()}')
+        self.foreground.Stop()
+        self._focusTimer.Stop()
+        if self._focusCall is not None:
+            self._focusCall.Stop()
+        if self._mruCall is not None:
+            self._mruCall.Stop()
+        self.SaveSession()
+        self.Hide()     # 立即关闭界面, 会话在后台退出
+        self.resourceMonitor.Stop()
+        self._hibernateTimer.Stop()
+        logger.info(
+            f'resource monitor: {self.resourceMonitor.sweeps} samples  overhead: {self.resourceMonitor.Overhead():.3f}%'
+        )
+        self.processTracker.Stop()
+        self.launcher.Shutdown()
+        self.sessionPool.Drain()
+        self.notebook.Freeze()
+        self.CloseSessions(list(self.pidExe))
+        self.notebook.DeleteAllPages()
+        self.notebook.Thaw()
         self.Destroy()
 
+    #################################### 资源监控 ##############################
+    def GetTabToolTip(self, index):
+        '''标签提示: 会话的CPU/内存'''
+        if not 0 <= index < self.notebook.GetPageCount():
+            return ''
+        title = self.notebook.GetPageText(index)
+        sample = self.resourceMonitor.Latest(self.notebook.GetPage(index).GetId())
+        if self.hibernation.IsSuspended(self.notebook.GetPage(index).GetId()):
+            title += ' (已休眠)'
+        if sample is None:
+            return title
+        return f'{title}\nCPU: {sample.cpu:.1f}%  内存: {FormatBytes(sample.rss)}  进程: {sample.count}'
+
+    def OnResourceSample(self):
+        '''采样完成: 更新状态栏'''
+        if not self or self.statusBar is None:  # 已关闭 / 不显示状态栏
+            return
+        index = self.notebook.GetSelection()
+        text = ''
+        if index != -1:
+            sample = self.resourceMonitor.Latest(self.notebook.GetPage(index).GetId())
+            if sample is not None:
+                text = f'当前: CPU {sample.cpu:.1f}%  内存 {FormatBytes(sample.rss)}  进程 {sample.count}'
+        self.statusBar.SetStatusText(text, 0)
+        cpu = rss = 0
+        for pageId in self.pidExe:
+            sample = self.resourceMonitor.Latest(pageId)
+            if sample is not None:
+                cpu += sample.cpu
+                rss += sample.rss
+        self.statusBar.SetStatusText(
+            f'全部: CPU {cpu:.1f}%  内存 {FormatBytes(rss)}  采样开销 {self.resourceMonitor.Overhead():.2f}%', 1
+        )
+
+    #################################### 空闲休眠 ##############################
+    def GetSessionPids(self, pageId):
+        '''会话的所有进程: 启动时找到的 + 运行中跟踪到的'''
+        exeInfo = self.pidExe.get(pageId)
+        if exeInfo is None:
+            return set()
+        return exeInfo['pids'] | self.processTracker.Pids(pageId)
+
+    def UpdateHibernation(self):
+        '''有工具项设置了hibernate_after时才定时检查'''
+        if any((item.get('hibernate_after') or 0) > 0 for item in self.configurations['items']):
+            if not self._hibernateTimer.IsRunning():
+                self._hibernateTimer.Start(CHECK_INTERVAL * 1000)
+        elif self._hibernateTimer.IsRunning():
+            self._hibernateTimer.Stop()
+            self.OnResumeAll()
+
+    def OnHibernateTimer(self, event):
+        '''挂起超时未选中的会话'''
+        candidates = {
+            pageId: exeInfo['toolData'].get('hibernate_after') for pageId, exeInfo in self.pidExe.items()
+            if exeInfo['hwnd'] is not None
+        }
+        index = self.notebook.GetSelection()
+        if index != -1:     # 当前显示的Page不挂起(不依赖hibernation记录的选中状态)
+            candidates.pop(self.notebook.GetPage(index).GetId(), None)
+        for pageId in self.hibernation.Check(candidates):
+            self.notebook.SetTabMarked(self.notebook.FindPageIndex(pageId), True)
+
+    def OnResumeAll(self):
+        '''恢复所有休眠的会话'''
+        self.hibernation.ResumeAll()
+        for index in range(self.notebook.GetPageCount()):
+            self.notebook.SetTabMarked(index, False)
+
+    def OnToggleKeepRunning(self, pageId):
+        '''会话不休眠 / 恢复休眠'''
+        excluded = not self.hibernation.IsExcluded(pageId)
+        self.hibernation.SetExcluded(pageId, excluded)
+        if excluded:
+            self.notebook.SetTabMarked(self.notebook.FindPageIndex(pageId), False)
+
+    def OnPageContextMenu(self, event):
+        '''标签页右键菜单'''
+        menu = wx.Menu()
+        index = event.GetSelection()
+        if 0 <= index < self.notebook.GetPageCount():
+            pageId = self.notebook.GetPage(index).GetId()
+            if pageId in self.pidExe:
+                item = menu.AppendCheckItem(wx.ID_ANY, '保持运行(不休眠)')
+                item.Check(self.hibernation.IsExcluded(pageId))
+                menu.Bind(wx.EVT_MENU, lambda event: self.OnToggleKeepRunning(pageId), item)
+        item = menu.Append(wx.ID_ANY, '切换标签页...')
+        menu.Bind(wx.EVT_MENU, lambda event: self.OnTabSwitcher(), item)
+        item = menu.Append(wx.ID_ANY, '进程诊断')
+        menu.Bind(wx.EVT_MENU, self.OnProcessDiagnostics, item)
+        item = menu.Append(wx.ID_ANY, '启动统计')
+        menu.Bind(wx.EVT_MENU, self.OnLaunchReport, item)
+        self.PopupMenu(menu)
+        menu.Destroy()
+
+    def OnProcessDiagnostics(self, event):
+        '''列出各会话跟踪到的进程及孤儿进程'''
+        self.processTracker.Sweep()
+        report = self.processTracker.Report()
+        sessions = []
+        for index in range(self.notebook.GetPageCount()):
+            pageId = self.notebook.GetPage(index).GetId()
+            if pageId in report:
+                sessions.append((self.notebook.GetPageText(index), report[pageId]))
+        dlg = ProcessDialog(self, sessions)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+    def OnLaunchReport(self, event):
+        '''各工具项启动耗时的p50/p95'''
+        from wx.lib.dialogs import ScrolledMessageDialog
+        dlg = ScrolledMessageDialog(self, self.launchHistory.Report(), '启动统计', size=(640, 480))
+        dlg.ShowModal()
+        dlg.Destroy()
+
+    #################################### 搜索 ##################################
+    def OnSearch(self, event):
+        '''按输入过滤工具栏'''
+        query = self.searchCtrl.GetValue().strip()
+        if not query:
+            self._searchBoost = None
+            self.toolBar.SetFilter(None)
+            return
+        if self._searchBoost is None:   # 输入过程中不重复计算使用记录得分
+            scores = self.launchUsage.Scores()
+            self._searchBoost = {key: scores[key[1]] for key in self.searchKeys if key[1] in scores}
+        self.toolBar.SetFilter(self.searchIndex.Search(query, boost=self._searchBoost, limit=SEARCH_LIMIT))
+
+    def OnSearchEnter(self, event):
+        '''回车启动第一个结果'''
+        tools = self.toolBar.GetVisibleTools()
+        if self.searchCtrl.GetValue().strip() and tools:
+            self.LaunchTool(tools[0].GetClientData())
+        self.LeaveSearch()
+
+    def OnSearchCancel(self, event):
+        self.searchCtrl.ChangeValue('')
+        self._searchBoost = None
+        self.toolBar.SetFilter(None)
+
+    def OnSearchKey(self, event):
+        '''Esc: 清空搜索, 焦点交还exe'''
+        if event.GetKeyCode() != wx.WXK_ESCAPE:
+            event.Skip()
+            return
+        self.OnSearchCancel(None)
+        self.LeaveSearch()
+
+    def IsSearching(self):
+        '''焦点在搜索框中(输入期间不切换焦点到exe)'''
+        focus = wx.Window.FindFocus()
+        while focus is not None and focus is not self:
+            if focus is self.searchCtrl:
+                return True
+            focus = focus.GetParent()
+        return False
+
+    def LeaveSearch(self):
+        '''离开搜索框, 焦点交还当前Page的exe'''
+        self.notebook.SetFocus()
+        self.RequestFocusCheck()
+
     ############################################################################
     def OnSize(self, event):
-        '''调整窗口size'''
+        '''调整窗口size: 合并后只调整可见的Page'''
         event.Skip()
-        pid = event.GetId()
-        page = self.FindWindowById(pid)
-        hwnd = self.pidExe[pid]['hwnd']
-        borders = self.pidExe[pid]['toolData']['borders']
-        self._ReSizeExeWindow(hwnd, page, borders)
-
-    def OnFocus(self, event):
-        '''空闲时, 自动切换焦点'''
-        fgHwnd = win32gui.GetForegroundWindow()
+        self.geometry.Invalidate(event.GetId())
+
+    ########################## 焦点切换 ##########################################
+    def OnForeground(self, hwnd):
+        '''前台窗口变化(hook回调): 切换到本程序时检查焦点'''
+        if hwnd in self.hwnds:
+            self.RequestFocusCheck()
+
+    def RequestFocusCheck(self, delay=FOCUS_DELAY):
+        '''稍后检查焦点, 多次请求合并为一次'''
+        if self._focusCall is None:
+            self._focusCall = wx.CallLater(delay, self._OnFocusCall)
+
+    def _OnFocusCall(self):
+        self._focusCall = None
+        if not self.CheckFocus():   # 鼠标仍按下, 松开后再切换
+            self.RequestFocusCheck()
+
+    def CheckFocus(self):
+        '''本程序在前台时, 焦点切换到当前Page的exe. 返回False表示需要稍后重试'''
+        fgHwnd = GetBackend().GetForegroundWindow()
         if fgHwnd not in self.hwnds:    # 非激活状态
-            return
+            return True
         if wx.GetMouseState().LeftIsDown():   # 点击状态忽略
-            return
+            return False
+        if self.IsSearching():  # 正在输入搜索, Esc/回车后交还
+            return True
         index = self.notebook.GetSelection()
         if index == -1:
-            return
+            return True
         pid = self.notebook.GetPage(index).GetId()
-        if pid not in self.pidExe:
-            return
+        if pid not in self.pidExe or self.pidExe[pid]['hwnd'] is None:
+            return True
+        if self.hibernation.IsSuspended(pid):   # 连续切换经过的休眠Page, 结束切换恢复后再切换焦点
+            return True
         if self.pidExe[pid]['hwnd'] == fgHwnd:  # 已经激活
-            return
+            return True
         self._SetFocus(self.pidExe[pid]['hwnd'])
+        return True
+
+    def OnActivate(self, event):
+        '''激活时检查焦点, 轮询模式下重新开始轮询, 非激活时停止'''
+        event.Skip()
+        if not event.GetActive():
+            self._focusTimer.Stop()
+            return
+        self.RequestFocusCheck()
+        interval = self.foreground.Restart()
+        if interval is not None:
+            self._focusTimer.StartOnce(interval)
+
+    def OnIconize(self, event):
+        '''最小化时停止轮询'''
+        event.Skip()
+        if event.IsIconized():
+            self._focusTimer.Stop()
+
+    def OnFocusTimer(self, event):
+        '''轮询(hook不可用时): 无需切换焦点时逐步增大间隔'''
+        if self.IsIconized() or not self.IsActive():
+            return
+        self._focusTimer.StartOnce(self.foreground.Next(self.CheckFocus()))
 
     def OnUpdateConfig(self, event):
-        '''配置更新 & 工具栏更新'''
-        if GetConfigurations() != self.configurations:
-            self.InitConfigurations()
-            self.UpdateToolBar()
+        '''配置文件变化: 编辑器保存一次可能产生多个事件, 合并后再更新'''
+        if self._configCall is None:
+            self._configCall = wx.CallLater(CONFIG_DEBOUNCE, self.ReloadConfigurations)
+        else:
+            self._configCall.Restart(CONFIG_DEBOUNCE)
+
+    def ReloadConfigurations(self):
+        '''配置更新 & 工具栏增量更新'''
+        try:
+            digest, configurations = ReadConfigurations(CONFIG_FILE)
+        except OSError:     # 编辑器保存过程中文件可能暂时不可读
+            logger.warning('配置读取异常', exc_info=True)
+            return
+        if digest == self.configDigest:     # 内容未变化
+            return
+        self.configDigest = digest
+        if configurations is None:  # 解析失败, 保留原配置
+            return
+        CompileSpecs(configurations['items'], self.coreMappings)
+        itemDiff = DiffItems(self.configurations['items'], configurations['items'])
+        workspaceDiff = DiffItems(
+            self.configurations['workspaces'], configurations['workspaces'], ('index', 'sessions')
+        )
+        logger.info(f'items: {itemDiff}  workspaces: {workspaceDiff}')
+        oldItems = {item['name']: item for item in self.configurations['items']}
+        if configurations['settings']['status_bar'] != self.configurations['settings']['status_bar']:
+            logger.warning('status_bar修改后重启生效')
+        self.configurations = configurations
+        # 只有图片变化的工具项需要重建
+        modified = {
+            ('item', item['name']) for item in configurations['items']
+            if item['name'] in itemDiff.modified and item['image'] != oldItems[item['name']]['image']
+        }
+        modified |= {('workspace', name) for name in workspaceDiff.modified}
+        self.UpdateToolBar(modified)
+        self.UpdatePages()
+        self.UpdateHotKeys()
+        self.UpdateImageList(self.notebook)
+        self.launcher.SetMaxWorkers(self.configurations['settings']['launch_workers'])
+        self.teardown.grace = self.configurations['settings']['close_grace']
+        self.processTracker.interval = self.configurations['settings']['track_interval']
+        self.processTracker.Start()
+        self.resourceMonitor.interval = self.configurations['settings']['monitor_interval']
+        self.resourceMonitor.Start()
+        self.UpdateHibernation()
+        self.sessionPool.Configure(self.configurations['items'], self.configurations['settings']['prewarm_limit'])
+
+    def UpdatePages(self):
+        '''已打开的Page使用新配置(如borders), 不重启exe'''
+        items = {item['name']: item for item in self.configurations['items']}
+        for pageId, exeInfo in self.pidExe.items():
+            toolData = items.get(exeInfo['toolData']['name'])
+            if toolData is None:    # 工具项已删除, 保留原配置
+                continue
+            exeInfo['toolData'] = toolData
+            self.geometry.SetBorders(pageId, toolData['borders'])
+            self.UpdateTabIndex(pageId, self.notebook.GetPageText(self.notebook.FindPageIndex(pageId)), toolData)
 
     ########################## 热键处理 ##########################################
-    def WrapHotKeyHandler(handler):
-        '''封装热键handler'''
-        return lambda self: wx.CallAfter(handler, self)  # 子线程不能直接更新UI
+    def StartHotKeys(self):
+        '''热键监控 (默认激活窗口为exe子窗口, 无法使用普通方法创建热键，需要全局的按键监听)'''
+        self.hotKeyThread = ListenKeyThread()
+        self.hotKeyThread.matcher.onRelease = lambda: wx.CallAfter(self.OnHotKeyRelease)
+        self.UpdateHotKeys()
+        self.hotKeyThread.Start()
 
-    @WrapHotKeyHandler
-    def OnChangePage(self):
-        '''Page切换'''
-        if win32gui.GetForegroundWindow() not in self.hwnds:   # 非激活状态
+    def UpdateHotKeys(self):
+        '''按配置注册热键, 配置更新后整体替换'''
+        from utils.HotKeys import ParseAction   # pynput在启动热键线程时才导入
+        if self.hotKeyThread is None:   # 尚未启动
             return
-        self.notebook.AdvanceSelection()
+        hotKeys = {}
+        for combo, action in self.configurations['hotkeys'].items():
+            try:
+                name, arg = ParseAction(action)
+            except ValueError:
+                logger.warning(f'热键 {combo} 配置异常', exc_info=True)
+                continue
+            hotKeys[combo] = self.WrapHotKeyHandler(combo, name, arg)
+        self.hotKeyThread.SetHotKeys(hotKeys)
+
+    def WrapHotKeyHandler(self, combo, name, arg):
+        '''封装热键handler: 钩子线程中只转到UI线程(子线程不能直接更新UI)'''
+        return lambda t0: wx.CallAfter(self.OnHotKey, combo, name, arg, t0)
+
+    def OnHotKey(self, combo, name, arg, t0):
+        '''执行热键动作, 记录按键到动作完成的延迟'''
+        if GetBackend().GetForegroundWindow() not in self.hwnds:   # 非激活状态
+            return
+        if name == 'next_page':
+            self.OnChangePage(True)
+        elif name == 'prev_page':
+            self.OnChangePage(False)
+        elif name == 'toggle_page':
+            self.OnTogglePage()
+        elif name == 'switch_page':
+            self.OnTabSwitcher()
+        elif name == 'mru_next':
+            self.OnMruCycle(1)
+        elif name == 'mru_prev':
+            self.OnMruCycle(-1)
+        elif name == 'page':
+            self.OnJumpPage(int(arg) - 1)
+        elif name == 'launch':
+            self.OnLaunchHotKey(arg)
+        self.hotKeyThread.matcher.stats.RecordAction(combo, time.perf_counter() - t0)
+
+    def OnChangePage(self, forward=True):
+        '''Page切换'''
+        self.notebook.AdvanceSelection(forward)
+        self.PageSelected(self.notebook.GetSelection())
 
-    @WrapHotKeyHandler
     def OnTogglePage(self):
-        '''两个Page相互切换'''
-        page = self.notebook.GetPreviousSelection()
-        if 0 <= page < self.notebook.GetPageCount():
-            self.notebook.SetSelection(page)
+        '''最近选中的两个Page相互切换'''
+        keys = self.mru.Keys()
+        if len(keys) > 1:
+            index = self.notebook.FindPageIndex(keys[1])
+            if index != -1:
+                self.SelectPage(index)
 
-    ############################ win32api相关 ###################################
+    def OnMruCycle(self, step):
+        '''按最近使用顺序切换一步: 有预览时只更新预览, 结束时才切换; 否则只切换显示的Page
+
+        切换中经过的Page不启动/不恢复休眠/不切换焦点, 结束时只对最终选中的Page处理一次;
+        经过的休眠Page也不调整窗口大小(GeometryManager跳过), 恢复后再调整
+        '''
+        pageId = self.mru.Cycle(step)
+        if pageId is None:
+            return
+        if self.configurations['settings']['mru_overlay']:
+            if self.mruOverlay is None:
+                self.mruOverlay = MruOverlay(self)
+            keys, pos = self.mru.CycleState()
+            start = max(0, pos - MAX_ROWS + 1)  # 只取预览中显示的行
+            self.mruOverlay.ShowRows([self.GetTabLabel(key) for key in keys[start:pos + 1]], pos - start)
+        else:
+            index = self.notebook.FindPageIndex(pageId)
+            if index != -1:
+                self.notebook.SetSelection(index)
+        if self._mruCall is None:
+            self._mruCall = wx.CallLater(MRU_COMMIT_DELAY, self.OnMruCommit)
+        else:
+            self._mruCall.Start(MRU_COMMIT_DELAY)
+
+    def OnHotKeyRelease(self):
+        '''修饰键全部松开: 结束按最近使用顺序的切换'''
+        if self.mru.IsCycling():
+            self.OnMruCommit()
+
+    def OnMruCommit(self):
+        '''结束切换, 最终选中的Page成为最近使用的'''
+        if self._mruCall is not None:
+            self._mruCall.Stop()
+        overlay = self.mruOverlay is not None and self.mruOverlay.IsShown()
+        if overlay:
+            self.mruOverlay.Hide()
+        if not self.mru.IsCycling():  # 切换中的Page被关闭到只剩一个
+            if not overlay:     # 切换中显示过的Page仍需处理
+                self.PageSelected(self.notebook.GetSelection())
+            return
+        if overlay:
+            pageId = self.mru.EndCycle()
+            index = self.notebook.FindPageIndex(pageId)
+            if index != -1:
+                self.SelectPage(index)
+        else:
+            index = self.notebook.GetSelection()
+            self.mru.EndCycle(self.notebook.GetPage(index).GetId() if index != -1 else None)
+            self.PageSelected(index)
+
+    def OnTabSwitcher(self):
+        '''标签页切换器: 按标题/工具项名称/主机搜索已打开的标签页'''
+        dlg = TabSwitcher(self, self.SearchTabs, self.GetTabLabel)
+        if dlg.ShowModal() == wx.ID_OK:
+            index = self.notebook.FindPageIndex(dlg.GetSelectedKey())
+            if index != -1:
+                self.SelectPage(index)
+        dlg.Destroy()
+
+    def SearchTabs(self, query):
+        '''切换器中显示的Page ID, 空查询时按标签顺序'''
+        if not query:
+            return [self.notebook.GetPage(index).GetId() for index in range(self.notebook.GetPageCount())]
+        return self.tabIndex.Search(query)
+
+    def GetTabLabel(self, pageId):
+        index = self.notebook.FindPageIndex(pageId)
+        title = self.notebook.GetPageText(index) if index != -1 else ''
+        exeInfo = self.pidExe.get(pageId)
+        name = exeInfo['toolData']['name'] if exeInfo is not None else ''
+        return f'{index + 1:>4}  {title}' if title == name else f'{index + 1:>4}  {title}  ({name})'
+
+    def UpdateTabIndex(self, pageId, title, toolData):
+        self.tabIndex.Update(pageId, (title, toolData['name'], ExtractHost(toolData.get('cmd'))))
+
+    def OnJumpPage(self, index):
+        '''切换到第index个Page'''
+        if index < self.notebook.GetPageCount():
+            self.SelectPage(index)
+
+    def OnLaunchHotKey(self, name):
+        '''启动工具项/工作区'''
+        for key, data in self.GetTools():
+            if key[1] == name:
+                self.LaunchTool(data)
+                return
+        logger.warning(f'热键启动的 {name} 不存在')
+
+    ############################ 窗口附着/焦点 ###################################
     def _ExeAttachedToPage(self, hwnd, page, borders):
         '''exe窗口附着到Page'''
-        pos, size = self._CalcPageRect(page, borders)
-        win32gui.SetParent(hwnd, page.GetHandle())
-        flags = win32con.SWP_SHOWWINDOW | win32con.SWP_FRAMECHANGED
-        win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, *pos, *size, flags)
-        win32gui.BringWindowToTop(hwnd)
-
-    def _ReSizeExeWindow(self, hwnd, parent, borders):
-        '''exe窗口调整位置和大小'''
-        pos, size = self._CalcPageRect(parent, borders)
-        win32gui.MoveWindow(hwnd, *pos, *size, True)
+        pos, size = CalcPageRect(page, borders)
+        backend = GetBackend()
+        backend.SetParent(hwnd, page.GetHandle())
+        backend.PlaceWindow(hwnd, pos, size)
 
     def _SetFocus(self, hwnd):
         '''设置焦点'''
         # 必须的。确保切换窗口时，该窗口能够显示
         self.SetWindowStyle(self.GetWindowStyle() | wx.STAY_ON_TOP)
-        # 调用SetForegroundWindow()会有很多限制
-        # 此处在调用SetForegroundWindow()前事先发送一个键盘event来解决该问题
-        # import win32com.client
-        # shell = win32com.client.Dispatch('WScript.Shell')
-        # shell.SendKeys('%')
-        win32api.keybd_event(0x20, 0, 0, 0)
-        win32gui.SetForegroundWindow(hwnd)
+        backend = GetBackend()
+        backend.AllowSetForeground()    # SetForegroundWindow有前台锁限制
+        backend.SetForegroundWindow(hwnd)
         self.SetWindowStyle(self.GetWindowStyle() & (~wx.STAY_ON_TOP))
 
-    def _CalcPageRect(self, page, borders):
-        '''计算子exe窗口位置和大小'''
-        w, h = page.GetClientSize()
-        w += borders['left'] + borders['right']  # exe 左/右边框
-        h += borders['top'] + borders['bottom']  # exe 上/下边框
-        return (-1 * borders['left'], -1 * borders['top']), (w, h)
-
 
 class App(wx.App):
     def OnInit(self):
         self.InitSettings()
+        TRACE.Mark('theme')
         frame = Frame(None)
         frame.Center()
         frame.Show()
+        frame.Update()  # 立即绘制首帧
+        TRACE.Mark('first paint')
+        wx.CallAfter(frame.StartDeferred)
         return super().OnInit()
 
     def InitSettings(self):
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    test_foreground.py
+@Time  :    2026/10/21 14:26:08
+@Author:    daidai_up
+@Desc  :    ForegroundSubscription: 订阅可用时由回调驱动, 不可用时退化为轮询(退避)
+'''
+from utils.Foreground import FakeForegroundWatcher, ForegroundSubscription
+
+
+def Subscribe(available):
+    hwnds = []
+    watcher = FakeForegroundWatcher(available)
+    return watcher, ForegroundSubscription(watcher, hwnds.append, 200, 3200), hwnds
+
+
+def test_callback_without_polling():
+    watcher, subscription, hwnds = Subscribe(True)
+    assert not subscription.polling
+    assert subscription.Restart() is None
+    watcher.Emit(1)
+    watcher.Emit(2)
+    assert hwnds == [1, 2]
+    subscription.Stop()
+    watcher.Emit(3)
+    assert hwnds == [1, 2]
+
+
+def test_polling_backoff():
+    watcher, subscription, hwnds = Subscribe(False)
+    assert subscription.polling
+    watcher.Emit(1)
+    assert hwnds == []
+    assert subscription.Restart() == 200
+    assert [subscription.Next(True) for _ in range(6)] == [400, 800, 1600, 3200, 3200, 3200]
+    assert subscription.Next(False) == 200     # 需要重试(如鼠标按下)时恢复最小间隔
+    assert subscription.Next(True) == 400
+    assert subscription.Restart() == 200       # 重新激活时从最小间隔开始
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    test_hibernation.py
+@Time  :    2026/10/21 11:02:37
+@Author:    daidai_up
+@Desc  :    HibernationManager.Check: 只挂起超时未选中的会话, 选中的会话不挂起
+'''
+from utils.Hibernation import HibernationManager
+
+
+def NewManager():
+    return HibernationManager(lambda key: set())   # 没有进程, 不实际挂起
+
+
+def test_selected_never_suspended():
+    manager = NewManager()
+    manager.Select('a', now=0)
+    candidates = {'a': 10, 'b': 10}
+    assert manager.Check(candidates, now=0) == []
+    assert manager.Check(candidates, now=100) == ['b']
+    assert manager.Check(candidates, now=1000) == []
+    assert not manager.IsSuspended('a')
+    assert manager.IsSuspended('b')
+
+
+def test_switch_resumes_and_starts_timer():
+    manager = NewManager()
+    manager.Select('a', now=0)
+    manager.Check({'a': 10, 'b': 10}, now=0)    # 从未选中过的从第一次检查开始计时
+    assert manager.Check({'a': 10, 'b': 10}, now=100) == ['b']
+    assert manager.Select('b', now=100)     # 从休眠中恢复
+    assert manager.Check({'a': 10, 'b': 10}, now=105) == []
+    assert manager.Check({'a': 10, 'b': 10}, now=110) == ['a']
+    assert not manager.IsSuspended('b')
+
+
+def test_excluded_and_disabled():
+    manager = NewManager()
+    manager.Select('a', now=0)
+    manager.SetExcluded('b', True)
+    assert manager.Check({'b': 10, 'c': 0, 'd': None}, now=100) == []
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    test_mru_cycle.py
+@Time  :    2026/10/21 16:52:34
+@Author:    daidai_up
+@Desc  :    连续切换经过休眠的Page: 不移动其exe窗口(挂起的exe不处理消息), 结束切换恢复后再调整
+'''
+import pytest
+from utils.Geometry import GeometryManager
+from utils.Hibernation import HibernationManager
+from utils.Mru import MruStack
+from utils.Platform import FakeBackend, SetBackend
+
+BORDERS = {'left': 0, 'right': 0, 'top': 0, 'bottom': 0}
+
+
+class Page:
+    '''Page(wx.Window)的显示状态及大小'''
+    def __init__(self):
+        self.shown = False
+        self.size = (800, 600)
+
+    def IsShownOnScreen(self):
+        return self.shown
+
+    def GetClientSize(self):
+        return self.size
+
+
+@pytest.fixture
+def backend():
+    backend = FakeBackend()
+    old = SetBackend(backend)
+    yield backend
+    SetBackend(old)
+
+
+def test_cycle_over_hibernated_page(backend):
+    pending = []
+    hibernation = HibernationManager(lambda key: set())     # 没有进程, 不实际挂起
+    geometry = GeometryManager(pending.append, hibernation.IsSuspended)
+    pages = {key: Page() for key in 'abc'}
+    hwnds = {key: 0x100 + n for n, key in enumerate('abc')}
+    mru = MruStack()
+    for key in 'cba':
+        geometry.Add(key, hwnds[key], pages[key], BORDERS)
+        mru.Touch(key)
+    pages['a'].shown = True
+    hibernation.Select('a', now=0)
+    hibernation.Check({'b': 10}, now=0)     # 从未选中过的从第一次检查开始计时
+    assert hibernation.Check({'b': 10}, now=100) == ['b']
+
+    def Show(key):
+        '''SetSelection: 只切换显示的Page, 大小变化(EVT_SIZE)后调整'''
+        for _key, page in pages.items():
+            page.shown = _key == key
+            page.size = (1024, 768)
+            geometry.Invalidate(_key)
+        while pending:
+            pending.pop(0)()
+
+    Show(mru.Cycle(1))
+    assert pages['b'].shown and hwnds['b'] not in backend.rects     # 休眠的b不移动
+    Show(mru.Cycle(1))
+    assert backend.rects[hwnds['c']] == ((0, 0), (1024, 768))
+    Show(mru.Cycle(-1))
+    assert hwnds['b'] not in backend.rects
+    # 结束切换: 恢复最终选中的b后再调整
+    assert mru.EndCycle() == 'b'
+    assert hibernation.Select('b', now=101)
+    geometry.Schedule()
+    while pending:
+        pending.pop(0)()
+    assert backend.rects[hwnds['b']] == ((0, 0), (1024, 768))
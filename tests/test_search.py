@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    test_search.py
+@Time  :    2026/10/21 10:12:05
+@Author:    daidai_up
+@Desc  :    SearchIndex: 逐字输入(在上次结果中过滤)与新建索引直接查询的结果一致
+'''
+from utils.Search import SearchIndex
+
+DOCS = {
+    1: ('webserver', 'ssh'),
+    2: ('server-01', 'putty'),
+    3: ('home', 'cygwin'),
+    4: ('photo host', 'sftp'),
+    5: ('db server', 'plink'),
+}
+QUERIES = ('server', 'host', 'ho', 'db ser', 'photo', 'se rv', 'cyg win', 'ssh serv')
+
+
+def BuildIndex():
+    index = SearchIndex()
+    for key, texts in DOCS.items():
+        index.Update(key, texts)
+    return index
+
+
+def test_typing_matches_fresh_search():
+    for query in QUERIES:
+        index = BuildIndex()
+        for n in range(1, len(query) + 1):
+            typed = index.Search(query[:n])
+            assert typed == BuildIndex().Search(query[:n]), query[:n]
+
+
+def test_narrowing_keeps_substring_matches():
+    '''短词只匹配单词前缀, 长词匹配子串: "ser"的结果不是"se"结果的子集'''
+    index = BuildIndex()
+    for n in range(1, len('server')):
+        index.Search('server'[:n])
+    assert set(index.Search('server')) == {1, 2, 5}
+
+
+def test_tab_titles_typed_in_switcher():
+    '''标签页切换器逐字输入标题: 标题中间包含查询的标签页不丢失'''
+    tabs = SearchIndex()
+    for pageId, texts in enumerate((
+        ('prod-webserver', 'Putty', '10.0.0.1'), ('server', 'Putty', '10.0.0.2'), ('Cygwin', 'Cygwin', ''),
+    )):
+        tabs.Update(pageId, texts)
+    for n in range(1, len('server') + 1):
+        tabs.Search('server'[:n])
+    assert set(tabs.Search('server')) == {0, 1}
+
+
+def test_limit_matches_full_ranking():
+    '''limit只取每层前limit个, 结果与全部排序后取前limit个一致(含boost越层)'''
+    index = SearchIndex()
+    for n in range(300):
+        index.Update(n, (f'host-{n:03}', f'10.0.{n % 7}.{n}', 'putty' if n % 3 else 'cygwin'))
+    boost = {n: (n % 11) * 7 for n in range(0, 300, 13)}
+    for query in ('h', 'host', 'host-1', '10.0', 'put', 'ty 10', 'cyg'):
+        for limit in (1, 5, 40):
+            assert index.Search(query, boost, limit) == index.Search(query, boost)[:limit], (query, limit)
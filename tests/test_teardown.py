@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    test_teardown.py
+@Time  :    2026/10/21 15:40:12
+@Author:    daidai_up
+@Desc  :    TeardownService在FakeBackend上: WM_CLOSE后自己退出的不强制结束, 弹出确认框的隐藏并在宽限期后结束
+'''
+import pytest
+from utils.Platform import FakeBackend, FakeProfile, SetBackend
+from utils.Teardown import TeardownService
+
+
+@pytest.fixture
+def backend():
+    backend = FakeBackend({'mintty.exe': FakeProfile(closeDelay=None)})
+    old = SetBackend(backend)
+    yield backend
+    SetBackend(old)
+
+
+def Launch(backend, cmd):
+    '''启动并等待窗口出现, 返回 (hwnd, {pid: 创建时间})'''
+    pid, _, _ = backend.CreateProcess(cmd, None, None)
+    backend.Sleep(1)
+    hwnd = next(hwnd for hwnd, (_pid, _, _) in backend.windows.items() if _pid == pid)
+    return hwnd, {pid: backend.processes[pid]['create_time']}
+
+
+def test_exits_on_close_message(backend):
+    hwnd, pids = Launch(backend, 'putty.exe host')
+    TeardownService(grace=3).Close([(hwnd, pids, True)]).join()
+    assert not set(pids) & set(backend.processes)
+    assert backend.parents[hwnd] == 0 and hwnd in backend.hidden
+    assert backend.calls['PostClose'] == 1 and backend.calls['Kill'] == 0
+    assert backend.now < 2
+
+
+def test_popup_hidden_then_killed(backend):
+    hwnd, pids = Launch(backend, 'mintty.exe')
+    start = backend.now
+    TeardownService(grace=3).Close([(hwnd, pids, True)]).join()
+    assert not set(pids) & set(backend.processes)
+    assert len(backend.hidden) == 2     # 会话窗口及关闭确认框
+    assert backend.calls['Kill'] == 1
+    assert backend.now - start >= 3
+
+
+def test_kill_without_close_message(backend):
+    hwnd, pids = Launch(backend, 'putty.exe host')
+    TeardownService(grace=3).Close([(hwnd, pids, False)]).join()
+    assert not set(pids) & set(backend.processes)
+    assert backend.calls['PostClose'] == 0 and backend.calls['Kill'] == 1
+
+
+def test_reused_pid_not_killed(backend):
+    _, pids = Launch(backend, 'putty.exe host')
+    pids = {pid: createTime + 1 for pid, createTime in pids.items()}
+    TeardownService(grace=3).Close([(None, pids, False)]).join()
+    assert set(pids) <= set(backend.processes)
+    assert backend.calls['Kill'] == 0
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Benchmark.py
+@Time  :    2026/10/19 15:48:52
+@Author:    daidai_up
+@Desc  :    benchmark: 使用FakeBackend, 可在非Windows平台运行
+
+python -m utils.Benchmark [数量 ...]     默认 10 100 1000 10000
+
+* launch: 桌面上有N个进程/窗口时启动exe, 虚拟时钟下的启动延迟(找到窗口的时间 - exe实际创建窗口的时间)及轮询次数
+* discovery: 同上, 每次启动查找进程/窗口的实际CPU耗时
+* config: N个工具项的配置解析 + 增量比对 + 搜索索引更新(修改一项)
+* spec: N个工具项编译LaunchSpec的耗时(加载配置时一次), 及每次点击创建启动任务的耗时
+* tabs: N个标签页时标签页切换器的一次搜索(每次输入一个字符)
+* toolbar: N个工具项的VScrolledToolBar.Realize(需要wxPython及图形界面, 否则跳过)
+'''
+import os
+import sys
+import time
+import timeit
+from utils.Platform import FakeBackend, FakeProfile, SetBackend
+from utils.StartExe import StartExe
+from utils.LaunchMetrics import LaunchRecord, Percentile
+from utils.Config import ParseConfigurations, DiffItems
+from utils.LaunchSpec import CompileSpecs
+from utils.Launcher import LaunchTask
+from utils.ProcessRules import ProcessMatcher
+from utils.Search import SearchIndex, ExtractHost
+
+SIZES = (10, 100, 1000, 10000)
+PROFILES = {     # 慢启动的exe
+    'putty.exe': FakeProfile(0.3, 'PuTTY'),
+    'mintty.exe': FakeProfile(0.8, 'mintty', child=True),
+    'notepad.exe': FakeProfile(1.5, 'Notepad', handoff=True),
+}
+LAUNCHES = (
+    ('putty.exe -ssh host', 'PuTTY', ProcessMatcher.FromType({'process_keys': ['putty']})),
+    ('mintty.exe -', 'mintty', ProcessMatcher.FromType({'process_rules': [
+        {'key': 'mintty', 'exe': 'mintty.exe', 'min': 1, 'max': 2},
+        {'key': 'child', 'exe': 'mintty.exe', 'parent': 'mintty', 'min': 0},
+    ]})),
+    ('notepad.exe config.yaml', 'Notepad', ProcessMatcher.FromType({'process_keys': ['notepad']})),
+)
+CONFIG_ITEM = '''
+- name: SSH-{n:05}
+  image: assets/images/putty.png
+  cmd: putty.exe -ssh -l user -P 22 10.0.{a}.{b}
+  type: PuTTY
+  env:
+    TERM: xterm
+'''
+CORE_MAPPINGS = {'PuTTY': {'class_name': 'PuTTY', 'process_keys': ['putty.exe'], 'timeout': 10}}
+CONFIG_HEAD = '''
+settings:
+  launch_workers: 4
+items:
+- name: default
+  image: null
+  cmd: null
+  type: null
+  borders:
+    left: 0
+    right: 0
+    top: 0
+    bottom: 0
+'''
+
+
+def ConfigText(count, modified=None):
+    items = [
+        CONFIG_ITEM.format(n=n, a=n // 256 % 256, b=n % 256 if n != modified else 255)
+        for n in range(count)
+    ]
+    return CONFIG_HEAD + ''.join(items)
+
+
+################################################################################
+def BenchLaunch(count, repeat=3):
+    '''桌面上有count个进程及窗口时依次启动LAUNCHES'''
+    backend = FakeBackend(PROFILES)
+    backend.Populate(processes=count, windows=count)
+    old = SetBackend(backend)
+    latencies, iterations, costs = [], [], []
+    try:
+        for _ in range(repeat):
+            for cmd, className, matcher in LAUNCHES:
+                record = LaunchRecord(cmd, className)
+                delay = PROFILES[cmd.split()[0]].delay
+                start, startCpu = backend.Monotonic(), time.thread_time()
+                hwnd, _ = StartExe(cmd, '.', None, className, matcher, 10, record=record)
+                costs.append(time.thread_time() - startCpu)
+                if hwnd is None:
+                    raise RuntimeError(f'{cmd}: 未找到窗口')
+                latencies.append(backend.Monotonic() - start - delay)
+                iterations.append(record['iterations'])
+    finally:
+        SetBackend(old)
+    return latencies, iterations, costs
+
+
+def BenchConfig(count):
+    '''解析count个工具项 + 比对 + 搜索索引增量更新, 返回各阶段耗时(秒)'''
+    text, newText = ConfigText(count), ConfigText(count, modified=count // 2)
+    old = ParseConfigurations(text)
+    index = SearchIndex()
+    build = timeit.timeit(lambda: [
+        index.Update(('item', item['name']), (item['name'], ExtractHost(item['cmd']), item['type']), n)
+        for n, item in enumerate(old['items'])
+    ], number=1)
+    number = max(1, 1000 // count)
+    parse = timeit.timeit(lambda: ParseConfigurations(newText), number=number) / number
+    new = ParseConfigurations(newText)
+    diff = timeit.timeit(lambda: DiffItems(old['items'], new['items']), number=number) / number
+    items = {item['name']: item for item in new['items']}
+    modified = DiffItems(old['items'], new['items']).modified
+    update = timeit.timeit(lambda: [
+        index.Update(('item', name), (name, ExtractHost(items[name]['cmd']), items[name]['type']))
+        for name in modified
+    ], number=number) / number
+    return parse, diff, build, update
+
+
+def BenchSpec(count):
+    '''编译count个工具项的LaunchSpec(秒), 及每次点击创建启动任务的耗时(秒)'''
+    items = ParseConfigurations(ConfigText(count))['items']
+    number = max(1, 1000 // count)
+    compile_ = timeit.timeit(lambda: CompileSpecs(items, CORE_MAPPINGS), number=number) / number
+    spec = items[-1]['spec']
+    number = 100000
+    click = timeit.timeit(lambda: LaunchTask(1, spec, None, None), number=number) / number
+    return compile_, click
+
+
+def BenchTabs(count):
+    '''count个标签页, 逐字输入查询时每次搜索的平均耗时(秒)'''
+    index = SearchIndex()
+    for n in range(count):
+        index.Update(n, (f'SSH-{n:05}', 'SSH', f'10.0.{n // 256 % 256}.{n % 256}'))
+    query = f'ssh-{count // 2:05}'
+    prefixes = [query[:end] for end in range(1, len(query) + 1)]
+    number = max(1, 10000 // count)
+    cost = timeit.timeit(lambda: [index.Search(prefix) for prefix in prefixes], number=number)
+    return cost / number / len(prefixes)
+
+
+def BenchToolBar(sizes):
+    '''VScrolledToolBar.Realize耗时, 不可用时返回原因'''
+    if sys.platform != 'win32' and not os.environ.get('DISPLAY'):
+        return '没有图形界面(DISPLAY)'
+    try:
+        import wx
+        from widgets.VScrolledToolBar import CustomVScrolledToolBar
+    except ImportError as e:
+        return f'wxPython不可用: {e}'
+    app = wx.App(False)
+    frame = wx.Frame(None)
+    bitmap = wx.Bitmap('assets/images/putty.png')
+    results = {}
+    for count in sizes:
+        toolBar = CustomVScrolledToolBar(frame)
+        for idx in range(count):
+            toolBar.AddTool(f'SSH-{idx:05}', bitmap, clientData={'index': idx})
+        start = time.perf_counter()
+        toolBar.Realize()
+        results[count] = (time.perf_counter() - start, toolBar.virtual)
+        toolBar.Destroy()
+    frame.Destroy()
+    app.Destroy()
+    return results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print('launch / discovery (FakeBackend, 虚拟时钟)')
+    for count in sizes:
+        latencies, iterations, costs = BenchLaunch(count)
+        print(
+            f'{count:>6} windows  '
+            f'latency p50: {Percentile(latencies, 50) * 1e3:>6.0f}ms  max: {max(latencies) * 1e3:>6.0f}ms  '
+            f'iterations p50: {Percentile(iterations, 50):>3}  '
+            f'discovery cpu p50: {Percentile(costs, 50) * 1e3:>8.2f}ms  max: {max(costs) * 1e3:>8.2f}ms'
+        )
+    print('config reload')
+    for count in sizes:
+        parse, diff, build, update = BenchConfig(count)
+        print(
+            f'{count:>6} items    parse: {parse * 1e3:>9.2f}ms  diff: {diff * 1e3:>7.2f}ms  '
+            f'index build: {build * 1e3:>8.2f}ms  index update: {update * 1e3:>6.3f}ms'
+        )
+    print('launch spec')
+    for count in sizes:
+        compile_, click = BenchSpec(count)
+        print(
+            f'{count:>6} items    compile: {compile_ * 1e3:>9.2f}ms ({compile_ / count * 1e6:.1f}us/item)  '
+            f'per click: {click * 1e6:.2f}us'
+        )
+    print('tab switcher')
+    for count in sizes:
+        print(f'{count:>6} tabs     search per keystroke: {BenchTabs(count) * 1e3:>8.3f}ms')
+    print('toolbar realize')
+    results = BenchToolBar(sizes)
+    if isinstance(results, str):
+        print(f'  跳过: {results}')
+        return
+    for count, (cost, virtual) in results.items():
+        print(f'{count:>6} items    realize: {cost * 1e3:>9.2f}ms  {"virtual" if virtual else "controls"}')
+
+
+if __name__ == '__main__':
+    main()
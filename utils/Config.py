@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Config.py
+@Time  :    2026/10/17 15:02:18
+@Author:    daidai_up
+@Desc  :    配置文件(config.yaml)解析、默认值填充及增量比对
+'''
+import yaml
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+# 全局设置默认值(config.yaml的settings部分)
+DEFAULT_SETTINGS = {
+    'launch_workers': 4,    # 同时启动exe的最大数量
+    'prewarm_limit': 4,     # 所有工具项预热会话(prewarm)的总数上限
+    'restore': 'lazy',      # 恢复上次的标签页: lazy(选中时启动) / progressive(后台依次启动) / none
+    'close_grace': 3,       # 关闭标签页时等待exe自己退出的时间(秒), 超时后强制结束
+    'track_interval': 5,    # 扫描会话进程树的间隔(秒), 关闭时清理会话运行中启动的进程. 0: 不扫描
+    'monitor_interval': 2,  # 会话CPU/内存采样间隔(秒). 0: 不采样
+    'status_bar': False,    # 是否显示状态栏(当前会话及全部会话的CPU/内存)
+    'mru_overlay': False,   # 按最近使用顺序切换(mru_next/mru_prev)时是否显示切换预览
+}
+# 热键默认值(config.yaml的hotkeys部分): 热键 => 动作
+DEFAULT_HOTKEYS = {
+    '<ctrl>+<9>': 'next_page',  # Ctrl + Tab
+    '<alt>+`': 'toggle_page',
+}
+
+
+################################################################################
+# 解析
+################################################################################
+def GetDigest(data):
+    '''配置内容摘要, 内容未变化时跳过解析'''
+    return hashlib.sha1(data).hexdigest()
+
+
+def ReadConfigurations(path):
+    '''读取配置文件, 返回(摘要, 配置). 解析失败时配置为None'''
+    with open(path, mode='rb') as fh:
+        data = fh.read()
+    return GetDigest(data), ParseConfigurations(data.decode('UTF-8'))
+
+
+def ParseConfigurations(text):
+    '''解析配置并填充默认值'''
+    try:
+        configurations = yaml.safe_load(text)
+    except Exception:
+        logger.error('配置异常', exc_info=True)
+        return None
+    if not configurations:
+        configurations = {'items': []}
+    FillConfigurationDefaults(configurations)
+    return configurations
+
+
+def FillConfigurationDefaults(configurations):
+    '''填充默认值'''
+    # 全局设置
+    settings = configurations.get('settings') or {}
+    for key, value in DEFAULT_SETTINGS.items():
+        settings.setdefault(key, value)
+    configurations['settings'] = settings
+    # 默认项
+    configurations['items'] = configurations.get('items') or []
+    defaultItem = {}
+    for item in configurations['items']:
+        if item['name'] == 'default':
+            defaultItem = item
+            break
+    # 删除无效项
+    for item in configurations['items'][::-1]:
+        if not (item['image'] and item['cmd'] and item['type']):
+            configurations['items'].remove(item)
+    # 重名的工具项只保留第一个(增量比对/工作区/恢复会话都按name查找)
+    configurations['items'] = Deduplicate(configurations['items'], '工具项')
+    # 填充默认值
+    for n, item in enumerate(configurations['items']):
+        item['index'] = n
+        item['name'] = str(item['name'])
+        for key, value in defaultItem.items():
+            if key not in item:
+                item[key] = value
+    # 工作区
+    FillWorkspaceDefaults(configurations)
+    # 热键
+    FillHotKeyDefaults(configurations)
+
+
+def Deduplicate(entries, kind):
+    '''按name去重, 保留第一个'''
+    names = set()
+    unique = []
+    for entry in entries:
+        name = str(entry['name'])
+        if name in names:
+            logger.warning(f'{kind} {name} 重名, 只使用第一个')
+            continue
+        names.add(name)
+        unique.append(entry)
+    return unique
+
+
+def FillWorkspaceDefaults(configurations):
+    '''工作区: 按name引用items中的工具项, 解析为按声明顺序排列的会话列表'''
+    items = {}
+    for item in configurations['items']:
+        items.setdefault(item['name'], item)
+    workspaces = Deduplicate(configurations.get('workspaces') or [], '工作区')
+    for workspace in workspaces[::-1]:
+        workspace['name'] = str(workspace['name'])
+        workspace.setdefault('startup', False)
+        sessions = []
+        for entry in workspace.get('items') or []:
+            if not isinstance(entry, dict):     # 只有name
+                entry = {'name': entry}
+            item = items.get(str(entry['name']))
+            if item is None:
+                logger.warning(f'工作区 {workspace["name"]} 中的 {entry["name"]} 不存在')
+                continue
+            sessions.extend([item] * entry.get('count', 1))
+        workspace['sessions'] = sessions
+        if not sessions:    # 删除无效工作区
+            workspaces.remove(workspace)
+            continue
+        if not workspace.get('image'):
+            workspace['image'] = sessions[0]['image']
+    configurations['workspaces'] = workspaces
+
+
+def FillHotKeyDefaults(configurations):
+    '''热键: 省略时使用默认值, 动作格式在注册时检查'''
+    hotkeys = configurations.get('hotkeys')
+    if hotkeys is None:
+        hotkeys = DEFAULT_HOTKEYS
+    elif not isinstance(hotkeys, dict):
+        logger.warning(f'热键配置异常: {hotkeys}')
+        hotkeys = DEFAULT_HOTKEYS
+    configurations['hotkeys'] = {str(combo): str(action) for combo, action in hotkeys.items()}
+
+
+################################################################################
+# 增量比对
+################################################################################
+class ConfigDiff:
+    '''按name比对新旧配置项'''
+    def __init__(self, added, removed, modified, unchanged):
+        self.added = added          # 新增的name
+        self.removed = removed      # 删除的name
+        self.modified = modified    # 修改的name
+        self.unchanged = unchanged  # 未修改的name(可能只是顺序变化)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return f'added: {self.added}  removed: {self.removed}  modified: {self.modified}'
+
+
+def DiffItems(oldItems, newItems, ignore=('index', )):
+    '''按name比对, 忽略ignore中的键(如仅因顺序变化的index)'''
+    def strip(item):
+        return {key: value for key, value in item.items() if key not in ignore}
+
+    old = {item['name']: item for item in oldItems}
+    new = {item['name']: item for item in newItems}
+    added = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+    modified, unchanged = [], []
+    for name in new.keys() & old.keys():
+        if strip(new[name]) == strip(old[name]):
+            unchanged.append(name)
+        else:
+            modified.append(name)
+    return ConfigDiff(added, removed, modified, unchanged)
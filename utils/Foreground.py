@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Foreground.py
+@Time  :    2026/10/18 11:05:47
+@Author:    daidai_up
+@Desc  :    前台窗口变化订阅
+
+* WinEventForegroundWatcher: SetWinEventHook(EVENT_SYSTEM_FOREGROUND), 前台窗口变化时回调,
+  不需要定时轮询. 回调在安装hook的线程(UI线程)的消息循环中执行
+* FakeForegroundWatcher: 测试用, 手动Emit(hwnd)
+* ForegroundSubscription: 订阅不可用时退化为轮询, 无需切换焦点时逐步增大轮询间隔
+'''
+import ctypes
+import logging
+
+logger = logging.getLogger(__name__)
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+try:
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+        wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+    )
+    user32.SetWinEventHook.restype = wintypes.HANDLE
+    user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+    )
+    user32.UnhookWinEvent.argtypes = (wintypes.HANDLE, )
+except (AttributeError, ImportError, ValueError):   # 非Windows平台
+    user32 = None
+
+
+class ForegroundWatcher:
+    '''前台窗口变化订阅接口'''
+    def Start(self, callback):
+        '''开始订阅, callback(hwnd). 返回是否成功'''
+        raise NotImplementedError
+
+    def Stop(self):
+        raise NotImplementedError
+
+
+class WinEventForegroundWatcher(ForegroundWatcher):
+    '''WinEvent hook实现'''
+    def __init__(self):
+        self._hook = None
+        self._proc = None   # 必须保留引用, 否则回调被回收
+
+    def Start(self, callback):
+        if user32 is None:
+            return False
+
+        def proc(hWinEventHook, event, hwnd, idObject, idChild, dwEventThread, dwmsEventTime):
+            try:
+                callback(hwnd)
+            except Exception:
+                logger.error('前台窗口回调异常', exc_info=True)
+
+        self._proc = WinEventProc(proc)
+        self._hook = user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0, self._proc, 0, 0, WINEVENT_OUTOFCONTEXT
+        )
+        if not self._hook:
+            logger.warning('SetWinEventHook失败, 使用轮询')
+            self._proc = None
+            return False
+        return True
+
+    def Stop(self):
+        if self._hook:
+            user32.UnhookWinEvent(self._hook)
+        self._hook = None
+        self._proc = None
+
+
+class FakeForegroundWatcher(ForegroundWatcher):
+    '''测试用'''
+    def __init__(self, available=True):
+        self.available = available
+        self.callback = None
+
+    def Start(self, callback):
+        if self.available:
+            self.callback = callback
+        return self.available
+
+    def Stop(self):
+        self.callback = None
+
+    def Emit(self, hwnd):
+        '''模拟前台窗口变化'''
+        if self.callback is not None:
+            self.callback(hwnd)
+
+
+class ForegroundSubscription:
+    '''订阅前台窗口变化, watcher不可用时退化为轮询
+
+    轮询间隔(ms)由调用方的定时器使用: 无需切换焦点时加倍直到maxInterval, 需要重试时恢复minInterval
+    '''
+    def __init__(self, watcher, callback, minInterval, maxInterval):
+        self.watcher = watcher
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.interval = minInterval
+        self.polling = not watcher.Start(callback)
+
+    def Restart(self):
+        '''重新开始轮询(如窗口激活), 返回第一次的间隔, 不需要轮询时返回None'''
+        if not self.polling:
+            return None
+        self.interval = self.minInterval
+        return self.interval
+
+    def Next(self, done):
+        '''一次轮询后的下一个间隔. done: 本次无需稍后重试'''
+        self.interval = min(self.interval * 2, self.maxInterval) if done else self.minInterval
+        return self.interval
+
+    def Stop(self):
+        self.watcher.Stop()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Geometry.py
+@Time  :    2026/10/18 13:40:26
+@Author:    daidai_up
+@Desc  :    exe窗口位置/大小管理
+
+* Page的size变化只标记为dirty, 同一轮事件中的多次变化合并为一次调整(拖动边框时每帧一次)
+* 只调整可见Page中的exe窗口, 隐藏的Page保持dirty, 选中时再调整
+* 休眠(进程挂起)的exe不处理消息, MoveWindow会阻塞UI线程: 保持dirty, 恢复后再调整(如连续切换经过的Page)
+* 不依赖wx: 延迟调用由callAfter(wx.CallAfter)完成, 可在FakeBackend上测试
+* 需要调整多个窗口时使用DeferWindowPos批量移动, 只重绘一次
+'''
+import logging
+from utils.Platform import GetBackend
+
+logger = logging.getLogger(__name__)
+
+
+def CalcPageRect(page, borders):
+    '''计算子exe窗口位置和大小'''
+    w, h = page.GetClientSize()
+    w += borders['left'] + borders['right']  # exe 左/右边框
+    h += borders['top'] + borders['bottom']  # exe 上/下边框
+    return (-1 * borders['left'], -1 * borders['top']), (w, h)
+
+
+def MoveWindows(moves):
+    '''moves: [(hwnd, (pos, size))], 多个窗口时批量移动(见Win32Backend.MoveWindows)'''
+    GetBackend().MoveWindows(moves)
+
+
+class GeometryManager:
+    '''Page ID => exe窗口, 延迟合并调整位置和大小
+
+    callAfter(func): 当前事件处理完后调用func; isSuspended(pageId): exe是否已休眠
+    '''
+    def __init__(self, callAfter, isSuspended=None):
+        self.callAfter = callAfter
+        self.isSuspended = isSuspended
+        self._entries = {}      # pageId => {'hwnd', 'page', 'borders', 'rect'}
+        self._dirty = set()
+        self._scheduled = False
+        self.moves = 0          # 实际移动窗口的次数
+
+    def Add(self, pageId, hwnd, page, borders):
+        '''exe窗口已附着到Page(附着时已设置好位置)'''
+        self._entries[pageId] = {
+            'hwnd': hwnd, 'page': page, 'borders': borders, 'rect': CalcPageRect(page, borders),
+        }
+        self._dirty.discard(pageId)
+
+    def Remove(self, pageId):
+        self._entries.pop(pageId, None)
+        self._dirty.discard(pageId)
+
+    def SetBorders(self, pageId, borders):
+        entry = self._entries.get(pageId)
+        if entry is not None and entry['borders'] != borders:
+            entry['borders'] = borders
+            self.Invalidate(pageId)
+
+    def Invalidate(self, pageId):
+        '''Page大小变化, 稍后调整'''
+        if pageId in self._entries:
+            self._dirty.add(pageId)
+            self.Schedule()
+
+    def Schedule(self):
+        '''当前事件处理完后调整一次(如选中Page后)'''
+        if not self._scheduled and self._dirty:
+            self._scheduled = True
+            self.callAfter(self.Flush)
+
+    def Flush(self):
+        '''调整可见且未休眠的dirty Page'''
+        self._scheduled = False
+        moves = []
+        for pageId in list(self._dirty):
+            entry = self._entries[pageId]
+            page = entry['page']
+            if not page or not page.IsShownOnScreen():    # 已销毁 / 隐藏, 选中时再调整
+                continue
+            if self.isSuspended is not None and self.isSuspended(pageId):   # 恢复后再调整
+                continue
+            self._dirty.discard(pageId)
+            rect = CalcPageRect(page, entry['borders'])
+            if rect != entry['rect']:
+                entry['rect'] = rect
+                moves.append((entry['hwnd'], rect))
+        if moves:
+            self.moves += len(moves)
+            MoveWindows(moves)
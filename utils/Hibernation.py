@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Hibernation.py
+@Time  :    2026/10/18 21:30:18
+@Author:    daidai_up
+@Desc  :    空闲会话休眠: 标签页超过hibernate_after秒未被选中时挂起其进程树, 选中时恢复
+
+挂起的exe窗口不再处理消息, 向其发送同步消息(MoveWindow/SetParent/DestroyWindow等)会阻塞UI线程,
+因此只挂起隐藏(未选中)的Page, 且选中/关闭时必须先恢复再操作窗口
+'''
+import time
+import logging
+from utils.ProcessSnapshot import GetProcesses
+from utils.Startup import LazyImport
+
+psutil = LazyImport('psutil')     # 首次使用时才导入
+
+logger = logging.getLogger(__name__)
+CHECK_INTERVAL = 10     # 检查间隔(秒)
+
+
+class HibernationManager:
+    '''key(Page ID) => 休眠状态. getPids(key)返回会话当前的进程ID'''
+    def __init__(self, getPids):
+        self.getPids = getPids
+        self._current = None
+        self._lastActive = {}   # key => 最近一次处于选中状态的时间
+        self._suspended = {}    # key => [psutil.Process]
+        self._excluded = set()  # 不休眠的会话
+
+    def Select(self, key, now=None):
+        '''选中key: 恢复其进程, 之前选中的会话开始计时. 返回是否从休眠中恢复'''
+        now = time.monotonic() if now is None else now
+        if self._current is not None:
+            self._lastActive[self._current] = now
+        self._current = key
+        self._lastActive[key] = now
+        return self.Resume(key)
+
+    def Remove(self, key):
+        '''会话关闭: 先恢复, 之后才能关闭窗口/结束进程'''
+        self.Resume(key)
+        self._lastActive.pop(key, None)
+        self._excluded.discard(key)
+        if self._current == key:
+            self._current = None
+
+    def IsSuspended(self, key):
+        return key in self._suspended
+
+    def IsExcluded(self, key):
+        return key in self._excluded
+
+    def SetExcluded(self, key, excluded):
+        if excluded:
+            self._excluded.add(key)
+            self.Resume(key)
+        else:
+            self._excluded.discard(key)
+
+    ############################################################################
+    def Check(self, candidates, now=None):
+        '''candidates: key => hibernate_after(秒), 返回本次挂起的key'''
+        now = time.monotonic() if now is None else now
+        hibernated = []
+        for key, after in candidates.items():
+            if not after or after <= 0 or key == self._current:
+                continue
+            if key in self._suspended or key in self._excluded:
+                continue
+            lastActive = self._lastActive.setdefault(key, now)  # 从未选中过的从现在开始计时
+            if now - lastActive >= after:
+                self.Suspend(key)
+                hibernated.append(key)
+        return hibernated
+
+    def Suspend(self, key):
+        processes = GetProcesses(self.getPids(key))
+        suspended = []
+        for process in processes:
+            try:
+                process.suspend()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            suspended.append(process)
+        self._suspended[key] = suspended
+        logger.info(f'hibernate: {key}  pids: {[process.pid for process in suspended]}')
+
+    def Resume(self, key):
+        '''恢复挂起的会话, 返回是否处于挂起状态'''
+        suspended = self._suspended.pop(key, None)
+        if suspended is None:
+            return False
+        for process in suspended:
+            try:
+                process.resume()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        logger.info(f'resume: {key}')
+        return True
+
+    def ResumeAll(self):
+        for key in list(self._suspended):
+            self.Resume(key)
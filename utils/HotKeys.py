@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    HotKeys.py
+@Time  :    2026/10/18 15:12:40
+@Author:    daidai_up
+@Desc  :    全局热键匹配
+
+所有程序中的每次按键都会经过键盘钩子回调, 回调中的工作应尽量少:
+* 热键在配置加载时预编译为 (修饰键掩码, 字符/虚拟键码) => 回调 的查找表
+* 回调中只维护当前按下的修饰键掩码; 非修饰键先按掩码快速排除, 再查表, 不构造对象
+* 匹配后只记录时间并交给回调(回调负责转到UI线程), 耗时统计见HotKeyStats
+'''
+import time
+import logging
+from threading import Lock
+from pynput import keyboard
+
+logger = logging.getLogger(__name__)
+Key = keyboard.Key
+
+CTRL, ALT, SHIFT, CMD = 1, 2, 4, 8
+MODIFIERS = {
+    Key.ctrl: CTRL, Key.ctrl_l: CTRL, Key.ctrl_r: CTRL,
+    Key.alt: ALT, Key.alt_l: ALT, Key.alt_r: ALT, Key.alt_gr: ALT,
+    Key.shift: SHIFT, Key.shift_l: SHIFT, Key.shift_r: SHIFT,
+    Key.cmd: CMD, Key.cmd_l: CMD, Key.cmd_r: CMD,
+}
+# 热键动作(config.yaml的hotkeys部分): 动作名 => 是否需要参数
+ACTIONS = {
+    'next_page': False,     # 下一个标签页
+    'prev_page': False,     # 上一个标签页
+    'toggle_page': False,   # 最近两个标签页相互切换
+    'switch_page': False,   # 标签页切换器(按标题/名称搜索)
+    'mru_next': False,      # 按最近使用顺序切换(按住修饰键连续切换, 松开后结束)
+    'mru_prev': False,      # 按最近使用顺序反向切换
+    'page': True,           # page N: 第N个标签页(从1开始)
+    'launch': True,         # launch 名称: 启动工具项/工作区
+}
+
+
+def ParseHotKey(combo):
+    '''pynput格式的热键(如 <ctrl>+<shift>+t) => (修饰键掩码, (('char', 字符) | ('vk', 键码), ...))'''
+    mask = 0
+    triggers = []
+    for key in keyboard.HotKey.parse(combo):    # 格式错误时抛出ValueError
+        if key in MODIFIERS:
+            mask |= MODIFIERS[key]
+        else:
+            triggers.append(key)
+    if len(triggers) != 1:
+        raise ValueError(f'{combo}: 需要一个且只能有一个非修饰键')
+    key = triggers[0]
+    if isinstance(key, Key):
+        key = key.value
+    codes = []
+    if key.char is not None:
+        char = key.char.lower()
+        codes.append(('char', char))
+        if char.isascii() and char.isalnum():  # 按住Ctrl时部分按键没有字符, 同时按虚拟键码匹配
+            codes.append(('vk', ord(char.upper())))
+    if key.vk is not None:
+        codes.append(('vk', key.vk))
+    return mask, tuple(codes)
+
+
+def ParseAction(action):
+    '''热键动作 => (动作名, 参数)'''
+    name, _, arg = str(action).strip().partition(' ')
+    arg = arg.strip()
+    if name not in ACTIONS:
+        raise ValueError(f'未知的热键动作: {action}')
+    if ACTIONS[name] != bool(arg):
+        raise ValueError(f'热键动作参数错误: {action}')
+    if name == 'page' and not (arg.isdigit() and int(arg) > 0):
+        raise ValueError(f'标签页序号错误: {action}')
+    return name, arg
+
+
+class HotKeyStats:
+    '''钩子回调耗时(每次按键) & 热键到动作完成的延迟'''
+    def __init__(self):
+        self._lock = Lock()
+        self.keys = 0           # 按键事件数, 只在钩子线程中更新
+        self.keyCost = 0.0
+        self.keyMax = 0.0
+        self._actions = {}      # 热键 => [次数, 总延迟, 最大延迟]
+
+    def RecordKey(self, cost):
+        self.keys += 1
+        self.keyCost += cost
+        if cost > self.keyMax:
+            self.keyMax = cost
+
+    def RecordAction(self, combo, latency):
+        with self._lock:
+            stats = self._actions.setdefault(combo, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += latency
+            stats[2] = max(stats[2], latency)
+
+    def Report(self):
+        lines = [
+            f'keys: {self.keys}  avg: {self.keyCost / max(self.keys, 1) * 1e6:.1f}us  max: {self.keyMax * 1e6:.1f}us'
+        ]
+        with self._lock:
+            for combo, (count, total, maximum) in self._actions.items():
+                lines.append(f'{combo}: {count}  avg: {total / count * 1e3:.2f}ms  max: {maximum * 1e3:.2f}ms')
+        return '\n'.join(lines)
+
+
+class HotKeyMatcher:
+    '''修饰键状态 + 预编译查找表'''
+    def __init__(self, stats=None):
+        self.stats = HotKeyStats() if stats is None else stats
+        self._pressed = set()   # 按下的修饰键
+        self._mask = 0
+        self._compiled = ({}, frozenset())     # ((掩码, 编码) => (热键, 回调), 使用到的掩码)
+        self.onRelease = None   # 所有修饰键松开时的回调(钩子线程中调用)
+
+    def SetHotKeys(self, hotKeys):
+        '''hotKeys: 热键 => callback(t0), t0为按键时间(perf_counter). 格式错误的热键忽略'''
+        table = {}
+        for combo, callback in hotKeys.items():
+            try:
+                mask, codes = ParseHotKey(combo)
+            except ValueError:
+                logger.warning(f'热键格式错误: {combo}', exc_info=True)
+                continue
+            for code in codes:
+                table[(mask, code)] = (combo, callback)
+        self._compiled = (table, frozenset(mask for mask, _ in table))  # 整体替换, 钩子线程无需加锁
+
+    def Press(self, key):
+        t0 = time.perf_counter()
+        modifier = MODIFIERS.get(key)
+        if modifier is not None:
+            self._pressed.add(key)
+            self._mask |= modifier
+        else:
+            table, masks = self._compiled
+            if self._mask in masks:
+                self._Match(table, key, t0)
+        self.stats.RecordKey(time.perf_counter() - t0)
+
+    def Release(self, key):
+        if key in MODIFIERS:
+            self._pressed.discard(key)
+            mask = 0
+            for pressed in self._pressed:
+                mask |= MODIFIERS[pressed]
+            released = self._mask and not mask
+            self._mask = mask
+            if released and self.onRelease is not None:
+                try:
+                    self.onRelease()
+                except Exception:
+                    logger.error('修饰键松开回调异常', exc_info=True)
+
+    def _Match(self, table, key, t0):
+        if isinstance(key, Key):
+            key = key.value
+        char = key.char
+        matched = None
+        if char is not None:
+            matched = table.get((self._mask, ('char', char.lower())))
+        if matched is None and key.vk is not None:
+            matched = table.get((self._mask, ('vk', key.vk)))
+        if matched is not None:
+            try:
+                matched[1](t0)
+            except Exception:
+                logger.error(f'热键回调异常: {matched[0]}', exc_info=True)
+
+
+def main():
+    '''钩子回调耗时'''
+    import timeit
+    matcher = HotKeyMatcher()
+    matcher.SetHotKeys({
+        '<ctrl>+<9>': lambda t0: None, '<alt>+`': lambda t0: None, '<ctrl>+<alt>+1': lambda t0: None,
+    })
+    text = [keyboard.KeyCode.from_char(char) for char in 'the quick brown fox jumps over the lazy dog']
+    number = 1000
+    cost = timeit.timeit(lambda: [matcher.Press(key) for key in text], number=number) / number / len(text)
+    print(f'plain key: {cost * 1e6:.2f}us')
+    matcher.Press(Key.ctrl_l)
+    cost = timeit.timeit(lambda: [matcher.Press(key) for key in text], number=number) / number / len(text)
+    print(f'ctrl + key: {cost * 1e6:.2f}us')
+    print(matcher.stats.Report())
+
+
+if __name__ == '__main__':
+    main()
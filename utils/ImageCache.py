@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    ImageCache.py
+@Time  :    2026/10/17 16:48:33
+@Author:    daidai_up
+@Desc  :    图片/工具项绘制结果缓存, 工具栏与标签页共用
+
+* 解码后的图片按 (路径, 修改时间, 尺寸) 缓存
+* 绘制好的工具项按 (文本, 图片, 尺寸, 颜色) 缓存
+* 超过容量时淘汰最久未使用的项(LRU)
+'''
+import os
+import wx
+from threading import Lock
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 1024
+
+
+def ColourKey(colour):
+    '''wx.Colour => 可哈希的键'''
+    return tuple(wx.Colour(colour).Get())
+
+
+class ImageCache:
+    '''LRU缓存'''
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._lock = Lock()
+        self._items = OrderedDict()
+        self._extents = {}      # 文本 => (宽, 高), 只与字体有关, 不淘汰
+        self._dc = None         # 测量文本用的MemoryDC, 只创建一次
+        self.hits = 0
+        self.misses = 0
+
+    def _Get(self, key, create):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+        value = create()
+        with self._lock:
+            self.misses += 1
+            self._items[key] = value
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+        return value
+
+    def Clear(self):
+        with self._lock:
+            self._items.clear()
+            self._extents.clear()
+
+    ############################################################################
+    def ImageKey(self, path):
+        '''图片的键: 路径 + 修改时间, 文件修改后自动失效'''
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        return (os.path.abspath(path), mtime)
+
+    def GetBitmap(self, path, size=None):
+        '''解码(并缩放)图片'''
+        def create():
+            if size is None:
+                return wx.Bitmap(path)
+            return wx.Bitmap(wx.Image(path).Scale(*size, wx.IMAGE_QUALITY_HIGH))
+
+        return self._Get(('bitmap', self.ImageKey(path), tuple(size or ())), create)
+
+    def GetTile(self, label, path, size, fgColour, bgColour, draw):
+        '''绘制好的工具项, draw(dc, rect, label, bitmap, fgColour, bgColour)'''
+        def create():
+            tile = wx.Bitmap(*size)
+            dc = wx.MemoryDC(tile)
+            draw(dc, (0, 0, *size), label, self.GetBitmap(path), fgColour, bgColour)
+            dc.SelectObject(wx.NullBitmap)
+            return tile
+
+        key = ('tile', label, self.ImageKey(path), tuple(size), ColourKey(fgColour), ColourKey(bgColour))
+        return self._Get(key, create)
+
+    def GetTextExtent(self, label):
+        '''文本尺寸(默认字体)'''
+        extent = self._extents.get(label)
+        if extent is None:
+            if self._dc is None:
+                self._dc = wx.MemoryDC(wx.Bitmap(1, 1))
+            extent = self._extents[label] = tuple(self._dc.GetTextExtent(label))
+        return extent
+
+
+_imageCache = None
+
+
+def GetImageCache():
+    '''全局共享的缓存'''
+    global _imageCache
+    if _imageCache is None:
+        _imageCache = ImageCache()
+    return _imageCache
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    LaunchMetrics.py
+@Time  :    2026/10/19 11:02:45
+@Author:    daidai_up
+@Desc  :    启动耗时记录: 每次启动各阶段的耗时写入JSON lines文件, 统计p50/p95, 并按历史调整查找窗口的超时
+
+阶段:
+* queue: 在启动队列中等待
+* create_process: CreateProcess
+* wait: 等待exe初始化(WaitForInputIdle / 轮询间隔)
+* pids: 进程快照及子孙进程查找
+* association: 按关键字关联进程
+* window: 查找窗口
+* discovery: 从CreateProcess返回到找到窗口的总耗时(包含wait/pids/association/window)
+* attach: 附着到Page
+* first_paint: 附着后exe窗口处理完消息(重绘)的时间
+'''
+import os
+import json
+import math
+import time
+import logging
+from threading import Lock
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+MAX_RECORDS = 2000      # 文件中保留的记录数, 超过两倍时截断
+HISTORY_SIZE = 50       # 计算超时使用的最近记录数(每个type)
+MIN_SAMPLES = 5         # 少于该数量的成功记录时使用配置的超时
+RECENT_FAILURES = 10    # 最近若干次中有超时, 不缩短超时
+TIMEOUT_FACTOR = 3      # 超时 = p95 * TIMEOUT_FACTOR
+MIN_TIMEOUT = 2         # 自适应超时的范围(秒)
+MAX_TIMEOUT = 60
+
+
+def Percentile(values, percent):
+    '''最近秩法百分位数'''
+    if not values:
+        return None
+    values = sorted(values)
+    rank = math.ceil(percent / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+class LaunchRecord:
+    '''一次启动的记录'''
+    def __init__(self, name, type_):
+        self.data = {
+            'time': round(time.time(), 3), 'name': name, 'type': type_,
+            'result': None, 'timeout': None, 'iterations': 0, 'phases': {},
+        }
+        self.submitted = time.perf_counter()
+
+    def Add(self, phase, seconds):
+        phases = self.data['phases']
+        phases[phase] = phases.get(phase, 0) + seconds
+
+    @contextmanager
+    def Measure(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.Add(phase, time.perf_counter() - start)
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+
+class LaunchHistory:
+    '''启动记录文件(JSON lines)'''
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._records = []
+        self.Load()
+
+    def Load(self):
+        if not os.path.exists(self.path):
+            return
+        records = []
+        try:
+            with open(self.path, encoding='UTF-8') as fh:
+                for line in fh:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:  # 写入中断的行
+                        continue
+        except OSError:
+            logger.error('启动记录读取异常', exc_info=True)
+            return
+        self._records = records[-MAX_RECORDS:]
+        if len(records) > 2 * MAX_RECORDS:
+            self._Rewrite()
+
+    def _Rewrite(self):
+        try:
+            with open(self.path, mode='w', encoding='UTF-8') as fh:
+                fh.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in self._records)
+        except OSError:
+            logger.error('启动记录保存异常', exc_info=True)
+
+    def Append(self, record):
+        '''保存一次启动(可在任意线程调用)'''
+        data = dict(record.data, phases={phase: round(cost, 4) for phase, cost in record['phases'].items()})
+        with self._lock:
+            self._records.append(data)
+            del self._records[:-MAX_RECORDS]
+            try:
+                with open(self.path, mode='a', encoding='UTF-8') as fh:
+                    fh.write(json.dumps(data, ensure_ascii=False) + '\n')
+            except OSError:
+                logger.error('启动记录保存异常', exc_info=True)
+
+    ############################################################################
+    def Timeout(self, type_, default):
+        '''按最近的记录计算查找窗口的超时: p95 * TIMEOUT_FACTOR, 最近有超时的不缩短'''
+        with self._lock:
+            records = [record for record in self._records if record['type'] == type_][-HISTORY_SIZE:]
+        durations = [
+            record['phases'].get('discovery', 0) for record in records if record['result'] == 'ok'
+        ]
+        if len(durations) < MIN_SAMPLES:
+            return default
+        timeout = min(max(Percentile(durations, 95) * TIMEOUT_FACTOR, MIN_TIMEOUT), MAX_TIMEOUT)
+        if any(record['result'] == 'timeout' for record in records[-RECENT_FAILURES:]):
+            timeout = max(timeout, default)
+        return round(timeout, 2)
+
+    def Report(self):
+        '''各工具项的启动次数/失败次数及各阶段p50/p95'''
+        with self._lock:
+            records = list(self._records)
+        byName = {}
+        for record in records:
+            byName.setdefault((record['name'], record['type']), []).append(record)
+        lines = []
+        for (name, type_), _records in byName.items():
+            ok = [record for record in _records if record['result'] == 'ok']
+            lines.append(f'{name} ({type_})  启动: {len(_records)}  失败: {len(_records) - len(ok)}')
+            phases = []
+            for record in ok:
+                for phase in record['phases']:
+                    if phase not in phases:
+                        phases.append(phase)
+            for phase in phases:
+                values = [record['phases'][phase] for record in ok if phase in record['phases']]
+                lines.append(
+                    f'    {phase:<16}p50: {Percentile(values, 50) * 1e3:>8.1f}ms  '
+                    f'p95: {Percentile(values, 95) * 1e3:>8.1f}ms'
+                )
+            iterations = [record['iterations'] for record in ok]
+            if iterations:
+                lines.append(
+                    f'    {"iterations":<16}p50: {Percentile(iterations, 50):>8}    p95: {Percentile(iterations, 95):>8}'
+                )
+        return '\n'.join(lines) or '没有启动记录'
+
+
+def main():
+    '''打印启动记录统计: python -m utils.LaunchMetrics [logs/launch.jsonl]'''
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join('logs', 'launch.jsonl')
+    print(LaunchHistory(path).Report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    LaunchSpec.py
+@Time  :    2026/10/19 17:05:31
+@Author:    daidai_up
+@Desc  :    启动参数: 加载配置时将每个工具项编译为不可变的LaunchSpec, 点击时不再解析
+
+* argv按Windows命令行规则(CommandLineToArgvW)拆分, 再用list2cmdline重新引用, 引号内的参数保持不变
+* 只对exe路径做normpath, 参数(如URL, 引号内的路径)不受影响
+* 环境变量为os.environ与工具项env合并后的副本, 不修改os.environ
+* 工作目录及core.json中的type(窗口类名/进程关联规则/超时/关闭方式)在编译时确定, 同一type共用一个ProcessMatcher
+'''
+import os
+import sys
+from subprocess import list2cmdline
+from utils.ProcessRules import ProcessMatcher
+
+BASE_PATH = os.path.dirname(os.path.abspath(sys.argv[0]))
+
+
+def SplitCmdline(cmd):
+    '''按CommandLineToArgvW的规则拆分命令行: 反斜杠只在引号前转义'''
+    argv = []
+    arg = []
+    quoted = inArg = False
+    backslashes = 0
+    for char in cmd:
+        if char == '\\':
+            backslashes += 1
+            inArg = True
+            continue
+        if char == '"':
+            arg.append('\\' * (backslashes // 2))
+            if backslashes % 2:     # \" => "
+                arg.append('"')
+            else:
+                quoted = not quoted
+            backslashes = 0
+            inArg = True
+            continue
+        arg.append('\\' * backslashes)
+        backslashes = 0
+        if char in ' \t' and not quoted:
+            if inArg:
+                argv.append(''.join(arg))
+                arg, inArg = [], False
+            continue
+        arg.append(char)
+        inArg = True
+    arg.append('\\' * backslashes)
+    if inArg:
+        argv.append(''.join(arg))
+    return argv
+
+
+def FormatArgv(cmd):
+    '''cmd(字符串或列表) => argv, exe路径normpath'''
+    argv = SplitCmdline(cmd) if isinstance(cmd, str) else [str(arg) for arg in cmd]
+    if argv:
+        argv[0] = os.path.normpath(argv[0])
+    return tuple(argv)
+
+
+def FormatPath(path=None):
+    '''工作目录, 默认为程序所在目录'''
+    if path is None:
+        path = BASE_PATH
+    return os.path.abspath(path)
+
+
+def FormatEnv(env=None):
+    '''合并后的环境变量副本, 没有设置env时为None(继承MultiTab的环境变量)'''
+    if not isinstance(env, dict):
+        return None
+    newEnv = dict(os.environ)
+    newEnv.update({str(key): str(value) for key, value in env.items()})
+    return newEnv
+
+
+class LaunchSpec:
+    '''不可变的启动参数'''
+    __slots__ = ('name', 'argv', 'cmdline', 'path', 'env', 'type', 'className', 'matcher', 'timeout', 'closeMessage')
+
+    def __init__(self, name, argv, path, env, type_, className, matcher, timeout, closeMessage=True):
+        for key, value in (
+            ('name', name), ('argv', argv), ('cmdline', list2cmdline(argv)), ('path', path), ('env', env),
+            ('type', type_), ('className', className), ('matcher', matcher), ('timeout', timeout),
+            ('closeMessage', closeMessage),
+        ):
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f'LaunchSpec不可修改: {key}')
+
+    def __delattr__(self, key):
+        raise AttributeError(f'LaunchSpec不可修改: {key}')
+
+    def _Key(self):
+        env = None if self.env is None else tuple(sorted(self.env.items()))
+        return (
+            self.name, self.argv, self.path, env, self.type, self.className, self.matcher, self.timeout,
+            self.closeMessage,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, LaunchSpec):
+            return NotImplemented
+        return self._Key() == other._Key()
+
+    def __hash__(self):
+        return hash(self._Key())
+
+    def __repr__(self):
+        return f'LaunchSpec({self.name!r}, {self.cmdline!r}, type={self.type!r})'
+
+
+def CompileSpec(item, coreMappings, envCache=None, matchers=None):
+    '''工具项 => LaunchSpec, type不在core.json中时返回None
+
+    envCache: env相同的工具项共用一个合并后的环境变量(只读)
+    matchers: type => ProcessMatcher, 同一type只编译一次
+    '''
+    type_ = coreMappings.get(item['type'])
+    if type_ is None:
+        return None
+    matcher = None if matchers is None else matchers.get(item['type'])
+    if matcher is None:
+        matcher = ProcessMatcher.FromType(type_)
+        if matchers is not None:
+            matchers[item['type']] = matcher
+    env = item.get('env')
+    if envCache is not None and isinstance(env, dict):
+        key = repr(sorted((str(key), str(value)) for key, value in env.items()))
+        if key not in envCache:
+            envCache[key] = FormatEnv(env)
+        env = envCache[key]
+    else:
+        env = FormatEnv(env)
+    return LaunchSpec(
+        item['name'], FormatArgv(item['cmd']), FormatPath(item.get('path')), env,
+        item['type'], type_['class_name'], matcher, type_.get('timeout'), bool(type_.get('close_message', True)),
+    )
+
+
+def CompileSpecs(items, coreMappings):
+    '''编译所有工具项, 结果保存在item['spec']中'''
+    envCache, matchers = {}, {}
+    for item in items:
+        item['spec'] = CompileSpec(item, coreMappings, envCache, matchers)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Launcher.py
+@Time  :    2026/10/17 11:20:05
+@Author:    daidai_up
+@Desc  :    启动调度: 有界线程池 + 等待队列, 多个exe可同时启动
+
+并发启动时, 每次启动都从自己的根进程出发查找子孙进程, 进程归属天然隔离。
+只有根进程已退出、需要比对新进程时才可能"抢"到其他启动的进程, 因此由PidRegistry登记
+每个启动(及启动完成的会话)拥有的进程, 比对时排除其他启动已登记的进程。
+'''
+import time
+import queue
+import logging
+import itertools
+from threading import Thread, Lock, Condition, current_thread
+from utils.StartExe import StartExe, DEFAULT_TIMEOUT
+from utils.Platform import GetBackend
+
+logger = logging.getLogger(__name__)
+DEFAULT_WORKERS = 4
+SHUTDOWN_WAIT = 2       # 退出时等待启动中的任务完成(并清理其进程)的时间(秒)
+
+
+class PidRegistry:
+    '''launchId => pids 登记'''
+    def __init__(self):
+        self._lock = Lock()
+        self._claims = {}
+
+    def Claim(self, launchId, pids):
+        with self._lock:
+            self._claims[launchId] = set(pids)
+
+    def Others(self, launchId):
+        '''其他启动登记的所有进程'''
+        with self._lock:
+            return set().union(*(pids for _id, pids in self._claims.items() if _id != launchId))
+
+    def Release(self, launchId):
+        with self._lock:
+            self._claims.pop(launchId, None)
+
+
+class PidClaim:
+    '''某次启动在PidRegistry中的登记'''
+    def __init__(self, registry, launchId):
+        self.registry = registry
+        self.launchId = launchId
+
+    def Claim(self, pids):
+        self.registry.Claim(self.launchId, pids)
+
+    def Others(self):
+        return self.registry.Others(self.launchId)
+
+
+class LaunchTask:
+    '''一次启动, spec为加载配置时编译好的LaunchSpec, 这里不再解析'''
+    def __init__(self, launchId, spec, timeout, callback, record=None):
+        self.launchId = launchId
+        self.spec = spec
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT if spec.timeout is None else spec.timeout
+        self.timeout = timeout
+        self.callback = callback
+        self.record = record
+        self.cancelled = False
+
+
+class LaunchScheduler:
+    '''启动调度'''
+    def __init__(self, maxWorkers=DEFAULT_WORKERS):
+        self.maxWorkers = max(1, maxWorkers)
+        self.registry = PidRegistry()
+        self._queue = queue.Queue()
+        self._workers = []
+        self._lock = Lock()
+        self._idle = Condition(self._lock)  # _pending为空时通知
+        self._pending = {}      # launchId => LaunchTask, 等待中及启动中
+        self._ids = itertools.count(1)
+
+    def Submit(self, spec, callback, timeout=None, record=None):
+        '''加入启动队列, 返回launchId
+
+        callback(hwnd, pids)在工作线程中调用. timeout为None时使用spec中的超时, record记录各阶段耗时
+        '''
+        launchId = next(self._ids)
+        task = LaunchTask(launchId, spec, timeout, callback, record)
+        with self._lock:
+            self._pending[launchId] = task
+            if len(self._workers) < min(self.maxWorkers, len(self._pending)):
+                worker = Thread(target=self._Work, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+        self._queue.put(task)
+        return launchId
+
+    def Cancel(self, launchId):
+        '''取消启动: 等待中的不再启动, 启动中的完成后清理进程'''
+        with self._lock:
+            task = self._pending.get(launchId)
+            if task is not None:
+                task.cancelled = True
+        self.registry.Release(launchId)
+
+    def Release(self, launchId):
+        '''会话结束, 释放其进程登记'''
+        self.registry.Release(launchId)
+
+    def SetMaxWorkers(self, maxWorkers):
+        '''修改同时启动的数量: 增加时下次提交时创建线程, 减少时多出的线程取到下一个任务后退出'''
+        with self._lock:
+            self.maxWorkers = max(1, maxWorkers)
+
+    def PendingCount(self):
+        with self._lock:
+            return len(self._pending)
+
+    def Shutdown(self, timeout=SHUTDOWN_WAIT):
+        '''取消所有启动, 最多等待timeout秒让启动中的任务完成并结束其进程(工作线程是daemon线程)'''
+        with self._lock:
+            for task in self._pending.values():
+                task.cancelled = True
+            if not self._idle.wait_for(lambda: not self._pending, timeout):
+                logger.warning(f'launch shutdown: {len(self._pending)} tasks still running')
+
+    ############################################################################
+    def _Work(self):
+        while True:
+            task = self._queue.get()
+            with self._lock:
+                retire = len(self._workers) > self.maxWorkers
+                if retire:
+                    self._workers.remove(current_thread())
+            if retire:  # 上限已降低, 任务交给其他线程
+                self._queue.put(task)
+                return
+            try:
+                self._Run(task)
+            finally:
+                with self._lock:
+                    self._pending.pop(task.launchId, None)
+                    if not self._pending:
+                        self._idle.notify_all()
+
+    def _Run(self, task):
+        if task.cancelled:
+            return
+        if task.record is not None:
+            task.record.Add('queue', time.perf_counter() - task.record.submitted)
+        hwnd = None
+        associatedPids = set()
+        try:
+            spec = task.spec
+            hwnd, associatedPids = StartExe(
+                spec.cmdline, spec.path, spec.env, spec.className, spec.matcher, task.timeout,
+                PidClaim(self.registry, task.launchId), task.record
+            )
+            logger.info(f'launch: {task.launchId}  hwnd: {hwnd}  associatedPids: {associatedPids}')
+        except Exception:
+            logger.error('启动异常', exc_info=True)
+            if task.record is not None:
+                task.record['result'] = 'error'
+        if hwnd is None or task.cancelled:
+            self.registry.Release(task.launchId)
+        if task.cancelled and associatedPids:   # 启动中被取消: 在工作线程中结束, 不依赖回调(退出时UI已销毁)
+            self._Kill(task.launchId, associatedPids)
+        task.callback(hwnd, associatedPids)
+
+    def _Kill(self, launchId, pids):
+        backend = GetBackend()
+        for pid in pids:
+            try:
+                backend.Kill(pid)
+            except OSError:     # 已退出
+                continue
+        logger.info(f'launch cancelled: {launchId}  killed: {pids}')
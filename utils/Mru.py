@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Mru.py
+@Time  :    2026/10/20 14:32:17
+@Author:    daidai_up
+@Desc  :    最近使用的标签页(MRU): 每次选中时移到最前, 关闭时删除
+
+连续切换(类似Ctrl+Tab)时按第一次按下时的顺序逐个向后, 切换过程中选中不调整顺序,
+松开修饰键(或超时)结束切换后, 最终选中的才移到最前
+'''
+from collections import OrderedDict
+
+
+class MruStack:
+    '''key(Page ID)按最近使用排序'''
+    def __init__(self):
+        self._keys = OrderedDict()  # 最近使用的在最后, move_to_end为O(1)
+        self._cycle = None          # 切换中: [keys(最近的在前), 当前位置]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def Keys(self):
+        '''最近使用的在前'''
+        return list(reversed(self._keys))
+
+    def Add(self, key):
+        '''新打开未选中的key, 作为最久未使用的'''
+        if key not in self._keys:
+            self._keys[key] = None
+            self._keys.move_to_end(key, last=False)
+
+    def Touch(self, key):
+        '''key被选中, 切换过程中忽略(结束时由EndCycle记录)'''
+        if self._cycle is not None:
+            return
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+
+    def Remove(self, key):
+        self._keys.pop(key, None)
+        if self._cycle is None or key not in self._cycle[0]:
+            return
+        keys, pos = self._cycle
+        index = keys.index(key)
+        keys.remove(key)
+        if len(keys) < 2:
+            self._cycle = None
+            return
+        if index < pos or pos == len(keys):
+            pos -= 1
+        self._cycle[1] = pos
+
+    ############################################################################
+    def Cycle(self, step=1):
+        '''切换一步, 返回目标key. 少于两个时返回None'''
+        if self._cycle is None:
+            keys = self.Keys()
+            if len(keys) < 2:
+                return None
+            self._cycle = [keys, 0]
+        keys, pos = self._cycle
+        pos = (pos + step) % len(keys)
+        self._cycle[1] = pos
+        return keys[pos]
+
+    def IsCycling(self):
+        return self._cycle is not None
+
+    def CycleState(self):
+        '''(切换顺序, 当前位置), 不在切换中时为(None, -1)'''
+        if self._cycle is None:
+            return None, -1
+        return list(self._cycle[0]), self._cycle[1]
+
+    def EndCycle(self, key=None):
+        '''结束切换, 返回切换的目标. key为最终选中的(移到最前), 默认为切换的目标'''
+        target = None
+        if self._cycle is not None:
+            keys, pos = self._cycle
+            target = keys[pos]
+        self._cycle = None
+        key = target if key is None else key
+        if key is not None and key in self._keys:
+            self.Touch(key)
+        return target
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Platform.py
+@Time  :    2026/10/19 14:26:08
+@Author:    daidai_up
+@Desc  :    平台后端: 进程创建/窗口枚举/SetParent/MoveWindow/显示及关闭窗口/前台窗口/结束及等待进程
+
+* Win32Backend: pywin32 + psutil实现, 正常运行时使用
+* FakeBackend: 确定性的模拟实现(虚拟时钟, 慢启动的exe, 大量窗口/进程), 可在非Windows平台测试及benchmark
+* 启动/窗口相关代码通过GetBackend()获取当前后端, benchmark中用SetBackend(...)替换
+* 窗口/进程已不存在等失败统一抛出OSError(进程不存在为ProcessLookupError)
+'''
+import os
+import time
+import random
+import ctypes
+import logging
+from threading import RLock
+from utils.ProcessSnapshot import ProcessSnapshot, ALL_ATTRS, GetCurrentUser
+from utils.WindowIndex import WindowBackend, Win32WindowBackend, FakeWindowBackend
+from utils.Startup import LazyImport
+
+try:
+    import win32api
+    import win32con
+    import win32gui
+    import win32event
+    import win32process
+except ImportError:     # 非Windows平台, 只能使用FakeBackend
+    win32api = win32con = win32gui = win32event = win32process = None
+
+psutil = LazyImport('psutil')     # 首次使用时才导入
+
+logger = logging.getLogger(__name__)
+
+# WaitForInputIdle的结果
+WAIT_IDLE = 'idle'          # 已完成初始化
+WAIT_TIMEOUT = 'timeout'    # 仍在初始化
+WAIT_FAILED = 'failed'      # 非GUI程序或已退出
+
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+
+try:
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+    user32.BeginDeferWindowPos.argtypes = (ctypes.c_int, )
+    user32.DeferWindowPos.restype = wintypes.HANDLE
+    user32.DeferWindowPos.argtypes = (
+        wintypes.HANDLE, wintypes.HWND, wintypes.HWND,
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.UINT,
+    )
+    user32.EndDeferWindowPos.argtypes = (wintypes.HANDLE, )
+except (AttributeError, ImportError, ValueError):   # 非Windows平台
+    user32 = None
+
+
+################################################################################
+# 后端
+################################################################################
+class PlatformBackend(WindowBackend):
+    '''平台后端接口, 窗口枚举部分见WindowBackend'''
+    # 时间(FakeBackend使用虚拟时钟)
+    def Monotonic(self):
+        raise NotImplementedError
+
+    def Sleep(self, seconds):
+        raise NotImplementedError
+
+    # 进程
+    def CreateProcess(self, cmd, path, env):
+        '''启动并隐藏窗口, 返回(handle, pid, tid)'''
+        raise NotImplementedError
+
+    def WaitForInputIdle(self, handle, timeout):
+        '''等待进程初始化完成, 最多timeout秒. 返回WAIT_IDLE / WAIT_TIMEOUT / WAIT_FAILED'''
+        raise NotImplementedError
+
+    def CloseProcess(self, handle):
+        raise NotImplementedError
+
+    def Snapshot(self, attrs):
+        '''进程快照(ProcessSnapshot)'''
+        raise NotImplementedError
+
+    def Pids(self):
+        raise NotImplementedError
+
+    def CurrentUser(self):
+        raise NotImplementedError
+
+    def Kill(self, pid, createTime=None):
+        '''强制结束. createTime不为None时与进程创建时间不一致(pid复用)视为进程不存在'''
+        raise NotImplementedError
+
+    def WaitExit(self, pids, timeout):
+        '''pids: pid => 创建时间(None表示未知). 等待进程退出, 最多timeout秒, 返回仍在运行的部分'''
+        raise NotImplementedError
+
+    # 窗口
+    def IsWindow(self, hwnd):
+        raise NotImplementedError
+
+    def IsWindowVisible(self, hwnd):
+        raise NotImplementedError
+
+    def ShowWindow(self, hwnd, show):
+        raise NotImplementedError
+
+    def PostClose(self, hwnd):
+        '''发送WM_CLOSE, 不等待处理'''
+        raise NotImplementedError
+
+    def SetParent(self, hwnd, parent):
+        raise NotImplementedError
+
+    def MoveWindow(self, hwnd, pos, size):
+        raise NotImplementedError
+
+    def MoveWindows(self, moves):
+        '''moves: [(hwnd, (pos, size))]'''
+        for hwnd, (pos, size) in moves:
+            self.MoveWindow(hwnd, pos, size)
+
+    def PlaceWindow(self, hwnd, pos, size):
+        '''显示窗口并移到pos/size, 置于同级窗口最上层(附着到Page时)'''
+        raise NotImplementedError
+
+    def WaitPaint(self, hwnd, timeout):
+        '''请求重绘并等待窗口处理完之前的消息(近似首次重绘), 最多timeout秒. 返回是否完成'''
+        raise NotImplementedError
+
+    def GetForegroundWindow(self):
+        raise NotImplementedError
+
+    def AllowSetForeground(self):
+        '''解除前台锁限制, 之后调用SetForegroundWindow'''
+        raise NotImplementedError
+
+    def SetForegroundWindow(self, hwnd):
+        raise NotImplementedError
+
+
+class Win32Backend(Win32WindowBackend, PlatformBackend):
+    '''pywin32 + psutil实现'''
+    def Monotonic(self):
+        return time.monotonic()
+
+    def Sleep(self, seconds):
+        time.sleep(seconds)
+
+    def CreateProcess(self, cmd, path, env):
+        startInfo = win32process.STARTUPINFO()  # 控制子进程启动方式的参数
+        startInfo.dwFlags = win32process.STARTF_USESHOWWINDOW
+        startInfo.wShowWindow = win32con.SW_HIDE   # 隐藏窗口
+        flags = win32con.CREATE_NEW_CONSOLE | win32con.CREATE_NEW_PROCESS_GROUP
+        hProcess, hThread, pid, tid = win32process.CreateProcess(
+            None, cmd, None, None, 0, flags, env, path, startInfo
+        )
+        hThread.Close()
+        return hProcess, pid, tid
+
+    def WaitForInputIdle(self, handle, timeout):
+        result = win32event.WaitForInputIdle(handle, int(timeout * 1000))
+        if result == 0:
+            return WAIT_IDLE
+        if result == win32event.WAIT_TIMEOUT:
+            return WAIT_TIMEOUT
+        return WAIT_FAILED
+
+    def CloseProcess(self, handle):
+        handle.Close()
+
+    def Snapshot(self, attrs):
+        return ProcessSnapshot.Take(attrs)
+
+    def Pids(self):
+        return set(psutil.pids())
+
+    def CurrentUser(self):
+        return GetCurrentUser()
+
+    def Kill(self, pid, createTime=None):
+        if createTime is None:
+            os.kill(pid, 9)
+            return
+        try:
+            process = psutil.Process(pid)
+            if process.create_time() != createTime:
+                raise ProcessLookupError(f'pid reused: {pid}')
+            process.kill()
+        except psutil.NoSuchProcess as e:
+            raise ProcessLookupError(f'no such process: {pid}') from e
+        except psutil.AccessDenied as e:
+            raise PermissionError(f'access denied: {pid}') from e
+
+    def WaitExit(self, pids, timeout):
+        processes = []
+        for pid, createTime in pids.items():
+            try:
+                process = psutil.Process(pid)
+                if createTime is None or process.create_time() == createTime:  # 否则原进程已退出, pid被复用
+                    processes.append(process)
+            except psutil.NoSuchProcess:
+                continue
+        _, alive = psutil.wait_procs(processes, timeout=timeout)
+        return {process.pid: pids[process.pid] for process in alive}
+
+    def IsWindow(self, hwnd):
+        return bool(win32gui.IsWindow(hwnd))
+
+    def IsWindowVisible(self, hwnd):
+        return bool(win32gui.IsWindowVisible(hwnd))
+
+    def ShowWindow(self, hwnd, show):
+        try:
+            win32gui.ShowWindow(hwnd, win32con.SW_SHOW if show else win32con.SW_HIDE)
+        except win32gui.error as e:     # 窗口已销毁
+            raise OSError(f'ShowWindow: {e}') from e
+
+    def PostClose(self, hwnd):
+        try:
+            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+        except win32gui.error as e:
+            raise OSError(f'PostMessage: {e}') from e
+
+    def SetParent(self, hwnd, parent):
+        try:
+            win32gui.SetParent(hwnd, parent)
+        except win32gui.error as e:
+            raise OSError(f'SetParent: {e}') from e
+
+    def MoveWindow(self, hwnd, pos, size):
+        win32gui.MoveWindow(hwnd, *pos, *size, True)
+
+    def MoveWindows(self, moves):
+        '''多个窗口时使用DeferWindowPos批量移动, 只重绘一次'''
+        if len(moves) > 1 and user32 is not None:
+            hdwp = user32.BeginDeferWindowPos(len(moves))
+            for hwnd, (pos, size) in moves:
+                if not hdwp:
+                    break
+                hdwp = user32.DeferWindowPos(hdwp, hwnd, None, *pos, *size, SWP_NOZORDER | SWP_NOACTIVATE)
+            if hdwp and user32.EndDeferWindowPos(hdwp):
+                return
+            logger.warning('DeferWindowPos失败, 逐个移动')
+        super().MoveWindows(moves)
+
+    def PlaceWindow(self, hwnd, pos, size):
+        flags = win32con.SWP_SHOWWINDOW | win32con.SWP_FRAMECHANGED
+        win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, *pos, *size, flags)
+        win32gui.BringWindowToTop(hwnd)
+
+    def WaitPaint(self, hwnd, timeout):
+        try:
+            win32gui.InvalidateRect(hwnd, None, False)
+            win32gui.SendMessageTimeout(
+                hwnd, win32con.WM_NULL, 0, 0, win32con.SMTO_ABORTIFHUNG, int(timeout * 1000)
+            )
+        except win32gui.error:  # 超时 / 窗口已关闭
+            return False
+        return True
+
+    def GetForegroundWindow(self):
+        return win32gui.GetForegroundWindow()
+
+    def AllowSetForeground(self):
+        # 调用SetForegroundWindow()会有很多限制
+        # 此处在调用SetForegroundWindow()前事先发送一个键盘event来解决该问题
+        # import win32com.client
+        # shell = win32com.client.Dispatch('WScript.Shell')
+        # shell.SendKeys('%')
+        win32api.keybd_event(0x20, 0, 0, 0)
+
+    def SetForegroundWindow(self, hwnd):
+        win32gui.SetForegroundWindow(hwnd)
+
+
+class FakeProfile:
+    '''模拟的exe
+
+    delay: 从启动到创建窗口(及完成初始化)的虚拟时间(秒)
+    child: 窗口属于子进程(如cmd启动的ssh)
+    handoff: 窗口创建后根进程退出(如单实例程序把窗口交给已有进程)
+    closeDelay: 收到WM_CLOSE后退出的虚拟时间(秒), None表示弹出确认框不退出(如有子进程运行时的mintty)
+    '''
+    __slots__ = ('delay', 'className', 'child', 'handoff', 'closeDelay')
+
+    def __init__(self, delay=0.5, className='FakeWindow', child=False, handoff=False, closeDelay=0.2):
+        self.delay = delay
+        self.className = className
+        self.child = child
+        self.handoff = handoff
+        self.closeDelay = closeDelay
+
+
+class FakeBackend(FakeWindowBackend, PlatformBackend):
+    '''确定性的模拟后端
+
+    * 虚拟时钟: Sleep/WaitForInputIdle只推进时钟, 不真正等待
+    * exe按名称(命令行第一项的文件名)使用FakeProfile, 到时间后才出现窗口
+    * Populate(...)生成大量后台进程及窗口, 模拟繁忙的桌面
+    * 多线程共享同一个虚拟时钟, 只有单线程使用时结果确定
+    '''
+    def __init__(self, profiles=None, user='fake'):
+        super().__init__()
+        self.profiles = dict(profiles or {})    # exe名称(小写) => FakeProfile
+        self.user = user
+        self.now = 0.0
+        self.processes = {}     # pid => {attr: value}
+        self.parents = {}       # hwnd => 父窗口
+        self.rects = {}         # hwnd => (pos, size)
+        self.hidden = set()     # 隐藏的hwnd
+        self.foreground = None
+        self.calls.update(dict.fromkeys(
+            (
+                'CreateProcess', 'Snapshot', 'Kill', 'WaitExit', 'ShowWindow', 'PostClose', 'SetParent',
+                'MoveWindow', 'MoveWindows', 'PlaceWindow', 'WaitPaint', 'SetForegroundWindow',
+            ), 0
+        ))
+        self._events = []       # [(时间, 函数, 参数)], 按时间执行
+        self._nextPid = 10000
+        self._nextHwnd = 0x10000
+        self._lock = RLock()
+
+    def Populate(self, processes=0, windows=0, seed=0):
+        '''生成processes个后台进程及windows个属于它们的窗口'''
+        rnd = random.Random(seed)
+        with self._lock:
+            pids = []
+            for _ in range(processes):
+                ppid = rnd.choice(pids) if pids and rnd.random() < 0.7 else 4
+                name = rnd.choice(('svchost.exe', 'explorer.exe', 'chrome.exe', 'conhost.exe', 'code.exe'))
+                pids.append(self._AddProcess(ppid, name, [name, f'--id={len(pids)}'], f'user{rnd.randrange(3)}'))
+            for _ in range(windows if pids else 0):
+                pid = rnd.choice(pids)
+                self._AddWindow(pid, pid + 1, rnd.choice(('Chrome_WidgetWin_1', 'Shell_TrayWnd', 'IME')))
+
+    def _AddProcess(self, ppid, name, cmdline, user=None):
+        pid = self._nextPid
+        self._nextPid += 4
+        self.processes[pid] = {
+            'pid': pid, 'ppid': ppid, 'name': name, 'exe': name,
+            'username': self.user if user is None else user, 'cmdline': cmdline, 'create_time': self.now,
+        }
+        return pid
+
+    def _AddWindow(self, pid, tid, className):
+        hwnd = self._nextHwnd
+        self._nextHwnd += 2
+        self.AddWindow(hwnd, pid, tid, className)
+        return hwnd
+
+    def _Advance(self, seconds=0):
+        '''推进虚拟时钟, 执行到期的事件'''
+        with self._lock:
+            self.now += seconds
+            self._events.sort(key=lambda event: event[0])
+            while self._events and self._events[0][0] <= self.now:
+                _, func, args = self._events.pop(0)
+                func(*args)
+
+    def _Ready(self, pid, tid, profile, cmdline):
+        '''exe初始化完成: 创建窗口'''
+        if pid not in self.processes:   # 已被结束
+            return
+        owner = pid
+        if profile.child or profile.handoff:
+            ppid = 4 if profile.handoff else pid
+            owner = self._AddProcess(ppid, self.processes[pid]['name'], cmdline)
+            tid = owner + 1
+        self._AddWindow(owner, tid, profile.className)
+        if profile.handoff:
+            self.processes.pop(pid, None)
+
+    def _Exit(self, pid):
+        '''进程退出, 其窗口随之销毁'''
+        self.processes.pop(pid, None)
+        for hwnd in [hwnd for hwnd, (_pid, _, _) in self.windows.items() if _pid == pid]:
+            self.RemoveWindow(hwnd)
+
+    def _Running(self, pid, createTime=None):
+        info = self.processes.get(pid)
+        return info is not None and (createTime is None or info['create_time'] == createTime)
+
+    ############################################################################
+    def Monotonic(self):
+        return self.now
+
+    def Sleep(self, seconds):
+        self._Advance(seconds)
+
+    def CreateProcess(self, cmd, path, env):
+        with self._lock:
+            self.calls['CreateProcess'] += 1
+            cmdline = cmd.split()
+            name = os.path.basename(cmdline[0]).lower() if cmdline else ''
+            profile = self.profiles.get(name, FakeProfile())
+            pid = self._AddProcess(os.getpid(), name, cmdline)
+            tid = pid + 1
+            self._events.append((self.now + profile.delay, self._Ready, (pid, tid, profile, cmdline)))
+            return pid, pid, tid
+
+    def WaitForInputIdle(self, handle, timeout):
+        with self._lock:
+            if handle not in self.processes:
+                return WAIT_FAILED
+            ready = [when for when, _, args in self._events if args[0] == handle]
+            if not ready or ready[0] <= self.now + timeout:
+                self._Advance(max(0, ready[0] - self.now) if ready else 0)
+                return WAIT_IDLE if handle in self.processes else WAIT_FAILED
+            self._Advance(timeout)
+            return WAIT_TIMEOUT
+
+    def CloseProcess(self, handle):
+        pass
+
+    def Snapshot(self, attrs=ALL_ATTRS):
+        '''模拟的进程信息包含所有属性, 不需要Enrich'''
+        with self._lock:
+            self._Advance()
+            self.calls['Snapshot'] += 1
+            infos = {pid: dict(info) for pid, info in self.processes.items()}
+            return ProcessSnapshot(dict.fromkeys(infos), infos)
+
+    def Pids(self):
+        with self._lock:
+            return set(self.processes)
+
+    def CurrentUser(self):
+        return self.user
+
+    def Kill(self, pid, createTime=None):
+        with self._lock:
+            self.calls['Kill'] += 1
+            if not self._Running(pid, createTime):
+                raise ProcessLookupError(f'no such process: {pid}')
+            self._Exit(pid)
+
+    def WaitExit(self, pids, timeout):
+        '''有进程仍在运行时推进虚拟时钟到退出或超时'''
+        with self._lock:
+            self.calls['WaitExit'] += 1
+            deadline = self.now + timeout
+            while True:
+                alive = {pid: createTime for pid, createTime in pids.items() if self._Running(pid, createTime)}
+                pending = [when for when, _, _ in self._events if when <= deadline]
+                if not alive or not pending:
+                    break
+                self._Advance(min(pending) - self.now)
+            if alive:
+                self._Advance(deadline - self.now)
+            return alive
+
+    ############################################################################
+    def EnumWindows(self, callback):
+        self._Advance()
+        super().EnumWindows(callback)
+
+    def EnumThreadWindows(self, tid, callback):
+        self._Advance()
+        super().EnumThreadWindows(tid, callback)
+
+    def IsWindow(self, hwnd):
+        return hwnd in self.windows
+
+    def IsWindowVisible(self, hwnd):
+        return hwnd in self.windows and hwnd not in self.hidden
+
+    def ShowWindow(self, hwnd, show):
+        self.calls['ShowWindow'] += 1
+        if hwnd not in self.windows:
+            raise OSError(f'no such window: {hwnd}')
+        (self.hidden.discard if show else self.hidden.add)(hwnd)
+
+    def PostClose(self, hwnd):
+        '''窗口所属进程closeDelay后退出, closeDelay为None时弹出(可见的)确认框'''
+        with self._lock:
+            self.calls['PostClose'] += 1
+            if hwnd not in self.windows:
+                raise OSError(f'no such window: {hwnd}')
+            pid, tid, _ = self.windows[hwnd]
+            profile = self.profiles.get(self.processes.get(pid, {}).get('name'), FakeProfile())
+            if profile.closeDelay is None:
+                self._AddWindow(pid, tid, '#32770')
+            else:
+                self._events.append((self.now + profile.closeDelay, self._Exit, (pid, )))
+
+    def SetParent(self, hwnd, parent):
+        self.calls['SetParent'] += 1
+        if hwnd not in self.windows:
+            raise OSError(f'no such window: {hwnd}')
+        self.parents[hwnd] = parent
+
+    def MoveWindow(self, hwnd, pos, size):
+        self.calls['MoveWindow'] += 1
+        self.rects[hwnd] = (pos, size)
+
+    def MoveWindows(self, moves):
+        self.calls['MoveWindows'] += 1
+        super().MoveWindows(moves)
+
+    def PlaceWindow(self, hwnd, pos, size):
+        self.calls['PlaceWindow'] += 1
+        self.rects[hwnd] = (pos, size)
+
+    def WaitPaint(self, hwnd, timeout):
+        self.calls['WaitPaint'] += 1
+        return hwnd in self.windows
+
+    def GetForegroundWindow(self):
+        return self.foreground
+
+    def AllowSetForeground(self):
+        pass
+
+    def SetForegroundWindow(self, hwnd):
+        self.calls['SetForegroundWindow'] += 1
+        self.foreground = hwnd
+
+
+_backend = None
+
+
+def GetBackend():
+    '''当前后端, 默认为Win32Backend'''
+    global _backend
+    if _backend is None:
+        if win32gui is None:
+            raise RuntimeError('win32gui不可用, 请使用SetBackend(FakeBackend())')
+        _backend = Win32Backend()
+    return _backend
+
+
+def SetBackend(backend):
+    '''替换后端(测试/benchmark), 返回原后端'''
+    global _backend
+    old, _backend = _backend, backend
+    return old
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    ProcessRules.py
+@Time  :    2026/10/19 19:12:36
+@Author:    daidai_up
+@Desc  :    进程关联规则: 按core.json中每个type的规则, 一次遍历进程快照找出属于本次启动的进程
+
+core.json中的 process_rules (有该项时忽略process_keys):
+    "process_rules": [
+        {"key": "mintty", "exe": "mintty.exe", "min": 1, "max": 1},
+        {"key": "bash", "exe": "bash.exe", "parent": "mintty", "min": 0},
+        {"key": "ssh", "cmdline": "ssh(\\.exe)? .*@", "parent": "launched", "min": 0}
+    ]
+* key: 规则名称(日志及parent引用), 默认为exe或cmdline
+* exe: 进程名(不区分大小写)
+* cmdline: 命令行正则(不区分大小写, search)
+* parent: 父进程链(ppid逐级向上)中须有本次启动的进程("launched")或之前某条规则匹配的进程(规则key)
+* min / max: 匹配进程数的范围, 默认min为1, max不限
+
+旧的process_keys中每个关键字相当于 {"key": 关键字, "cmdline": 关键字(转义), "min": 1}
+'''
+import re
+from utils.ProcessSnapshot import JoinCmdline
+
+LAUNCHED = 'launched'
+MAX_DEPTH = 32      # 向上查找父进程的最大层数
+
+
+class ProcessRule:
+    '''一条编译后的规则'''
+    __slots__ = ('key', 'exe', 'cmdline', 'pattern', 'parent', 'min', 'max')
+
+    def __init__(self, key=None, exe=None, cmdline=None, parent=None, min=1, max=None):
+        if exe is None and cmdline is None:
+            raise ValueError(f'进程规则需要exe或cmdline: {key}')
+        self.key = str(key or exe or cmdline)
+        self.exe = exe.lower() if exe else None
+        self.cmdline = cmdline
+        self.pattern = re.compile(cmdline, re.IGNORECASE) if cmdline else None
+        self.parent = parent
+        self.min = int(min)
+        self.max = None if max is None else int(max)
+
+    def Source(self):
+        return (self.key, self.exe, self.cmdline, self.parent, self.min, self.max)
+
+    def Match(self, name, cmdline):
+        '''按进程名和命令行匹配(不含parent)'''
+        if self.exe is not None and (name or '').lower() != self.exe:
+            return False
+        if self.pattern is not None and not self.pattern.search(cmdline):
+            return False
+        return True
+
+
+class Association:
+    '''一次关联的结果及说明'''
+    def __init__(self, launched, results):
+        self.launched = launched
+        self.results = results      # [{'key', 'min', 'max', 'matched', 'rejected', 'status'}]
+        self.ok = all(result['status'] == 'ok' for result in results)
+        self.pids = set().union(*(result['matched'] for result in results))
+
+    def ToDict(self):
+        '''结构化的说明(写入启动记录)'''
+        return {
+            'ok': self.ok, 'launched': self.launched,
+            'rules': [
+                dict(result, matched=sorted(result['matched']), rejected={
+                    str(pid): reason for pid, reason in sorted(result['rejected'].items())
+                }) for result in self.results
+            ],
+        }
+
+    def Explain(self):
+        '''日志中的说明'''
+        parts = []
+        for result in self.results:
+            bound = f'{result["min"]}..{"" if result["max"] is None else result["max"]}'
+            part = f'{result["key"]}: {len(result["matched"])} [{bound}] {result["status"]} {sorted(result["matched"])}'
+            if result['rejected']:
+                part += f' rejected: {result["rejected"]}'
+            parts.append(part)
+        return f'{"matched" if self.ok else "failed"}  ' + '; '.join(parts)
+
+
+class ProcessMatcher:
+    '''一个type的所有规则'''
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        keys = set()
+        for rule in self.rules:
+            if rule.parent not in (None, LAUNCHED) and rule.parent not in keys:
+                raise ValueError(f'进程规则 {rule.key} 的parent须为launched或之前的规则: {rule.parent}')
+            keys.add(rule.key)
+        self.needCmdline = any(rule.pattern is not None for rule in self.rules)
+
+    @classmethod
+    def FromType(cls, type_):
+        '''core.json中的type => ProcessMatcher'''
+        rules = type_.get('process_rules')
+        if rules is None:   # 旧格式: 命令行包含关键字
+            rules = [{'key': pkey, 'cmdline': re.escape(pkey.lower())} for pkey in type_.get('process_keys', ())]
+        return cls(ProcessRule(**rule) for rule in rules)
+
+    def __eq__(self, other):
+        if not isinstance(other, ProcessMatcher):
+            return NotImplemented
+        return [rule.Source() for rule in self.rules] == [rule.Source() for rule in other.rules]
+
+    def __hash__(self):
+        return hash(tuple(rule.Source() for rule in self.rules))
+
+    def __repr__(self):
+        return f'ProcessMatcher({[rule.key for rule in self.rules]})'
+
+    ############################################################################
+    def Match(self, snapshot, launched=None):
+        '''在snapshot(通常已经过Diff/Restrict缩小范围)中匹配, 返回Association'''
+        if self.needCmdline:
+            snapshot.Enrich(('cmdline', ))
+        candidates = [[] for _ in self.rules]
+        for pid in snapshot.Pids():     # 一次遍历, 所有规则同时匹配
+            name = snapshot.Get(pid, 'name')
+            cmdline = JoinCmdline(snapshot.Get(pid, 'cmdline')) if self.needCmdline else ''
+            for n, rule in enumerate(self.rules):
+                if rule.Match(name, cmdline):
+                    candidates[n].append(pid)
+        matched = {LAUNCHED: set() if launched is None else {launched}}
+        results = []
+        for rule, pids in zip(self.rules, candidates):
+            accepted, rejected = set(), {}
+            for pid in pids:
+                if rule.parent is None or self._HasAncestor(snapshot, pid, matched[rule.parent]):
+                    accepted.add(pid)
+                else:
+                    rejected[pid] = f'parent不是{rule.parent}'
+            matched[rule.key] = accepted
+            if len(accepted) < rule.min:
+                status = 'too few'
+            elif rule.max is not None and len(accepted) > rule.max:
+                status = 'too many'
+            else:
+                status = 'ok'
+            results.append({
+                'key': rule.key, 'min': rule.min, 'max': rule.max,
+                'matched': accepted, 'rejected': rejected, 'status': status,
+            })
+        return Association(launched, results)
+
+    def _HasAncestor(self, snapshot, pid, ancestors):
+        '''pid的父进程链中是否有ancestors中的进程. 链上的进程可能不在快照中(已退出/不是新进程), 只用其ppid'''
+        for _ in range(MAX_DEPTH):
+            pid = snapshot.Get(pid, 'ppid')
+            if pid is None:
+                return False
+            if pid in ancestors:
+                return True
+        return False
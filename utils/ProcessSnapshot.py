@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    ProcessSnapshot.py
+@Time  :    2026/10/17 09:12:40
+@Author:    daidai_up
+@Desc  :    进程快照: 一次psutil.process_iter(...)遍历获取所有进程信息, 提供比对/过滤操作,
+            避免对每个进程单独创建psutil.Process并多次系统调用
+'''
+import os
+from utils.Startup import LazyImport
+
+psutil = LazyImport('psutil')     # 首次使用时才导入
+
+ALL_ATTRS = ('pid', 'ppid', 'name', 'exe', 'username', 'cmdline')
+# 进程树所需的属性. ppid由PpidMap一次取得所有进程的父进程(psutil逐个进程的ppid()在Windows上
+# 每次都遍历一遍系统进程表); name在Windows上可能需要打开进程句柄(exe()), 并非没有代价
+TREE_ATTRS = ('pid', 'ppid', 'name')
+TRACK_ATTRS = TREE_ATTRS + ('create_time', )     # 跟踪进程树时用于识别pid复用
+
+_currentUser = None
+
+
+def GetCurrentUser():
+    '''当前用户名(只查询一次)'''
+    global _currentUser
+    if _currentUser is None:
+        _currentUser = psutil.Process(os.getpid()).username()
+    return _currentUser
+
+
+def GetProcesses(pids):
+    '''pid => psutil.Process, 已退出的忽略(Process记录了创建时间, 之后pid被复用也不会误杀)'''
+    processes = []
+    for pid in pids:
+        try:
+            processes.append(psutil.Process(pid))
+        except psutil.NoSuchProcess:
+            continue
+    return processes
+
+
+def PpidMap():
+    '''pid => ppid, 一次取得所有进程的父进程. 平台不支持时返回None(逐个进程获取)'''
+    try:
+        return psutil._psplatform.ppid_map()
+    except (AttributeError, psutil.Error, OSError):
+        return None
+
+
+def JoinCmdline(cmdline):
+    '''命令行列表 => 小写字符串, 用于关键字匹配'''
+    if not cmdline:
+        return ''
+    return os.path.normpath(' '.join(cmdline)).lower()
+
+
+class ProcessSnapshot:
+    '''进程快照'''
+    def __init__(self, processes, infos):
+        self._processes = processes     # pid => psutil.Process
+        self._infos = infos             # pid => {attr: value}
+        self._children = None           # ppid => [pid], 按需构造
+
+    @classmethod
+    def Take(cls, attrs=ALL_ATTRS):
+        '''一次遍历获取所有进程的attrs, ppid用PpidMap一次取得'''
+        attrs = list(attrs)
+        ppids = PpidMap() if 'ppid' in attrs else None
+        if ppids is not None:
+            attrs.remove('ppid')
+        if 'pid' not in attrs:  # attrs为空时process_iter会获取所有属性
+            attrs.append('pid')
+        processes, infos = {}, {}
+        for process in psutil.process_iter(attrs=attrs, ad_value=None):
+            info = process.info
+            if ppids is not None:
+                info['ppid'] = ppids.get(process.pid)
+            processes[process.pid] = process
+            infos[process.pid] = info
+        return cls(processes, infos)
+
+    def _Subset(self, pids):
+        return ProcessSnapshot(
+            {pid: self._processes[pid] for pid in pids},
+            {pid: self._infos[pid] for pid in pids},
+        )
+
+    ############################################################################
+    def Pids(self):
+        return set(self._infos)
+
+    def Get(self, pid, attr, default=None):
+        '''获取某个进程的属性'''
+        info = self._infos.get(pid)
+        if info is None:
+            return default
+        return info.get(attr, default)
+
+    def __contains__(self, pid):
+        return pid in self._infos
+
+    def __len__(self):
+        return len(self._infos)
+
+    ############################################################################
+    def Diff(self, oldPids):
+        '''不在oldPids中的新进程'''
+        return self._Subset(self._infos.keys() - set(oldPids))
+
+    def Restrict(self, pids):
+        '''只保留pids中的进程'''
+        return self._Subset(self._infos.keys() & set(pids))
+
+    def Filter(self, predicate):
+        '''按predicate(pid, info)过滤'''
+        return self._Subset([pid for pid, info in self._infos.items() if predicate(pid, info)])
+
+    def FilterUser(self, user=None):
+        '''按用户过滤, 默认当前用户'''
+        if user is None:
+            user = GetCurrentUser()
+        self.Enrich(('username', ))
+        return self.Filter(lambda pid, info: info.get('username') == user)
+
+    def Enrich(self, attrs):
+        '''补充快照中缺失的属性, 只针对快照内的进程(通常已经过Diff/Restrict缩小范围)'''
+        for pid, info in self._infos.items():
+            missing = [attr for attr in attrs if attr not in info]
+            if not missing:
+                continue
+            try:
+                with self._processes[pid].oneshot():
+                    info.update(self._processes[pid].as_dict(missing, ad_value=None))
+            except psutil.NoSuchProcess:
+                info.update(dict.fromkeys(missing))
+        return self
+
+    ############################################################################
+    def Children(self, pid):
+        '''直接子进程ID'''
+        if self._children is None:
+            self._children = {}
+            for _pid, info in self._infos.items():
+                self._children.setdefault(info.get('ppid'), []).append(_pid)
+        return self._children.get(pid, [])
+
+    def Descendants(self, pid):
+        '''进程及其所有子孙进程ID, 进程不存在时返回空集合'''
+        if pid not in self._infos:
+            return set()
+        descendants = set()
+        stack = [pid]
+        while stack:
+            _pid = stack.pop()
+            if _pid in descendants:     # pid复用时可能出现环
+                continue
+            descendants.add(_pid)
+            stack.extend(self.Children(_pid))
+        return descendants
+
+    def Tree(self, pids):
+        '''pids及其所有子孙进程ID. 有create_time时, 早于父进程创建的"子进程"是pid复用, 排除'''
+        tree = set()
+        stack = [pid for pid in pids if pid in self._infos]
+        while stack:
+            pid = stack.pop()
+            if pid in tree:
+                continue
+            tree.add(pid)
+            createTime = self.Get(pid, 'create_time')
+            for child in self.Children(pid):
+                childTime = self.Get(child, 'create_time')
+                if createTime is None or childTime is None or childTime >= createTime:
+                    stack.append(child)
+        return tree
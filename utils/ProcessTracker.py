@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    ProcessTracker.py
+@Time  :    2026/10/18 18:21:37
+@Author:    daidai_up
+@Desc  :    会话进程树跟踪: 会话运行期间启动的进程(ssh, plink, 后台任务等)关闭时一并清理
+
+* 后台线程定期取一次进程快照(所有会话共用), 从已跟踪的进程出发补充新的子孙进程
+* 按 (pid, 创建时间) 跟踪, pid复用的进程不会被误认为会话进程
+* 父进程已退出的进程不再是任何会话根进程的子孙, psutil.children(recursive=True)也找不到,
+  这里记为孤儿进程, 关闭会话时同样清理
+'''
+import time
+import logging
+from threading import Thread, Lock, Event
+from utils.ProcessSnapshot import ProcessSnapshot, TRACK_ATTRS
+from utils.Startup import LazyImport
+
+psutil = LazyImport('psutil')     # 首次使用时才导入
+
+logger = logging.getLogger(__name__)
+DEFAULT_INTERVAL = 5    # 扫描间隔(秒)
+
+
+class ProcessTracker:
+    '''key(Page ID) => 会话进程树'''
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self._lock = Lock()
+        self._roots = {}        # key => 启动时找到的进程ID
+        self._tracked = {}      # key => {pid: (name, ppid, createTime)}
+        self._wake = Event()
+        self._thread = None
+        self.sweeps = 0
+        self.sweepCost = 0.0
+
+    def Add(self, key, pids):
+        '''开始跟踪会话, 立即记录根进程的创建时间(之后pid被复用时可以识别), 其余信息在下次扫描时补充'''
+        tracked = {}
+        for pid in pids:
+            try:
+                tracked[pid] = (None, None, psutil.Process(pid).create_time())
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                tracked[pid] = (None, None, None)
+        with self._lock:
+            self._roots[key] = set(pids)
+            self._tracked[key] = tracked
+        self.Start()
+
+    def Start(self):
+        '''启动扫描线程. interval改为0时线程退出, 之后改回大于0时重新启动'''
+        with self._lock:
+            if (self._thread is None or not self._thread.is_alive()) and self.interval > 0:
+                self._thread = Thread(target=self._Run, daemon=True)
+                self._thread.start()
+
+    def Remove(self, key):
+        '''停止跟踪, 返回会话的所有进程 pid => 创建时间(含孤儿进程, 未知时为None)'''
+        with self._lock:
+            self._roots.pop(key, None)
+            return {pid: createTime for pid, (_, _, createTime) in self._tracked.pop(key, {}).items()}
+
+    def Stop(self):
+        self.interval = 0
+        self._wake.set()
+
+    def Sweep(self, snapshot=None):
+        '''扫描一次: 补充新的子孙进程, 删除已退出的进程'''
+        with self._lock:
+            tracked = {key: dict(processes) for key, processes in self._tracked.items()}
+        if not tracked:
+            return
+        start = time.perf_counter()
+        if snapshot is None:
+            snapshot = ProcessSnapshot.Take(TRACK_ATTRS)
+        updated = {}
+        for key, processes in tracked.items():
+            alive = [
+                pid for pid, (_, _, createTime) in processes.items()
+                if pid in snapshot and createTime in (None, snapshot.Get(pid, 'create_time'))
+            ]
+            updated[key] = {
+                pid: (snapshot.Get(pid, 'name'), snapshot.Get(pid, 'ppid'), snapshot.Get(pid, 'create_time'))
+                for pid in snapshot.Tree(alive)
+            }
+        with self._lock:
+            for key, processes in updated.items():
+                if key in self._tracked:    # 扫描期间未关闭
+                    self._tracked[key] = processes
+        self.sweeps += 1
+        self.sweepCost += time.perf_counter() - start
+
+    def Pids(self, key):
+        '''会话跟踪到的进程ID'''
+        with self._lock:
+            return set(self._tracked.get(key, ()))
+
+    def Sessions(self):
+        '''key => 跟踪到的进程ID'''
+        with self._lock:
+            return {key: set(processes) for key, processes in self._tracked.items()}
+
+    def Report(self):
+        '''诊断信息: key => [(pid, name, ppid, 是否孤儿进程)]'''
+        report = {}
+        with self._lock:
+            for key, processes in self._tracked.items():
+                roots = self._roots[key]
+                report[key] = sorted(
+                    (pid, name, ppid, pid not in roots and ppid not in processes)
+                    for pid, (name, ppid, _) in processes.items()
+                )
+        return report
+
+    ############################################################################
+    def _Run(self):
+        while not self._wake.wait(self.interval):
+            if self.interval <= 0:
+                break
+            try:
+                self.Sweep()
+            except Exception:
+                logger.error('进程树扫描异常', exc_info=True)
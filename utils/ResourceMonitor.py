@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    ResourceMonitor.py
+@Time  :    2026/10/18 20:04:33
+@Author:    daidai_up
+@Desc  :    会话资源监控: 一个采样线程定期读取所有会话进程的CPU/内存
+
+* 每个进程用oneshot()一次读取cpu_times和memory_info
+* psutil.Process对象在两次采样间复用, CPU%由两次cpu_times之差计算
+* 每个会话保留最近若干次采样(环形缓冲)
+* 采样线程自身的CPU时间记为开销, 按单核百分比统计
+'''
+import time
+import logging
+from collections import deque
+from threading import Thread, Lock, Event
+from utils.Startup import LazyImport
+
+psutil = LazyImport('psutil')     # 首次使用时才导入
+
+logger = logging.getLogger(__name__)
+DEFAULT_INTERVAL = 2    # 采样间隔(秒)
+DEFAULT_HISTORY = 30    # 每个会话保留的采样数
+
+
+class Sample:
+    '''一次采样'''
+    __slots__ = ('time', 'cpu', 'rss', 'count')
+
+    def __init__(self, time_, cpu, rss, count):
+        self.time = time_
+        self.cpu = cpu          # CPU%(单核为100)
+        self.rss = rss          # 内存(字节)
+        self.count = count      # 进程数
+
+
+def FormatBytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
+
+
+class ResourceMonitor:
+    '''getSessions() => {key: pids}, 在采样线程中调用, 需线程安全. callback()在每次采样后调用'''
+    def __init__(self, getSessions, interval=DEFAULT_INTERVAL, history=DEFAULT_HISTORY, callback=None):
+        self.getSessions = getSessions
+        self.interval = interval
+        self.history = history
+        self.callback = callback
+        self._lock = Lock()
+        self._samples = {}      # key => deque[Sample]
+        self._processes = {}    # pid => (psutil.Process, 上次cpu时间)
+        self._wake = Event()
+        self._thread = None
+        self.sweeps = 0
+        self.sweepCost = 0.0    # 采样线程CPU时间(秒)
+        self.sweepTime = 0.0    # 采样线程运行时间(秒)
+
+    def Start(self):
+        '''启动采样线程. interval改为0时线程退出, 之后改回大于0时重新启动'''
+        if (self._thread is None or not self._thread.is_alive()) and self.interval > 0:
+            self._thread = Thread(target=self._Run, daemon=True)
+            self._thread.start()
+
+    def Stop(self):
+        self.interval = 0
+        self._wake.set()
+
+    def Latest(self, key):
+        '''最近一次采样, 没有时返回None'''
+        with self._lock:
+            samples = self._samples.get(key)
+            return samples[-1] if samples else None
+
+    def History(self, key):
+        with self._lock:
+            return list(self._samples.get(key, ()))
+
+    def Overhead(self):
+        '''采样开销: 采样线程CPU时间占单核的百分比'''
+        if self.sweepTime <= 0:
+            return 0.0
+        return self.sweepCost / self.sweepTime * 100
+
+    ############################################################################
+    def Sample(self):
+        '''采样一次'''
+        now = time.monotonic()
+        sessions = self.getSessions()
+        processes = {}
+        samples = {}
+        for key, pids in sessions.items():
+            cpu = rss = count = 0
+            for pid in pids:
+                usage = self._Read(pid, now, processes)
+                if usage is None:
+                    continue
+                cpu += usage[0]
+                rss += usage[1]
+                count += 1
+            samples[key] = Sample(now, cpu, rss, count)
+        self._processes = processes     # 已退出的进程不再保留
+        with self._lock:
+            for key in self._samples.keys() - samples.keys():
+                del self._samples[key]
+            for key, sample in samples.items():
+                self._samples.setdefault(key, deque(maxlen=self.history)).append(sample)
+
+    def _Read(self, pid, now, processes):
+        '''(CPU%, RSS), 首次采样的进程CPU%为0'''
+        process, last = self._processes.get(pid, (None, None))
+        try:
+            if process is None:
+                process = psutil.Process(pid)
+            with process.oneshot():
+                times = process.cpu_times()
+                rss = process.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        cpuTime = times.user + times.system
+        processes[pid] = (process, (now, cpuTime))
+        cpu = 0.0
+        if last is not None and now > last[0]:
+            cpu = max(0.0, (cpuTime - last[1]) / (now - last[0]) * 100)
+        return cpu, rss
+
+    def _Run(self):
+        while not self._wake.wait(self.interval):
+            if self.interval <= 0:
+                break
+            start, startCpu = time.perf_counter(), time.thread_time()
+            try:
+                self.Sample()
+            except Exception:
+                logger.error('资源采样异常', exc_info=True)
+            self.sweeps += 1
+            self.sweepCost += time.thread_time() - startCpu
+            self.sweepTime += self.interval + time.perf_counter() - start
+            if self.callback is not None:
+                self.callback()
+
+
+def main():
+    '''100个会话(每个3个进程)的采样开销'''
+    import os
+    import subprocess
+    children = [subprocess.Popen(['python', '-c', 'import time; time.sleep(60)']) for _ in range(30)]
+    pids = [os.getpid()] + [child.pid for child in children]
+    sessions = {n: {pids[(n * 3 + k) % len(pids)] for k in range(3)} for n in range(100)}
+    monitor = ResourceMonitor(lambda: sessions)
+    try:
+        number = 20
+        startCpu = time.thread_time()
+        for _ in range(number):
+            monitor.Sample()
+        cost = (time.thread_time() - startCpu) / number
+        print(f'{len(sessions)} sessions: {cost * 1e3:.2f}ms cpu/sample  '
+              f'{cost / DEFAULT_INTERVAL * 100:.3f}% of a core at {DEFAULT_INTERVAL}s interval')
+    finally:
+        for child in children:
+            child.kill()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Search.py
+@Time  :    2026/10/18 09:26:11
+@Author:    daidai_up
+@Desc  :    工具项搜索: 前缀/三元组索引, 按匹配程度 + 启动频率/时间排序
+
+* 每个文档(工具项)有若干字段(name, cmd中的主机, type), 均转为小写
+* 查询按空白分词, 每个词都需匹配某个字段
+* 长度>=3的词用三元组倒排索引取候选并验证子串, 较短的词只匹配单词前缀
+* 完全相同/字段前缀/单词前缀各有倒排索引, 打分只需集合运算
+'''
+import os
+import re
+import json
+import math
+import time
+import heapq
+import logging
+from operator import contains
+from itertools import compress, islice, repeat
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# 匹配得分
+SCORE_EXACT = 100       # 与字段完全相同
+SCORE_PREFIX = 60       # 字段前缀
+SCORE_WORD = 40         # 字段中某个单词的前缀
+SCORE_SUBSTRING = 20    # 字段子串
+# 使用记录得分
+USAGE_COUNT_WEIGHT = 8          # * log(1 + 启动次数)
+USAGE_RECENCY_WEIGHT = 30       # * exp(-距上次启动的时间 / USAGE_RECENCY_SCALE)
+USAGE_RECENCY_SCALE = 7 * 24 * 3600
+
+# 带参数的命令行选项(PuTTY/plink/ssh), 参数不是主机
+OPTIONS_WITH_VALUE = {
+    '-l', '-p', '-pw', '-i', '-load', '-serial', '-sercfg', '-d', '-r', '-o', '-e', '-f',
+}
+WORD_SPLIT = re.compile(r'[\s@:/\\._\-]+')
+MAX_PREFIX = 16     # 前缀索引的最大长度
+MIN_SUBSTRING = 3   # 达到该长度的词按子串匹配, 更短的词只匹配单词前缀
+
+
+def ExtractHost(cmd):
+    '''从启动命令中提取主机(最后一个非选项参数), 跳过密码等选项参数'''
+    if not cmd:
+        return ''
+    tokens = cmd.split() if isinstance(cmd, str) else [str(token) for token in cmd]
+    host = ''
+    skip = False
+    for token in tokens[1:]:
+        if skip:
+            skip = False
+            continue
+        if token.startswith('-'):
+            skip = token.lower() in OPTIONS_WITH_VALUE
+            continue
+        host = token
+    return host
+
+
+def Trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def Prefixes(text):
+    '''所有前缀, 最长MAX_PREFIX'''
+    return {text[:n] for n in range(1, min(len(text), MAX_PREFIX) + 1)}
+
+
+def WordPrefixes(field):
+    '''字段中各个单词的前缀'''
+    prefixes = set()
+    for word in [field] + WORD_SPLIT.split(field):
+        prefixes |= Prefixes(word)
+    return prefixes
+
+
+################################################################################
+# 索引
+################################################################################
+class SearchIndex:
+    '''前缀/三元组倒排索引, 打分只用集合运算, 不逐个文档比较'''
+    def __init__(self):
+        self._docs = {}         # key => (字段, ...)
+        self._joined = {}       # key => 字段拼接, 用于验证子串
+        self._order = {}        # key => 加入顺序, 得分相同时保持配置顺序
+        self._trigrams = {}     # 三元组 => {key}
+        self._exact = {}        # 字段 => {key}
+        self._heads = {}        # 字段前缀 => {key}
+        self._prefixes = {}     # 单词前缀 => {key}
+        self._last = None       # 上次查询 (词, {key}), 继续输入时在上次结果中过滤
+        self._ordered = None    # 按配置顺序的全部key, Update/Remove时失效
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _Postings(self, field):
+        '''字段对应的 (倒排表, 词) '''
+        yield self._exact, {field}
+        yield self._heads, Prefixes(field)
+        yield self._prefixes, WordPrefixes(field)
+        yield self._trigrams, Trigrams(field)
+
+    def Update(self, key, texts, order=None):
+        '''加入或更新文档'''
+        fields = tuple(str(text).lower() for text in texts if text)
+        self._last = None
+        self._ordered = None
+        if self._docs.get(key) == fields:
+            if order is not None:
+                self._order[key] = order
+            return
+        self.Remove(key)
+        self._docs[key] = fields
+        self._joined[key] = '\n'.join(fields)
+        self._order[key] = len(self._order) if order is None else order
+        for field in fields:
+            for postings, tokens in self._Postings(field):
+                for token in tokens:
+                    postings.setdefault(token, set()).add(key)
+
+    def Remove(self, key):
+        self._last = None
+        self._ordered = None
+        fields = self._docs.pop(key, None)
+        self._joined.pop(key, None)
+        self._order.pop(key, None)
+        if fields is None:
+            return
+        for field in fields:
+            for postings, tokens in self._Postings(field):
+                for token in tokens:
+                    keys = postings.get(token)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del postings[token]
+
+    ############################################################################
+    def Search(self, query, boost=None, limit=None):
+        '''按得分降序返回key, 得分相同时按配置顺序
+
+        boost: key => 额外得分(如使用记录), 每次查询会话计算一次, 只包含有得分的key
+        limit: 只返回前limit个, 每个得分层只取按配置顺序的前limit个, 不对全部结果排序
+        '''
+        words = query.lower().split()
+        if not words:
+            ordered = self._Ordered()
+            return ordered[:limit] if limit is not None else list(ordered)
+        within = None
+        if self._last is not None and self._Extends(words, self._last[0]):  # 继续输入
+            within = self._last[1]
+        if len(words) == 1:
+            tiers = self._WordTiers(words[0], within)
+        else:
+            tiers = self._MultiWordTiers(words, within)
+        self._last = (words, set().union(*tiers.values()))
+        return self._Rank(tiers, boost or {}, limit)
+
+    def _WordTiers(self, word, within=None):
+        '''得分 => {key}, 各层互不相交. within不为None时只考虑其中的key'''
+        if len(word) < MIN_SUBSTRING:   # 短词只匹配单词前缀
+            matched = self._prefixes.get(word, set())
+            if within is not None:
+                matched = matched & within
+        else:
+            matched = self._Candidates(word, within)
+            if len(word) > MIN_SUBSTRING:   # 只有一个三元组时候选即匹配, 否则验证子串
+                keys = list(matched)    # 逐个验证用map/compress, 不在Python层循环
+                matched = set(compress(keys, map(contains, map(self._joined.__getitem__, keys), repeat(word))))
+        tiers = {}
+        rest = matched
+        for postings, score in ((self._exact, SCORE_EXACT), (self._heads, SCORE_PREFIX), (self._prefixes, SCORE_WORD)):
+            keys = postings.get(word)
+            if keys and rest:
+                hit = rest & keys
+                if hit:
+                    tiers[score] = hit
+                    rest = rest - hit
+        if rest:
+            tiers[SCORE_SUBSTRING] = rest
+        return tiers
+
+    def _MultiWordTiers(self, words, within=None):
+        '''多个词: 都匹配的key, 得分为各词得分之和'''
+        scores = None
+        for word in sorted(words, key=len, reverse=True):     # 越长的词候选越少
+            wordScores = {key: score for score, keys in self._WordTiers(word, within).items() for key in keys}
+            if scores is None:
+                scores = wordScores
+            else:
+                scores = {key: score + wordScores[key] for key, score in scores.items() if key in wordScores}
+            if not scores:
+                break
+            within = set(scores)
+        tiers = {}
+        for key, score in scores.items():
+            tiers.setdefault(score, set()).add(key)
+        return tiers
+
+    def _Rank(self, tiers, boost, limit):
+        '''按 (得分+boost) 降序, 配置顺序升序. 同一层中只有带boost的key可能越过更高的层,
+        其余的按层从高到低, 每层只取配置顺序的前limit个, 取够limit个后更低的层不可能再入选'''
+        order = self._order
+        boosted = {}
+        if boost:
+            for score, keys in tiers.items():
+                if len(boost) < len(keys):
+                    boosted.update((key, score + extra) for key, extra in boost.items() if key in keys)
+                else:
+                    boosted.update((key, score + boost[key]) for key in keys if key in boost)
+        ranked = [(-score, order[key], key) for key, score in boosted.items()]
+        count = 0
+        for score in sorted(tiers, reverse=True):
+            keys = tiers[score]
+            if boosted:
+                keys = keys.difference(boosted)
+            first = self._FirstInOrder(keys, limit)
+            ranked.extend((-score, order[key], key) for key in first)
+            count += len(first)
+            if limit is not None and count >= limit:
+                break
+        ranked.sort()
+        return [key for _, _, key in ranked[:limit]]
+
+    def _FirstInOrder(self, keys, limit):
+        '''keys中按配置顺序的前limit个'''
+        if limit is None or len(keys) <= limit:
+            return sorted(keys, key=self._order.__getitem__)
+        if len(keys) * 4 >= len(self._docs):    # 较密: 按配置顺序扫描, 平均只需扫描约4*limit个
+            return list(islice((key for key in self._Ordered() if key in keys), limit))
+        return heapq.nsmallest(limit, keys, key=self._order.__getitem__)
+
+    def _Ordered(self):
+        '''全部key按配置顺序, 缓存到下次Update/Remove'''
+        if self._ordered is None:
+            self._ordered = sorted(self._docs, key=self._order.__getitem__)
+        return self._ordered
+
+    def _Candidates(self, word, within=None):
+        '''三元组都出现的文档(子串匹配的超集), within不为None时从其中开始过滤'''
+        candidates = within
+        for trigram in sorted(Trigrams(word), key=lambda trigram: len(self._trigrams.get(trigram, ()))):
+            keys = self._trigrams.get(trigram)
+            if not keys:
+                return set()
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                break
+        return candidates
+
+    def _Extends(self, words, lastWords):
+        '''words的匹配结果一定包含在lastWords的结果中
+
+        短词(单词前缀)与长词(子串)的匹配方式不同, 只有同一种匹配方式时才能在上次结果中过滤:
+        短词须为上次的词加后缀("h" => "ho"), 长词须包含上次的词("ser" => "serv")
+        '''
+        if len(words) < len(lastWords):
+            return False
+        for word, lastWord in zip(words, lastWords):
+            if len(lastWord) < MIN_SUBSTRING:
+                if len(word) >= MIN_SUBSTRING or not word.startswith(lastWord):
+                    return False
+            elif lastWord not in word:
+                return False
+        return True
+
+
+################################################################################
+# 使用记录
+################################################################################
+class LaunchUsage:
+    '''启动次数及最近启动时间, 持久化到json文件'''
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        self._usage = {}    # name => {'count': n, 'last': timestamp}
+        self.Load()
+
+    def Load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='UTF-8') as fh:
+                self._usage = json.loads(fh.read())
+        except Exception:
+            logger.error('使用记录异常', exc_info=True)
+
+    def Save(self):
+        with self._lock:
+            data = json.dumps(self._usage, ensure_ascii=False)
+        try:
+            with open(self.path, mode='w', encoding='UTF-8') as fh:
+                fh.write(data)
+        except OSError:
+            logger.error('使用记录保存异常', exc_info=True)
+
+    def Record(self, name):
+        with self._lock:
+            usage = self._usage.setdefault(name, {'count': 0, 'last': 0})
+            usage['count'] += 1
+            usage['last'] = time.time()
+
+    def Scores(self, now=None):
+        '''name => 得分, 只包含有使用记录的name'''
+        if now is None:
+            now = time.time()
+        with self._lock:
+            names = list(self._usage)
+        return {name: self.Score(name, now) for name in names}
+
+    def Score(self, name, now=None):
+        '''频率 + 最近使用的得分'''
+        usage = self._usage.get(name)
+        if usage is None:
+            return 0
+        if now is None:
+            now = time.time()
+        age = max(0, now - usage['last'])
+        return (
+            USAGE_COUNT_WEIGHT * math.log1p(usage['count'])
+            + USAGE_RECENCY_WEIGHT * math.exp(-age / USAGE_RECENCY_SCALE)
+        )
+
+
+def main():
+    '''10k工具项的查询耗时'''
+    import random
+    import timeit
+    random.seed(0)
+    index = SearchIndex()
+    for n in range(10000):
+        host = f'10.{random.randint(0, 255)}.{random.randint(0, 255)}.{n % 256}'
+        index.Update(('item', f'host-{n:05}'), (f'host-{n:05}', host, random.choice(['PuTTY', 'Cygwin'])))
+    boost = {('item', f'host-{n:05}'): random.random() * 30 for n in random.sample(range(10000), 500)}
+    for query in ('h', 'ho', 'host-0', 'host-09', '10.1', 'putty 10.2', 'zzz'):
+        number = 20
+        cost = timeit.timeit(lambda: index.Search(query, boost, limit=50), number=number) / number
+        print(f'{query!r:>14}  {len(index.Search(query)):>6} results  {cost * 1e3:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    SessionPool.py
+@Time  :    2026/10/17 13:41:52
+@Author:    daidai_up
+@Desc  :    预热会话池: 按工具项(prewarm: N)保持N个已启动、已找到窗口的隐藏exe,
+            点击工具项时直接附着到Page
+'''
+import logging
+from threading import Lock
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def GetSignature(item):
+    '''影响启动结果的配置(LaunchSpec), 变化后池中的会话作废'''
+    return item['spec']
+
+
+class SessionPool:
+    '''预热会话池'''
+    def __init__(self, launcher, limit, teardown):
+        self.launcher = launcher
+        self.teardown = teardown
+        self.limit = limit          # 全局上限: 就绪 + 启动中
+        self._lock = Lock()
+        self._targets = {}          # name => (count, toolData)
+        self._ready = {}            # name => deque[(hwnd, pids, launchId, signature)]
+        self._starting = {}         # token => (name, signature, launchId)
+        self._closed = False
+
+    def Configure(self, items, limit=None):
+        '''按配置设置预热数量, 作废已删除/已修改工具项的会话. items已编译LaunchSpec(见CompileSpecs)
+
+        limit: 新的全局上限(None为不变), 数量或上限降低时清理多出的就绪会话
+        '''
+        targets = {}
+        for item in items:
+            count = item.get('prewarm') or 0
+            if count > 0 and item.get('spec') is not None:
+                targets[item['name']] = (count, item)
+        stale = []
+        with self._lock:
+            self._targets = targets
+            if limit is not None:
+                self.limit = limit
+            total = len(self._starting)
+            for name, sessions in self._ready.items():
+                signature = GetSignature(targets[name][1]) if name in targets else None
+                for session in list(sessions):
+                    if session[3] != signature:
+                        sessions.remove(session)
+                        stale.append(session)
+                count = targets[name][0] if name in targets else 0
+                while sessions and (len(sessions) > count or total + len(sessions) > self.limit):
+                    stale.append(sessions.pop())
+                total += len(sessions)
+        self._Kill(stale)
+        self.Refill()
+
+    def Acquire(self, name, isAlive=None):
+        '''取出一个就绪的会话(hwnd, pids, launchId), 没有则返回None
+
+        isAlive(hwnd): 检查会话是否仍然有效(等待期间exe可能已退出)
+        '''
+        session = None
+        dead = []
+        with self._lock:
+            sessions = self._ready.get(name) or deque()
+            while sessions:
+                session = sessions.popleft()
+                if isAlive is None or isAlive(session[0]):
+                    break
+                dead.append(session)
+                session = None
+        self._Kill(dead)
+        self.Refill()
+        if session is not None:
+            logger.info(f'prewarm acquire: {name}  hwnd: {session[0]}')
+            return session[:3]
+        return None
+
+    def Refill(self):
+        '''补充启动, 直到各工具项达到预热数量或达到全局上限'''
+        with self._lock:
+            if self._closed:
+                return
+            total = len(self._starting) + sum(len(sessions) for sessions in self._ready.values())
+            for name, (count, toolData) in self._targets.items():
+                signature = GetSignature(toolData)
+                have = len(self._ready.get(name, ())) + sum(
+                    1 for starting in self._starting.values() if starting[0] == name
+                )
+                while have < count and total < self.limit:
+                    token = object()
+                    launchId = self.launcher.Submit(toolData['spec'], self._MakeCallback(token, name, signature))
+                    self._starting[token] = (name, signature, launchId)
+                    have += 1
+                    total += 1
+
+    def Drain(self):
+        '''清理所有预热会话, 之后启动完成的会话也直接清理'''
+        with self._lock:
+            self._closed = True
+            sessions = [session for _sessions in self._ready.values() for session in _sessions]
+            self._ready.clear()
+        self._Kill(sessions)
+
+    ############################################################################
+    def _MakeCallback(self, token, name, signature):
+        '''启动完成回调(工作线程中调用)'''
+        def callback(hwnd, pids):
+            with self._lock:    # Refill持锁提交, 回调时launchId已登记
+                launchId = self._starting.pop(token)[2]
+                target = self._targets.get(name)
+                valid = (
+                    hwnd is not None and not self._closed and target is not None
+                    and GetSignature(target[1]) == signature
+                )
+                if valid:
+                    self._ready.setdefault(name, deque()).append((hwnd, pids, launchId, signature))
+            if hwnd is None:
+                logger.warning(f'prewarm failed: {name}')   # 失败不重试, 等待下次Acquire/Configure
+            elif not valid:
+                self._Kill([(hwnd, pids, launchId, signature)])
+        return callback
+
+    def _Kill(self, sessions):
+        self.teardown.Close([(hwnd, pids, signature.closeMessage) for hwnd, pids, _, signature in sessions])
+        for _, _, launchId, _ in sessions:
+            self.launcher.Release(launchId)
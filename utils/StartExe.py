@@ -6,169 +6,149 @@
 @Author:    daidai_up
 @Desc  :
 '''
-import os
-import sys
-import time
-import psutil
 import logging
-import win32gui
-import win32con
-import win32process
-from threading import Thread
+from utils.ProcessSnapshot import TREE_ATTRS
+from utils.WindowIndex import WindowIndex
+from utils.LaunchMetrics import LaunchRecord
+from utils.Platform import GetBackend, WAIT_IDLE, WAIT_TIMEOUT
 
 logger = logging.getLogger(__name__)
-BASE_PATH = os.path.dirname(os.path.abspath(sys.argv[0]))
-
-
-################################################################################
-def formatPath(path=None):
-    '''格式化Path'''
-    if path is None:    # 默认当前Path
-        path = BASE_PATH
-    return os.path.abspath(path)
-
-
-def formatCmdline(cmd):
-    '''格式化命令行'''
-    if isinstance(cmd, str):
-        cmd = cmd.split()
-    return os.path.normpath(' '.join(cmd))
-
-
-def formatEnv(env=None):
-    '''格式化环境变量'''
-    newEnv = os.environ
-    if isinstance(env, dict):   # 更新环境变量
-        newEnv.update(env)
-    return newEnv
+DEFAULT_TIMEOUT = 10          # 默认查找窗口的总超时(秒), core.json中可按type设置timeout
+POLL_MIN_INTERVAL = 0.01      # 自适应轮询的起始间隔(秒)
+POLL_MAX_INTERVAL = 0.2       # 自适应轮询的最大间隔(秒)
 
 
 ################################################################################
 def GetAllPids():
     '''获取所有进程ID'''
-    return set(psutil.pids())
+    return GetBackend().Pids()
 
 
-def GetUesrNewPids(oldPids):
-    '''获取用户的新进程ID'''
-    newPids = set()
-    user = psutil.Process(os.getpid()).username()
-    for pid in (GetAllPids() - oldPids):
-        try:
-            _user = psutil.Process(pid).username()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-        if _user == user:   # 根据用户过滤
-            newPids.add(pid)
-    return newPids
+def GetUesrNewPids(oldPids, snapshot=None):
+    '''获取用户的新进程快照'''
+    backend = GetBackend()
+    if snapshot is None:
+        snapshot = backend.Snapshot(TREE_ATTRS)
+    return snapshot.Diff(oldPids).FilterUser(backend.CurrentUser())
 
 
 def KillPids(pids):
     '''清理进程'''
+    backend = GetBackend()
     for pid in pids:
         logger.info(f'kill: {pid}')
         try:
-            os.kill(pid, 9)
+            backend.Kill(pid)
         except OSError:
             continue
 
 
-def GetAssociatedPids(pids, pkeys):
-    '''根据关键字获取相关进程ID'''
-    def isAssociated(cmdline):
-        '''判断是否相关'''
-        for pkey in pkeys:
-            if pkey in cmdline:
-                return True
-        return False
-
-    associatedPids = set()
-    for pid in pids:
-        try:
-            process = psutil.Process(pid)
-            if isAssociated(formatCmdline(process.cmdline()).lower()):
-                associatedPids.add(pid)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    if len(associatedPids) != len(pkeys):   # 不完整
-        associatedPids.clear()
-    return associatedPids
+def GetAssociatedPids(snapshot, matcher, launched=None):
+    '''按type的关联规则(ProcessRules.ProcessMatcher)获取相关进程, 返回Association(含说明)'''
+    return matcher.Match(snapshot, launched)
 ################################################################################
 
 
-def GetAllHwnds():
-    '''获取所有窗口句柄'''
-    def _walk(hwnd, lpararm):
-        if win32gui.IsWindow(hwnd):
-            hwnds.add(hwnd)
+_windowIndex = None
 
-    hwnds = set()
-    win32gui.EnumWindows(_walk, 0)
-    return hwnds
 
-
-def GetHwnd(hwndClassName, pids):
-    '''按类名和进程号获取hwnd'''
-    for hwnd in GetAllHwnds():
-        # 窗口句柄对应的进程过滤
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        if pid not in pids:
-            continue
-        if win32gui.GetClassName(hwnd) == hwndClassName:
-            return hwnd
-    return None
+def GetHwnd(hwndClassName, pids, tids=()):
+    '''按类名和进程号获取hwnd, tids为已知的线程号(如CreateProcess返回的主线程)'''
+    global _windowIndex
+    backend = GetBackend()
+    if _windowIndex is None or _windowIndex.backend is not backend:     # 后端已替换
+        _windowIndex = WindowIndex(backend)
+    return _windowIndex.FindWindow(hwndClassName, pids, tids)
 
 
 ################################################################################
 # 启动exe
 ################################################################################
-class StartExeThread(Thread):
-    '''启动exe的子线程'''
-    def __init__(self, cmd, path, env, hwndClassName, pkeys, callback):
-        super().__init__(daemon=True)
-        self.cmd = formatCmdline(cmd)
-        self.path = formatPath(path)
-        self.env = formatEnv(env)
-        self.hwndClassName = hwndClassName
-        self.pkeys = pkeys
-        self.callback = callback
-
-    def run(self):
-        hwnd = None
-        associatedPids = set()
-        try:
-            hwnd, associatedPids = StartExe(
-                self.cmd, self.path, self.env, self.hwndClassName, self.pkeys
-            )
-            logger.info(f'hwnd: {hwnd}  associatedPids: {associatedPids}')
-        except Exception:
-            logger.error('启动异常', exc_info=True)
-        self.callback(hwnd, associatedPids)
-
-
-def StartExe(cmd, path, env, hwndClassName, pkeys):
-    '''启动一个exe窗口程序, 并返回Hwnd及Pids'''
-    oldPids = GetAllPids()
+def StartExe(cmd, path, env, hwndClassName, matcher, timeout=DEFAULT_TIMEOUT, claim=None, record=None):
+    '''启动一个exe窗口程序, 并返回Hwnd及Pids
+
+    matcher: 进程关联规则(见ProcessRules.ProcessMatcher)
+    claim: 并发启动时的进程归属登记(见Launcher.PidClaim), 避免不同启动相互"抢"进程
+    record: 各阶段耗时记录(见LaunchMetrics.LaunchRecord)
+    '''
+    if record is None:
+        record = LaunchRecord(None, None)
+    record['timeout'] = timeout
+    backend = GetBackend()
+    with record.Measure('pids'):
+        oldPids = GetAllPids()
     logger.info(f'cmd: {cmd}  path: {path} env: {env}')
-    _StartExe(cmd, path, env)
-    for _ in range(3):
-        time.sleep(1)
-        newPids = GetUesrNewPids(oldPids)
-        associatedPids = GetAssociatedPids(newPids, pkeys)
-        if associatedPids:
-            break
-    if not associatedPids:  # 未能成功获取关联Pids, 清理
-        KillPids(newPids)
-    hwnd = GetHwnd(hwndClassName, associatedPids)
+    with record.Measure('create_process'):
+        hProcess, pid, tid = backend.CreateProcess(cmd, path, env)    # 启动并隐藏窗口
+    try:
+        with record.Measure('discovery'):
+            hwnd, pids = DiscoverExe(hProcess, pid, tid, oldPids, hwndClassName, matcher, timeout, claim, record)
+    finally:
+        backend.CloseProcess(hProcess)
     if hwnd is None:     # 未能成功获取窗口句柄, 清理
-        KillPids(associatedPids)
-    return hwnd, associatedPids
-
+        record['result'] = 'timeout'
+        KillPids(pids)
+        return None, set()
+    record['result'] = 'ok'
+    return hwnd, pids
+
+
+def DiscoverExe(hProcess, pid, tid, oldPids, hwndClassName, matcher, timeout, claim=None, record=None):
+    '''从CreateProcess返回的进程出发, 跟踪其子孙进程, 直到找到窗口或超时
+
+    * 进程为GUI程序时, 用WaitForInputIdle(...)等待其初始化完成, 而不是固定sleep
+    * 轮询间隔从POLL_MIN_INTERVAL开始倍增, 直到POLL_MAX_INTERVAL
+    * 根进程已退出(将窗口交给其他进程)时, 回退为比对新进程, 并排除其他启动已登记的进程, 须满足所有关联规则
+    * 关联结果的说明写入日志及record
+    '''
+    if record is None:
+        record = LaunchRecord(None, None)
+    backend = GetBackend()
+    deadline = backend.Monotonic() + timeout
+    interval = POLL_MIN_INTERVAL
+    inputIdle = False
+    pids = set()
+    association = None
+    while True:
+        record['iterations'] += 1
+        with record.Measure('wait'):
+            if not inputIdle:
+                result = backend.WaitForInputIdle(hProcess, interval)
+                if result == WAIT_IDLE:     # 已完成初始化, 之后的轮询改为sleep
+                    inputIdle = True
+                elif result != WAIT_TIMEOUT:   # 非GUI程序或已退出
+                    inputIdle = True
+                    backend.Sleep(interval)
+            else:
+                backend.Sleep(interval)
+        with record.Measure('pids'):
+            snapshot = backend.Snapshot(TREE_ATTRS)     # 每轮只遍历一次进程表
+            pids = snapshot.Descendants(pid)
+        if not pids:    # 根进程已退出
+            if claim is not None:
+                oldPids = oldPids | claim.Others()
+            with record.Measure('association'):
+                association = GetAssociatedPids(GetUesrNewPids(oldPids, snapshot), matcher, pid)
+            pids = association.pids if association.ok else set()
+        if claim is not None:
+            claim.Claim(pids)
+        with record.Measure('window'):
+            hwnd = GetHwnd(hwndClassName, pids, (tid, ))
+        if hwnd is not None:
+            hwndPid = backend.GetWindowPid(hwnd)
+            with record.Measure('association'):
+                association = GetAssociatedPids(snapshot.Restrict(pids), matcher, pid)
+            pids = association.pids | {hwndPid}
+            record['association'] = association.ToDict()
+            logger.info(f'association: {association.Explain()}')
+            if claim is not None:
+                claim.Claim(pids)
+            return hwnd, pids
+        if backend.Monotonic() >= deadline:
+            logger.warning(f'查找窗口超时: {timeout}s  pids: {pids}')
+            if association is not None:
+                record['association'] = association.ToDict()
+                logger.warning(f'association: {association.Explain()}')
+            return None, pids
+        interval = min(interval * 2, POLL_MAX_INTERVAL)
 
-def _StartExe(cmd, path, env):
-    '''启动一个exe窗口程序, 并隐藏'''
-    startInfo = win32process.STARTUPINFO()  # 控制子进程启动方式的参数
-    startInfo.dwFlags = win32process.STARTF_USESHOWWINDOW
-    startInfo.wShowWindow = win32con.SW_HIDE   # 隐藏窗口
-    flags = win32con.CREATE_NEW_CONSOLE | win32con.CREATE_NEW_PROCESS_GROUP
-    win32process.CreateProcess(None, cmd, None, None, 0, flags, env, path, startInfo)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Startup.py
+@Time  :    2026/10/19 09:40:12
+@Author:    daidai_up
+@Desc  :    启动优化: 延迟导入 & 启动耗时记录
+
+* LazyImport: 模块在首次访问属性时才真正导入(如psutil在首次启动exe时才导入)
+  LazyLoader在Python 3.12.3之前不是线程安全的, 多个线程同时首次访问时可能拿到未初始化完的模块,
+  因此在启动后台线程之前须在UI线程中调用Preload
+* StartupTrace: 记录启动各阶段耗时, 命令行参数 --trace-startup 或环境变量 MULTITAB_TRACE_STARTUP=1 时写入日志
+'''
+import os
+import sys
+import time
+import logging
+import importlib.util
+
+logger = logging.getLogger(__name__)
+TRACE_ARG = '--trace-startup'
+TRACE_ENV = 'MULTITAB_TRACE_STARTUP'
+
+
+def LazyImport(name):
+    '''延迟导入的模块, 已导入时直接返回'''
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f'No module named {name!r}', name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def Preload(*names):
+    '''在当前线程中完成延迟导入模块的加载(访问任一属性即触发加载)'''
+    for name in names:
+        module = sys.modules.get(name)
+        if module is not None:
+            getattr(module, '__name__')
+
+
+class StartupTrace:
+    '''启动各阶段耗时'''
+    def __init__(self, start=None, enabled=None):
+        if enabled is None:
+            enabled = TRACE_ARG in sys.argv or os.environ.get(TRACE_ENV) == '1'
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self._phases = []   # [(阶段, 耗时)]
+        self._logged = False
+
+    def Mark(self, phase):
+        '''记录从上一个阶段结束到现在的耗时'''
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+
+    def Report(self):
+        lines = [f'{phase:<24}{cost * 1e3:>8.1f}ms' for phase, cost in self._phases]
+        lines.append(f'{"total":<24}{(self._last - self.start) * 1e3:>8.1f}ms')
+        return '\n'.join(lines)
+
+    def Log(self):
+        '''启动完成, 写入日志(只写一次)'''
+        if self.enabled and not self._logged:
+            self._logged = True
+            logger.info(f'startup trace:\n{self.Report()}')
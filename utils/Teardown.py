@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    Teardown.py
+@Time  :    2026/10/18 16:50:03
+@Author:    daidai_up
+@Desc  :    会话关闭: 先让exe自己退出(WM_CLOSE), 宽限期后仍未退出的进程再强制结束
+
+* UI线程中只分离窗口, 立即返回
+* 后台线程中补充进程树中的所有子孙进程, 发送WM_CLOSE(PostMessage不等待)
+* 等待及强制结束在后台线程中进行, 一次关闭多个会话时统一等待、统一结束
+* 关闭时会弹出确认框的type(core.json中close_message为false, 如PuTTY)不发送WM_CLOSE, 直接结束;
+  其他exe等待期间弹出的窗口(如mintty有子进程在运行时的确认框)隐藏, 宽限期后随进程一起结束
+* 后台线程不是daemon线程, 主界面关闭后进程仍会等待清理完成再退出
+'''
+import logging
+from threading import Thread
+from utils.Platform import GetBackend
+from utils.ProcessSnapshot import TRACK_ATTRS
+
+logger = logging.getLogger(__name__)
+DEFAULT_GRACE = 3       # 发送WM_CLOSE后等待exe自己退出的时间(秒)
+KILL_WAIT = 1           # 强制结束后等待进程退出的时间(秒)
+POPUP_INTERVAL = 0.1    # 等待期间检查弹出窗口的间隔(秒)
+
+
+def HidePopups(pids):
+    '''隐藏pids的可见顶层窗口(会话窗口已在分离时隐藏, 剩下的是关闭时弹出的窗口)'''
+    backend = GetBackend()
+
+    def callback(hwnd):
+        try:
+            if backend.IsWindowVisible(hwnd) and backend.GetWindowPid(hwnd) in pids:
+                backend.ShowWindow(hwnd, False)
+        except OSError:     # 窗口已销毁
+            pass
+
+    backend.EnumWindows(callback)
+
+
+class TeardownService:
+    '''异步关闭会话'''
+    def __init__(self, grace=DEFAULT_GRACE):
+        self.grace = grace
+
+    def Close(self, sessions):
+        '''sessions: [(hwnd, pids, closeMessage)]
+        hwnd可以为None(只结束进程); closeMessage为False时直接结束
+        pids为进程ID集合或 pid => 创建时间(None表示未知), 创建时间不一致的是pid复用, 不结束
+        返回后台线程, 没有需要清理的时返回None
+        '''
+        hwnds, pids, killPids = [], {}, {}
+        for hwnd, _pids, closeMessage in sessions:
+            if hwnd is not None:
+                self._Detach(hwnd)
+                if closeMessage:
+                    hwnds.append(hwnd)
+            if not isinstance(_pids, dict):
+                _pids = dict.fromkeys(_pids)
+            (pids if closeMessage else killPids).update(_pids)
+        if not (hwnds or pids or killPids):
+            return None
+        thread = Thread(target=self._Reap, args=(hwnds, pids, killPids, self.grace))
+        thread.start()
+        return thread
+
+    def _Detach(self, hwnd):
+        '''从Page分离并隐藏, Page销毁时不会连带销毁exe窗口'''
+        backend = GetBackend()
+        try:
+            backend.ShowWindow(hwnd, False)
+            backend.SetParent(hwnd, 0)
+        except OSError:     # 窗口已销毁
+            pass
+
+    def _Reap(self, hwnds, pids, killPids, grace):
+        '''通知exe退出, 等待宽限期, 之后强制结束剩余进程. killPids不等待'''
+        backend = GetBackend()
+        # 先确定进程树: exe退出后其子进程与会话的父子关系就断开了
+        snapshot = backend.Snapshot(TRACK_ATTRS)
+        processes = self._Tree(snapshot, pids)
+        killed = self._Tree(snapshot, killPids)
+        for hwnd in hwnds:
+            try:
+                backend.PostClose(hwnd)
+            except OSError:
+                continue
+        alive = self._Wait(processes, grace)
+        alive.update(killed)
+        for pid, createTime in alive.items():
+            logger.info(f'kill: {pid}')
+            try:
+                backend.Kill(pid, createTime)
+            except ProcessLookupError:  # 已退出
+                continue
+            except OSError:
+                logger.warning(f'kill failed: {pid}')
+        if alive:
+            backend.WaitExit(alive, KILL_WAIT)
+        logger.info(f'teardown: {len(processes) + len(killed)} processes  killed: {len(alive)}')
+
+    def _Tree(self, snapshot, pids):
+        '''pids及其子孙进程中仍在运行的: pid => 创建时间'''
+        return {pid: snapshot.Get(pid, 'create_time') for pid in snapshot.Tree(self._Alive(snapshot, pids))}
+
+    def _Alive(self, snapshot, pids):
+        '''pid => 创建时间中仍是原进程的pid (已退出的不在快照中, 创建时间不一致的是pid复用)'''
+        alive = set()
+        for pid, createTime in pids.items():
+            if pid not in snapshot:
+                continue
+            if createTime is not None and snapshot.Get(pid, 'create_time') != createTime:
+                logger.info(f'pid reused: {pid}')
+                continue
+            alive.add(pid)
+        return alive
+
+    def _Wait(self, processes, grace):
+        '''等待进程退出, 期间隐藏其弹出的窗口(关闭确认框等). 返回仍未退出的进程'''
+        backend = GetBackend()
+        alive = processes
+        deadline = backend.Monotonic() + grace
+        while alive:
+            timeout = min(POPUP_INTERVAL, deadline - backend.Monotonic())
+            if timeout <= 0:
+                break
+            alive = backend.WaitExit(alive, timeout)
+            if alive:
+                HidePopups(set(alive))
+        return dict(alive)
@@ -7,7 +7,6 @@
 @Desc  :
 '''
 import wx
-from pynput import keyboard
 from threading import Thread
 
 
@@ -26,17 +25,19 @@ def GetBorders():
 class ListenKeyThread(Thread):
     '''监控热键线程'''
     def __init__(self):
+        from utils.HotKeys import HotKeyMatcher     # pynput在创建热键线程时才导入
         super().__init__(daemon=True)
-        self.__hotkeys = {}
+        self.matcher = HotKeyMatcher()
 
-    def AddHotKey(self, hotKey, callback):
-        '''热键=>回调'''
-        self.__hotkeys[hotKey] = callback
+    def SetHotKeys(self, hotKeys):
+        '''热键=>回调callback(t0), 可在运行中替换'''
+        self.matcher.SetHotKeys(hotKeys)
 
     def Start(self):
         '''Rename'''
         self.start()
 
     def run(self):
-        with keyboard.GlobalHotKeys(self.__hotkeys, daemon=True) as ghk:
-            ghk.join()
+        from pynput import keyboard
+        with keyboard.Listener(on_press=self.matcher.Press, on_release=self.matcher.Release) as listener:
+            listener.join()
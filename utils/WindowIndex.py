@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    WindowIndex.py
+@Time  :    2026/10/17 10:03:27
+@Author:    daidai_up
+@Desc  :    窗口索引: 按进程查找窗口句柄
+
+* 优先只枚举目标线程的窗口(EnumThreadWindows), 找到即停止
+* 否则单次枚举所有顶层窗口, 构造pid => [hwnd]映射, 找到即停止
+* 枚举操作封装在WindowBackend中, FakeWindowBackend可在非Windows平台测试及benchmark
+'''
+try:
+    import win32gui
+    import win32process
+except ImportError:     # 非Windows平台, 只能使用FakeWindowBackend
+    win32gui = win32process = None
+
+
+class _StopEnum(Exception):
+    '''提前结束枚举'''
+
+
+################################################################################
+# 后端
+################################################################################
+class WindowBackend:
+    '''窗口枚举后端接口. callback(hwnd)返回True时停止枚举'''
+    def EnumWindows(self, callback):
+        raise NotImplementedError
+
+    def EnumThreadWindows(self, tid, callback):
+        raise NotImplementedError
+
+    def GetWindowPid(self, hwnd):
+        raise NotImplementedError
+
+    def GetClassName(self, hwnd):
+        raise NotImplementedError
+
+
+class Win32WindowBackend(WindowBackend):
+    '''win32gui实现'''
+    def EnumWindows(self, callback):
+        self._Enum(win32gui.EnumWindows, callback)
+
+    def EnumThreadWindows(self, tid, callback):
+        self._Enum(lambda walk, extra: win32gui.EnumThreadWindows(tid, walk, extra), callback)
+
+    def _Enum(self, enum, callback):
+        def _walk(hwnd, lparam):
+            if callback(hwnd):
+                raise _StopEnum()
+            return True
+
+        try:
+            enum(_walk, 0)
+        except _StopEnum:
+            pass
+        except win32gui.error:  # 线程没有窗口 / 线程已退出
+            pass
+
+    def GetWindowPid(self, hwnd):
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        return pid
+
+    def GetClassName(self, hwnd):
+        return win32gui.GetClassName(hwnd)
+
+
+class FakeWindowBackend(WindowBackend):
+    '''模拟窗口, 记录调用次数'''
+    def __init__(self, windows=()):
+        self.windows = {}       # hwnd => (pid, tid, className)
+        self.calls = {'EnumWindows': 0, 'EnumThreadWindows': 0, 'visited': 0}
+        for hwnd, pid, tid, className in windows:
+            self.AddWindow(hwnd, pid, tid, className)
+
+    def AddWindow(self, hwnd, pid, tid, className):
+        self.windows[hwnd] = (pid, tid, className)
+
+    def RemoveWindow(self, hwnd):
+        self.windows.pop(hwnd, None)
+
+    def EnumWindows(self, callback):
+        self.calls['EnumWindows'] += 1
+        self._Enum(list(self.windows), callback)
+
+    def EnumThreadWindows(self, tid, callback):
+        self.calls['EnumThreadWindows'] += 1
+        self._Enum([hwnd for hwnd, (_, _tid, _) in self.windows.items() if _tid == tid], callback)
+
+    def _Enum(self, hwnds, callback):
+        for hwnd in hwnds:
+            self.calls['visited'] += 1
+            if callback(hwnd):
+                return
+
+    def GetWindowPid(self, hwnd):
+        return self.windows[hwnd][0]
+
+    def GetClassName(self, hwnd):
+        return self.windows[hwnd][2]
+
+
+def DefaultBackend():
+    '''当前平台的后端'''
+    if win32gui is None:
+        raise RuntimeError('win32gui不可用, 请使用FakeWindowBackend')
+    return Win32WindowBackend()
+
+
+################################################################################
+# 索引
+################################################################################
+class WindowIndex:
+    '''按进程/线程查找窗口'''
+    def __init__(self, backend=None):
+        self.backend = DefaultBackend() if backend is None else backend
+
+    def Build(self, pids=None):
+        '''单次枚举构造 pid => [hwnd], pids不为空时只记录这些进程'''
+        index = {}
+
+        def _walk(hwnd):
+            pid = self.backend.GetWindowPid(hwnd)
+            if pids is None or pid in pids:
+                index.setdefault(pid, []).append(hwnd)
+
+        self.backend.EnumWindows(_walk)
+        return index
+
+    def FindWindow(self, className, pids, tids=()):
+        '''按类名和进程号查找窗口, 先枚举tids线程的窗口, 找到即返回'''
+        found = []
+
+        def _walk(hwnd):
+            if self.backend.GetWindowPid(hwnd) not in pids:
+                return False
+            if self.backend.GetClassName(hwnd) == className:
+                found.append(hwnd)
+                return True
+            return False
+
+        if not pids:
+            return None
+        for tid in tids:
+            self.backend.EnumThreadWindows(tid, _walk)
+            if found:
+                return found[0]
+        self.backend.EnumWindows(_walk)
+        return found[0] if found else None
+
+
+def main():
+    '''FakeWindowBackend下的benchmark'''
+    import timeit
+    for count in (100, 1000, 10000):
+        backend = FakeWindowBackend(
+            (hwnd, 1000 + hwnd // 4, 5000 + hwnd // 4, 'Other') for hwnd in range(count)
+        )
+        backend.AddWindow(count, 99999, 88888, 'PuTTY')   # 最后创建的窗口
+        index = WindowIndex(backend)
+        number = 100
+        full = timeit.timeit(lambda: index.FindWindow('PuTTY', {99999}), number=number)
+        thread = timeit.timeit(lambda: index.FindWindow('PuTTY', {99999}, (88888, )), number=number)
+        print(f'{count:>6} windows  full: {full / number * 1e3:.3f}ms  thread: {thread / number * 1e3:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    MruOverlay.py
+@Time  :    2026/10/20 15:06:51
+@Author:    daidai_up
+@Desc  :    最近使用的标签页预览: 连续切换时显示切换顺序并高亮目标, 不获取焦点
+'''
+import wx
+
+MAX_ROWS = 10
+
+
+class CustomMruOverlay(wx.PopupWindow):
+    '''rows: [文本], current: 高亮的行'''
+    def __init__(self, parent):
+        super().__init__(parent, flags=wx.BORDER_SIMPLE)
+        self.__OnInit()
+        self.__Bind()
+
+    def __OnInit(self):
+        self.InitSettings()
+        self.rows = []
+        self.current = -1
+        self.rowHeight = 24
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.SetFont(self.GetFont().Larger())
+
+    def InitSettings(self):
+        self.settings = {
+            'background_colour': wx.Colour('#212021'),
+            'foreground_colour': wx.Colour('#FFFFFF'),
+            'highlight_colour': wx.Colour('#414141'),
+            'padding': 8,
+        }
+
+    def __Bind(self):
+        self.Bind(wx.EVT_PAINT, self.OnPaint)
+
+    def ShowRows(self, rows, current):
+        '''显示rows(只显示current附近的MAX_ROWS行), 居中于父窗口'''
+        start = max(0, current - MAX_ROWS + 1)
+        self.rows = rows[start:start + MAX_ROWS]
+        self.current = current - start
+        padding = self.settings['padding']
+        dc = wx.ClientDC(self)
+        dc.SetFont(self.GetFont())
+        width = max((dc.GetTextExtent(row).width for row in self.rows), default=0)
+        self.rowHeight = dc.GetCharHeight() + padding
+        size = wx.Size(max(width + padding * 4, 240), self.rowHeight * len(self.rows) + padding * 2)
+        self.SetClientSize(size)
+        rect = self.GetParent().GetScreenRect()
+        self.Position(rect.GetPosition() + (rect.GetSize() - self.GetSize()) / 2, (0, 0))
+        if not self.IsShown():
+            self.Show()
+        self.Refresh()
+
+    def OnPaint(self, event):
+        dc = wx.AutoBufferedPaintDC(self)
+        dc.SetBackground(wx.Brush(self.settings['background_colour']))
+        dc.Clear()
+        dc.SetFont(self.GetFont())
+        dc.SetTextForeground(self.settings['foreground_colour'])
+        padding = self.settings['padding']
+        width = self.GetClientSize().width
+        for row, text in enumerate(self.rows):
+            y = padding + row * self.rowHeight
+            if row == self.current:
+                dc.SetPen(wx.TRANSPARENT_PEN)
+                dc.SetBrush(wx.Brush(self.settings['highlight_colour']))
+                dc.DrawRectangle(0, y, width, self.rowHeight)
+            dc.DrawText(text, padding * 2, y + padding // 2)
+
+
+class MruOverlay(CustomMruOverlay):
+    def InitSettings(self):
+        settings = wx.GetApp().settings
+        self.settings = {
+            'background_colour': wx.Colour(settings['dialog']['background_colour']),
+            'foreground_colour': wx.Colour(settings['dialog']['foreground_colour']),
+            'highlight_colour': wx.Colour(settings['toolbar']['enter_colour']),
+            'padding': settings['toolbar']['padding'],
+        }
+
+
+class Frame(wx.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.SetSize(600, 400)
+        self.titles = [f'SSH-{idx:04}' for idx in range(20)]
+        self.current = 0
+        self.overlay = CustomMruOverlay(self)
+        button = wx.Button(self, -1, '下一个')
+        button.Bind(wx.EVT_BUTTON, self.OnButton)
+
+    def OnButton(self, event):
+        self.current = (self.current + 1) % len(self.titles)
+        self.overlay.ShowRows(self.titles, self.current)
+        wx.CallLater(1500, self.overlay.Hide)
+
+
+class App(wx.App):
+    def OnInit(self):
+        frame = Frame(None)
+        frame.Center()
+        frame.Show()
+        return super().OnInit()
+
+
+def main():
+    app = App()
+    app.MainLoop()
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,34 @@ class CustomNotebook(fn.FlatNotebook):
         )
         self.SetActiveTabTextColour(self.settings['active_tab_foreground_colour'])
         self.SetNonActiveTabTextColour(self.settings['inactive_tab_foreground_colour'])
+        self._toolTip = None
+        self._pageIndex = {}    # Page ID => 序号, 增删/拖动标签后按需重建
+
+    def FindPageIndex(self, pageId):
+        '''Page ID => 序号, 不存在时返回-1. 缓存的序号仍有效时为O(1), 否则重建一次'''
+        index = self._pageIndex.get(pageId, -1)
+        if 0 <= index < self.GetPageCount() and self.GetPage(index).GetId() == pageId:
+            return index
+        self._pageIndex = {self.GetPage(n).GetId(): n for n in range(self.GetPageCount())}
+        return self._pageIndex.get(pageId, -1)
+
+    def SetTabMarked(self, index, marked):
+        '''标记标签(如已休眠的会话), 使用单独的文字颜色'''
+        self.SetPageTextColour(index, self.settings['marked_tab_foreground_colour'] if marked else None)
+        self.Refresh()
+
+    def SetTabToolTip(self, provider):
+        '''标签提示: provider(index)返回鼠标所在标签的提示文本'''
+        self._toolTip = provider
+        self.GetTabArea().Bind(wx.EVT_MOTION, self.OnTabMotion)
+
+    def OnTabMotion(self, event):
+        event.Skip()
+        tabArea = self.GetTabArea()
+        where, index = tabArea.HitTest(event.GetPosition())
+        text = self._toolTip(index) if where == fn.FNB_TAB else ''
+        if text != tabArea.GetToolTipText():
+            tabArea.SetToolTip(text)
 
     def InitSettings(self):
         self.settings = {
@@ -38,6 +66,7 @@ class CustomNotebook(fn.FlatNotebook):
             'border_colour': wx.Colour('#FFFFFF'),
             'active_tab_foreground_colour': wx.Colour('#FFFFFF'),
             'inactive_tab_foreground_colour': wx.Colour('#808080'),
+            'marked_tab_foreground_colour': wx.Colour('#4A7AB0'),
             'page_background_colour': wx.Colour('#212021'),
         }
 
@@ -50,6 +79,7 @@ class Notebook(CustomNotebook):
             'border_colour': wx.Colour(settings['border_colour']),
             'active_tab_foreground_colour': wx.Colour(settings['active_tab_foreground_colour']),
             'inactive_tab_foreground_colour': wx.Colour(settings['inactive_tab_foreground_colour']),
+            'marked_tab_foreground_colour': wx.Colour(settings['marked_tab_foreground_colour']),
             'page_background_colour': wx.Colour(settings['page_background_colour']),
         }
 
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    ProcessDialog.py
+@Time  :    2026/10/18 18:55:10
+@Author:    daidai_up
+@Desc  :    会话进程诊断: 按会话列出跟踪到的进程, 标记孤儿进程
+'''
+import wx
+from wx.lib.buttons import GenButton
+
+
+class CustomProcessDialog(wx.Dialog):
+    '''进程诊断对话框
+
+    sessions: [(会话标题, [(pid, name, ppid, 是否孤儿进程)])]
+    '''
+    def __init__(self, parent, sessions):
+        super().__init__(parent, title='进程诊断', style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.__OnInit(sessions)
+        self.__CreateWidgets()
+        self.__Bind()
+        self.__Layout()
+
+    def __OnInit(self, sessions):
+        self.sessions = sessions
+        self.InitSettings()
+        self.SetSize(560, 400)
+        self.CenterOnParent()
+        self.SetBackgroundColour(self.settings['background_colour'])
+
+    def InitSettings(self):
+        self.settings = {
+            'background_colour': wx.Colour('#212021'),
+            'foreground_colour': wx.Colour('#FFFFFF'),
+            'button_background_colour': wx.Colour('#212021'),
+            'button_foreground_colour': wx.Colour('#FFFFFF'),
+        }
+
+    def __CreateWidgets(self):
+        orphans = sum(1 for _, processes in self.sessions for process in processes if process[3])
+        self.summary = wx.StaticText(self, -1, f'会话: {len(self.sessions)}  孤儿进程: {orphans}')
+        self.summary.SetForegroundColour(self.settings['foreground_colour'])
+        #
+        self.listCtrl = wx.ListCtrl(self, style=wx.LC_REPORT | wx.BORDER_NONE)
+        self.listCtrl.SetBackgroundColour(self.settings['background_colour'])
+        self.listCtrl.SetForegroundColour(self.settings['foreground_colour'])
+        for column, (title, width) in enumerate(
+            (('会话', 140), ('PID', 70), ('进程', 160), ('父进程', 70), ('状态', 80))
+        ):
+            self.listCtrl.InsertColumn(column, title, width=width)
+        for title, processes in self.sessions:
+            for pid, name, ppid, orphan in processes:
+                row = self.listCtrl.GetItemCount()
+                self.listCtrl.InsertItem(row, title)
+                self.listCtrl.SetItem(row, 1, str(pid))
+                self.listCtrl.SetItem(row, 2, name or '')
+                self.listCtrl.SetItem(row, 3, '' if ppid is None else str(ppid))
+                self.listCtrl.SetItem(row, 4, '孤儿进程' if orphan else '')
+        #
+        self.btn = GenButton(self, wx.ID_OK, '确定')
+        self.btn.SetFocus()
+        self.btn.SetBackgroundColour(self.settings['button_background_colour'])
+        self.btn.SetForegroundColour(self.settings['button_foreground_colour'])
+
+    def __Bind(self):
+        self.Bind(wx.EVT_CHAR_HOOK, self.OnChar)
+
+    def __Layout(self):
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.summary, 0, wx.ALL, 5)
+        sizer.Add(self.listCtrl, 1, wx.EXPAND | wx.LEFT | wx.RIGHT, 5)
+        sizer.Add(self.btn, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+        self.SetSizer(sizer)
+
+    def OnChar(self, event):
+        if event.GetKeyCode() in (wx.WXK_RETURN, wx.WXK_ESCAPE):
+            self.btn.Notify()
+        else:
+            event.Skip()
+
+
+class ProcessDialog(CustomProcessDialog):
+    def InitSettings(self):
+        settings = wx.GetApp().settings['dialog']
+        self.settings = {
+            'background_colour': wx.Colour(settings['background_colour']),
+            'foreground_colour': wx.Colour(settings['foreground_colour']),
+            'button_background_colour': wx.Colour(settings['button_background_colour']),
+            'button_foreground_colour': wx.Colour(settings['button_foreground_colour']),
+        }
+
+
+class Frame(wx.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        button = wx.Button(self, -1, '进程诊断')
+        button.Bind(wx.EVT_BUTTON, self.OnButton)
+
+    def OnButton(self, event):
+        sessions = [
+            ('Putty', [(100, 'putty.exe', 1, False)]),
+            ('Cygwin', [(200, 'mintty.exe', 1, False), (201, 'bash.exe', 200, False), (300, 'ssh.exe', 202, True)]),
+        ]
+        dlg = CustomProcessDialog(self, sessions)
+        dlg.ShowModal()
+        dlg.Destroy()
+
+
+class App(wx.App):
+    def OnInit(self):
+        frame = Frame(None)
+        frame.Center()
+        frame.Show()
+        return super().OnInit()
+
+
+def main():
+    app = App()
+    app.MainLoop()
+
+
+if __name__ == '__main__':
+    main()
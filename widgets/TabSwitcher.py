@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+'''
+@File  :    TabSwitcher.py
+@Time  :    2026/10/20 10:15:42
+@Author:    daidai_up
+@Desc  :    标签页切换器: 输入过滤标签页, 上下键选择, 回车切换, Esc关闭
+
+列表为虚拟模式(只绘制可见的行), 过滤结果变化时只更新行数, 与标签页数量无关
+'''
+import wx
+
+
+class TabList(wx.ListCtrl):
+    '''虚拟列表, rows为[key], label(key)为显示文本'''
+    def __init__(self, parent, label):
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_NO_HEADER | wx.LC_SINGLE_SEL | wx.BORDER_NONE)
+        self.label = label
+        self.rows = []
+        self.InsertColumn(0, '', width=400)
+
+    def SetRows(self, rows):
+        self.rows = rows
+        self.SetItemCount(len(rows))
+        if rows:
+            self.Select(0)
+            self.EnsureVisible(0)
+        self.Refresh()
+
+    def OnGetItemText(self, row, column):
+        return self.label(self.rows[row])
+
+    def GetSelectedKey(self):
+        row = self.GetFirstSelected()
+        return self.rows[row] if 0 <= row < len(self.rows) else None
+
+    def MoveSelection(self, step):
+        if not self.rows:
+            return
+        row = (max(self.GetFirstSelected(), 0) + step) % len(self.rows)
+        self.Select(row)
+        self.Focus(row)
+        self.EnsureVisible(row)
+
+
+class CustomTabSwitcher(wx.Dialog):
+    '''标签页切换对话框
+
+    search(query) => [key], 空查询时为全部标签页
+    label(key) => 显示文本
+    选中的key在ShowModal() == wx.ID_OK后由GetSelectedKey()获取
+    '''
+    def __init__(self, parent, search, label):
+        super().__init__(parent, title='切换标签页', style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.__OnInit(search, label)
+        self.__CreateWidgets()
+        self.__Bind()
+        self.__Layout()
+        self.OnText(None)
+
+    def __OnInit(self, search, label):
+        self.search = search
+        self.label = label
+        self.selectedKey = None
+        self.InitSettings()
+        self.SetSize(440, 480)
+        self.CenterOnParent()
+        self.SetBackgroundColour(self.settings['background_colour'])
+
+    def InitSettings(self):
+        self.settings = {
+            'background_colour': wx.Colour('#212021'),
+            'foreground_colour': wx.Colour('#FFFFFF'),
+        }
+
+    def __CreateWidgets(self):
+        self.textCtrl = wx.TextCtrl(self, style=wx.TE_PROCESS_ENTER | wx.BORDER_NONE)
+        self.textCtrl.SetHint('标签页标题 / 工具项名称 / 主机')
+        self.textCtrl.SetBackgroundColour(self.settings['background_colour'])
+        self.textCtrl.SetForegroundColour(self.settings['foreground_colour'])
+        self.textCtrl.SetFocus()
+        #
+        self.listCtrl = TabList(self, self.label)
+        self.listCtrl.SetBackgroundColour(self.settings['background_colour'])
+        self.listCtrl.SetForegroundColour(self.settings['foreground_colour'])
+
+    def __Bind(self):
+        self.textCtrl.Bind(wx.EVT_TEXT, self.OnText)
+        self.Bind(wx.EVT_CHAR_HOOK, self.OnChar)
+        self.listCtrl.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.OnActivated)
+        self.listCtrl.Bind(wx.EVT_SIZE, self.OnListSize)
+
+    def __Layout(self):
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.textCtrl, 0, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(self.listCtrl, 1, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 5)
+        self.SetSizer(sizer)
+
+    ############################################################################
+    def OnText(self, event):
+        self.listCtrl.SetRows(self.search(self.textCtrl.GetValue().strip()))
+
+    def OnChar(self, event):
+        keyCode = event.GetKeyCode()
+        if keyCode == wx.WXK_ESCAPE:
+            self.EndModal(wx.ID_CANCEL)
+        elif keyCode in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER):
+            self.Choose(self.listCtrl.GetSelectedKey())
+        elif keyCode in (wx.WXK_DOWN, wx.WXK_UP):
+            self.listCtrl.MoveSelection(1 if keyCode == wx.WXK_DOWN else -1)
+        elif keyCode in (wx.WXK_PAGEDOWN, wx.WXK_PAGEUP):
+            step = max(self.listCtrl.GetCountPerPage(), 1)
+            self.listCtrl.MoveSelection(step if keyCode == wx.WXK_PAGEDOWN else -step)
+        else:
+            event.Skip()
+
+    def OnActivated(self, event):
+        self.Choose(self.listCtrl.rows[event.GetIndex()])
+
+    def OnListSize(self, event):
+        event.Skip()
+        self.listCtrl.SetColumnWidth(0, self.listCtrl.GetClientSize().width)
+
+    def Choose(self, key):
+        if key is None:
+            return
+        self.selectedKey = key
+        self.EndModal(wx.ID_OK)
+
+    def GetSelectedKey(self):
+        return self.selectedKey
+
+
+class TabSwitcher(CustomTabSwitcher):
+    def InitSettings(self):
+        settings = wx.GetApp().settings['dialog']
+        self.settings = {
+            'background_colour': wx.Colour(settings['background_colour']),
+            'foreground_colour': wx.Colour(settings['foreground_colour']),
+        }
+
+
+class Frame(wx.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.titles = [f'SSH-{idx:04}' for idx in range(500)]
+        button = wx.Button(self, -1, '切换标签页')
+        button.Bind(wx.EVT_BUTTON, self.OnButton)
+
+    def OnButton(self, event):
+        def search(query):
+            return [n for n, title in enumerate(self.titles) if query.lower() in title.lower()]
+
+        dlg = CustomTabSwitcher(self, search, lambda n: self.titles[n])
+        if dlg.ShowModal() == wx.ID_OK:
+            print(self.titles[dlg.GetSelectedKey()])
+        dlg.Destroy()
+
+
+class App(wx.App):
+    def OnInit(self):
+        frame = Frame(None)
+        frame.Center()
+        frame.Show()
+        return super().OnInit()
+
+
+def main():
+    app = App()
+    app.MainLoop()
+
+
+if __name__ == '__main__':
+    main()
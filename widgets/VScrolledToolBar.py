@@ -7,6 +7,36 @@
 @Desc  :
 '''
 import wx
+from utils.ImageCache import GetImageCache
+
+
+def DrawTool(dc, rect, label, bitmap, fgColour, bgColour):
+    '''在dc的rect区域绘制工具项: 图片在上, 文本在下, 居中'''
+    x, y, width, height = rect
+    dc.SetPen(wx.TRANSPARENT_PEN)
+    dc.SetBrush(wx.Brush(bgColour))
+    dc.DrawRectangle(x, y, width, height)
+    dc.SetTextForeground(fgColour)
+    bitmapWidth, bitmapHeight = bitmap.GetSize()
+    textWidth, textHeight = dc.GetTextExtent(label)
+    padding = (height - bitmapHeight - textHeight) / 2
+    dc.DrawBitmap(bitmap, x + int((width - bitmapWidth) / 2), y + int(padding))
+    dc.DrawText(label, x + int((width - textWidth) / 2), y + int(height - textHeight - padding))
+
+
+class ToolItem:
+    '''虚拟模式下的工具项, 与ToolBase提供相同的GetClientData'''
+    def __init__(self, toolId, label, bitmap, clientData):
+        self.toolId = toolId
+        self.label = label
+        self.bitmap = bitmap
+        self.clientData = clientData
+
+    def GetId(self):
+        return self.toolId
+
+    def GetClientData(self):
+        return self.clientData
 
 
 class ToolBase(wx.Control):
@@ -40,26 +70,14 @@ class ToolBase(wx.Control):
         self._buffer = self._normalBuffer
 
     def _InitBuffer(self, label, bitmap, fgColour, bgColour):
+        if isinstance(bitmap, str):     # 图片路径, 使用共享缓存
+            size = (self.width, self.height)
+            return GetImageCache().GetTile(label, bitmap, size, fgColour, bgColour, DrawTool)
         _buffer = wx.Bitmap(self.width, self.height)
         dc = wx.MemoryDC(_buffer)
-        dc.SetBackground(wx.Brush(bgColour))
-        dc.Clear()
-        dc.SetTextForeground(fgColour)
-        bitmapPos, textPos = self._CalcPositon(label, bitmap)
-        dc.DrawBitmap(bitmap, bitmapPos)
-        dc.DrawText(label, textPos)
+        DrawTool(dc, (0, 0, self.width, self.height), label, bitmap, fgColour, bgColour)
         return _buffer
 
-    def _CalcPositon(self, label, bitmap):
-        '''计算图片和文本的起始位置'''
-        bitmapWidth, bitmapHeight = bitmap.GetSize()
-        dc = wx.MemoryDC(wx.Bitmap(20, 20))
-        textWidth, textHeight = dc.GetTextExtent(label)
-        padding = (self.height - bitmapHeight - textHeight) / 2
-        bitmapPos = (int((self.width - bitmapWidth) / 2), int(padding))
-        textPos = (int((self.width - textWidth) / 2), int(self.height - textHeight - padding))
-        return bitmapPos, textPos
-
     ############################################################################
     def OnPaint(self, event):
         _ = wx.BufferedPaintDC(self, self._buffer)
@@ -82,9 +100,16 @@ class ToolBase(wx.Control):
     def GetClientData(self):
         return self.clientData
 
+    def SetClientData(self, clientData):
+        self.clientData = clientData
+
 
 class CustomVScrolledToolBar(wx.ScrolledWindow):
-    '''自定义纵向滚动工具栏'''
+    '''自定义纵向滚动工具栏
+
+    工具项数量达到virtual_threshold时使用虚拟模式: 不再为每个工具项创建控件,
+    由工具栏自己绘制可见的行, 并按行号处理点击和悬停
+    '''
     def __init__(self, parent):
         super().__init__(parent, style=wx.VSCROLL)
         self.__OnInit()
@@ -92,7 +117,16 @@ class CustomVScrolledToolBar(wx.ScrolledWindow):
 
     def __OnInit(self):
         self.InitSettings()
+        self.imageCache = GetImageCache()
         self._tools = []
+        self._toolKeys = {}     # key => toolId, 用于增量更新
+        self._controls = {}     # toolId => ToolBase
+        self._rows = {}         # int(toolId) => 在_tools中的序号
+        self._filter = None     # 只显示的key(按顺序), None时显示全部
+        self._visible = []      # 显示的行 => 在_tools中的序号
+        self._hover = -1        # 虚拟模式下鼠标所在的行
+        self.virtual = False
+        self.toolSize = wx.Size(60, 60)
         self.SetScrollRate(0, 1)
         self.DisableKeyboardScrolling()
         self.ShowScrollbars(wx.SHOW_SB_NEVER, wx.SHOW_SB_NEVER)   # 不显示滚动条
@@ -104,16 +138,28 @@ class CustomVScrolledToolBar(wx.ScrolledWindow):
             'background_colour': wx.Colour('#212021'),
             'enter_colour': wx.Colour('#414141'),
             'padding': 8,
+            'virtual_threshold': 100,
         }
 
     def __Bind(self):
         self.Bind(wx.EVT_MOUSEWHEEL, self.OnWheel)
+        self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.Bind(wx.EVT_ERASE_BACKGROUND, self.OnEraseBackground)
+        self.Bind(wx.EVT_MOTION, self.OnMotion)
+        self.Bind(wx.EVT_LEAVE_WINDOW, self.OnLeaveWindow)
+        self.Bind(wx.EVT_LEFT_UP, self.OnLeftUp)
 
     ############################################################################
-    def AddTool(self, label, bitmap, clientData=None):
-        '''增加工具项'''
+    def AddTool(self, label, bitmap, clientData=None, key=None):
+        '''增加工具项
+
+        bitmap: wx.Bitmap或图片路径. 使用路径时, 解码及绘制结果在共享的ImageCache中缓存
+        key: 用于之后的增量更新(UpdateTools)
+        '''
         toolId = wx.NewIdRef()
         self._tools.append((toolId, label, bitmap, clientData))
+        if key is not None:
+            self._toolKeys[key] = toolId
         return toolId
 
     def Realize(self):
@@ -121,26 +167,186 @@ class CustomVScrolledToolBar(wx.ScrolledWindow):
         self.Scroll(0, 0)  # 必须的
         self.toolSize = self._GetToolSize()
         self.SetMinClientSize(self.toolSize)
-        height = 0
+        self.virtual = len(self._tools) >= self.settings['virtual_threshold']
+        if not self.virtual:
+            for toolId, label, bitmap, clientData in self._tools:
+                self._controls[toolId] = self._CreateTool(toolId, label, bitmap, clientData)
+        self._LayoutTools()
+
+    def UpdateTools(self, tools, modified=()):
+        '''增量更新工具项
+
+        tools: [(key, label, bitmap, clientData)], 已有工具项的bitmap可为None(沿用原图片)
+        modified: 需要重建的key. 其他已有工具项只更新clientData和位置
+        '''
+        oldTools = {toolId: (label, bitmap) for toolId, label, bitmap, _ in self._tools}
+        newTools, toolKeys, rebuild = [], {}, set()
+        for key, label, bitmap, clientData in tools:
+            toolId = self._toolKeys.get(key)
+            if bitmap is None:
+                bitmap = oldTools[toolId][1]
+            if toolId is None or key in modified:
+                toolId = wx.NewIdRef()
+                rebuild.add(toolId)
+            newTools.append((toolId, label, bitmap, clientData))
+            toolKeys[key] = toolId
+        self._tools = newTools
+        self._toolKeys = toolKeys
+        toolSize = self._GetToolSize()
+        virtual = len(self._tools) >= self.settings['virtual_threshold']
+        if virtual and self.virtual and toolSize == self.toolSize:  # 虚拟模式只需重绘
+            self._hover = -1
+            self._LayoutTools()
+            return
+        if toolSize != self.toolSize or virtual != self.virtual:   # 尺寸/模式变化, 全部重建
+            self._DestroyControls()
+            self.Realize()
+            return
+        # 删除已移除/需重建的控件
+        for toolId in set(self._controls) - set(toolKeys.values()):
+            self._controls.pop(toolId).Destroy()
+        _, y = self.GetViewStart()
+        self.Scroll(0, 0)  # 按未滚动的坐标定位
         for toolId, label, bitmap, clientData in self._tools:
-            tool = ToolBase(
-                self, toolId, label, bitmap, self.settings['foreground_colour'],
-                self.settings['background_colour'], self.settings['enter_colour'],
-                *self.toolSize, clientData
-            )
-            tool.SetPosition((0, height))
-            height += self.toolSize.height
-        self.SetVirtualSize(-1, height)
-        sizer = self.GetContainingSizer()
-        if sizer is not None:
-            sizer.Layout()
+            if toolId in rebuild:
+                self._controls[toolId] = self._CreateTool(toolId, label, bitmap, clientData)
+            else:
+                self._controls[toolId].SetClientData(clientData)
+        self._LayoutTools()
+        self.Scroll(-1, y)
+
+    def HasTool(self, key):
+        return key in self._toolKeys
+
+    def FindTool(self, toolId):
+        '''按ID查找工具项(ToolBase或ToolItem), 用于处理EVT_TOOL'''
+        index = self._rows.get(int(toolId))
+        if index is None:
+            return None
+        if not self.virtual:
+            return self._controls[self._tools[index][0]]
+        return ToolItem(*self._tools[index])
+
+    def GetVisibleTools(self):
+        '''当前显示的工具项(ToolItem), 按显示顺序'''
+        return [ToolItem(*self._tools[index]) for index in self._visible]
 
     def ClearTools(self):
         '''清空工具栏'''
+        self._DestroyControls()
+        self._tools.clear()
+        self._toolKeys.clear()
+
+    def _DestroyControls(self):
         for child in self.GetChildren():
             child.Destroy()
-        self._tools.clear()
+        self._controls.clear()
 
+    def _CreateTool(self, toolId, label, bitmap, clientData):
+        return ToolBase(
+            self, toolId, label, bitmap, self.settings['foreground_colour'],
+            self.settings['background_colour'], self.settings['enter_colour'],
+            *self.toolSize, clientData
+        )
+
+    def SetFilter(self, keys=None):
+        '''只按顺序显示keys中的工具项(如搜索结果), None时显示全部'''
+        self._filter = None if keys is None else list(keys)
+        self._hover = -1
+        self.Scroll(0, 0)
+        self._LayoutTools()
+
+    def _LayoutTools(self):
+        '''按顺序排列工具项'''
+        self._rows = {int(toolId): index for index, (toolId, _, _, _) in enumerate(self._tools)}
+        if self._filter is None:
+            self._visible = list(range(len(self._tools)))
+        else:
+            toolIds = (self._toolKeys.get(key) for key in self._filter)
+            self._visible = [self._rows[int(toolId)] for toolId in toolIds if toolId is not None]
+        height = self.toolSize.height * len(self._visible)
+        if not self.virtual:
+            for control in self._controls.values():
+                control.Hide()
+            for row, index in enumerate(self._visible):
+                control = self._controls[self._tools[index][0]]
+                control.SetPosition((0, row * self.toolSize.height))
+                control.Show()
+        self.SetVirtualSize(-1, height)
+        self.Refresh()
+        parent = self.GetParent()   # 工具栏宽度可能变化, 由父窗口重新布局
+        if parent.GetSizer() is not None:
+            parent.Layout()
+
+    ################################ 虚拟模式 ###################################
+    def OnPaint(self, event):
+        '''只绘制可见的行'''
+        if not self.virtual:
+            event.Skip()
+            return
+        dc = wx.BufferedPaintDC(self)
+        width, height = self.GetClientSize()
+        _, y = self.GetViewStart()
+        th = self.toolSize.height
+        dc.SetBackground(wx.Brush(self.settings['background_colour']))
+        dc.Clear()
+        first = y // th
+        last = min(len(self._visible), (y + height) // th + 1)
+        fgColour = self.settings['foreground_colour']
+        for row in range(first, last):
+            _, label, bitmap, _ = self._tools[self._visible[row]]
+            bgColour = self.settings['enter_colour'] if row == self._hover else self.settings['background_colour']
+            if isinstance(bitmap, str):
+                tile = self.imageCache.GetTile(label, bitmap, self.toolSize, fgColour, bgColour, DrawTool)
+                dc.DrawBitmap(tile, 0, row * th - y)
+            else:
+                DrawTool(dc, (0, row * th - y, self.toolSize.width, th), label, bitmap, fgColour, bgColour)
+
+    def OnEraseBackground(self, event):
+        if not self.virtual:
+            event.Skip()
+
+    def OnMotion(self, event):
+        event.Skip()
+        if self.virtual:
+            self._SetHover(self.HitTestRow(event.GetPosition()))
+
+    def OnLeaveWindow(self, event):
+        event.Skip()
+        if self.virtual:
+            self._SetHover(-1)
+
+    def OnLeftUp(self, event):
+        '''点击时构造ToolEvent'''
+        if not self.virtual:
+            event.Skip()
+            return
+        row = self.HitTestRow(event.GetPosition())
+        if row != -1:
+            event = wx.MenuEvent(wx.wxEVT_TOOL, id=self._tools[self._visible[row]][0])
+            wx.QueueEvent(self.GetTopLevelParent(), event)
+
+    def HitTestRow(self, pos):
+        '''窗口坐标 => 行号, 没有工具项时返回-1'''
+        _, y = self.CalcUnscrolledPosition(pos)
+        row = y // self.toolSize.height
+        if pos[0] >= self.toolSize.width or not 0 <= row < len(self._visible):
+            return -1
+        return row
+
+    def _SetHover(self, row):
+        if row == self._hover:
+            return
+        for _row in (self._hover, row):
+            if _row != -1:
+                self.RefreshRect(self._RowRect(_row), eraseBackground=False)
+        self._hover = row
+
+    def _RowRect(self, row):
+        _, y = self.GetViewStart()
+        return wx.Rect(0, row * self.toolSize.height - y, *self.toolSize)
+
+    ############################################################################
     def OnWheel(self, event):
         '''滚轮控制滚动'''
         _, y = self.GetViewStart()
@@ -156,20 +362,21 @@ class CustomVScrolledToolBar(wx.ScrolledWindow):
     def _GetToolSize(self):
         '''统一工具项Size'''
         if not self._tools:    # 默认Size
-            return (60, 60)
+            return wx.Size(60, 60)
         widths = []
         heights = []
-        _dc = wx.MemoryDC(wx.Bitmap(20, 20))
         for _, label, bitmap, _ in self._tools:
-            width, height = self._CalcToolSize(label, bitmap, _dc)
+            width, height = self._CalcToolSize(label, bitmap)
             widths.append(width)
             heights.append(height)
         return wx.Size(max(widths), max(heights))
 
-    def _CalcToolSize(self, label, bitmap, dc):
+    def _CalcToolSize(self, label, bitmap):
         '''单个工具项Size'''
+        if isinstance(bitmap, str):
+            bitmap = self.imageCache.GetBitmap(bitmap)
         bitmapWidth, bitmapHeight = bitmap.GetSize()
-        textWidth, textHeight = dc.GetTextExtent(label)
+        textWidth, textHeight = self.imageCache.GetTextExtent(label)
         return (
             max(bitmapWidth, textWidth) + self.settings['padding'] * 2,
             bitmapHeight + textHeight + self.settings['padding'] * 2,
@@ -185,6 +392,7 @@ class VScrolledToolBar(CustomVScrolledToolBar):
             'background_colour': wx.Colour(settings['background_colour']),
             'enter_colour': wx.Colour(settings['enter_colour']),
             'padding': settings['padding'],
+            'virtual_threshold': settings.get('virtual_threshold', 100),
         }
 
 
@@ -195,11 +403,11 @@ class Frame(wx.Frame):
         self.SetSize(600, 400)
         bitmap = wx.Bitmap('assets/images/putty.png')
 
-        toolBar = CustomVScrolledToolBar(self)
-        for idx in range(20):
-            toolBar.AddTool(f'SSH-00{idx}', bitmap, clientData={'index': idx})
+        self.toolBar = toolBar = CustomVScrolledToolBar(self)
+        for idx in range(2000):   # 超过virtual_threshold, 使用虚拟模式
+            toolBar.AddTool(f'SSH-{idx:04}', bitmap, clientData={'index': idx})
         toolBar.Realize()
-        toolBar.Bind(wx.EVT_TOOL, self.OnTool)
+        self.Bind(wx.EVT_TOOL, self.OnTool)
 
         sizer = wx.BoxSizer(wx.HORIZONTAL)
         sizer.Add(toolBar, 0, wx.EXPAND)
@@ -207,8 +415,8 @@ class Frame(wx.Frame):
         self.Layout()
 
     def OnTool(self, event):
-        toolBar = wx.FindWindowById(event.GetId())
-        print(toolBar.GetClientData())
+        tool = self.toolBar.FindTool(event.GetId())
+        print(tool.GetClientData())
 
 
 class App(wx.App):